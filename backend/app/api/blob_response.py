@@ -0,0 +1,92 @@
+"""
+Blob Response
+Entrega de conteúdos endereçados pelo SHA-256: ETag forte (o próprio hash), cache imutável, 304 sem
+tocar o disco, Range (FileResponse) e envio sem cópia pelo servidor quando disponível
+"""
+
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+
+class BlobResponse(FileResponse):
+    """
+    Resposta de um conteúdo armazenado. Ordem de preferência para o corpo:
+    1. X-Accel-Redirect (FILE_ACCEL_REDIRECT_PREFIX): o nginx envia com sendfile e atende Range
+    2. http.response.pathsend (servidores ASGI com a extensão): o servidor envia com sendfile
+    3. leitura em blocos pelo FileResponse (uvicorn), com Range e If-Range
+    """
+    chunk_size = 256 * 1024
+    
+    def __init__(
+        self,
+        path: str,
+        sha256: str,
+        media_type: str,
+        filename: Optional[str] = None,
+        stat_result: Optional[os.stat_result] = None,
+        accel_redirect: Optional[str] = None
+    ):
+        super().__init__(
+            path,
+            headers=cache_headers(sha256),
+            media_type=media_type,
+            filename=filename,
+            stat_result=stat_result,
+            content_disposition_type="inline",
+        )
+        self.accel_redirect = accel_redirect
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request_headers = Headers(scope=scope)
+        
+        # Revalidação: o hash não muda, então a resposta não depende do arquivo
+        if etag_matches(request_headers.get("if-none-match"), self.headers["etag"]):
+            await Response(status_code=304, headers=cache_headers_from(self.headers))(scope, receive, send)
+            return
+        
+        if self.accel_redirect:
+            self.headers["x-accel-redirect"] = self.accel_redirect
+            self.headers["content-length"] = "0"
+            await send({"type": "http.response.start", "status": 200, "headers": self.raw_headers})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        
+        pathsend = "http.response.pathsend" in scope.get("extensions", {})
+        if pathsend and self.stat_result is not None and scope["method"] == "GET" and "range" not in request_headers:
+            await send({"type": "http.response.start", "status": 200, "headers": self.raw_headers})
+            await send({"type": "http.response.pathsend", "path": os.path.abspath(self.path)})
+            return
+        
+        await super().__call__(scope, receive, send)
+
+
+def cache_headers(sha256: str) -> dict:
+    """
+    ETag forte e cache imutável: a URL de um arquivo sempre aponta para o mesmo conteúdo. "private"
+    porque o acesso depende do tenant autenticado
+    """
+    return {
+        "etag": f'"{sha256}"',
+        "cache-control": f"private, max-age={settings.FILE_CACHE_MAX_AGE}, immutable",
+        "x-content-type-options": "nosniff",
+    }
+
+
+def cache_headers_from(headers) -> dict:
+    return {key: headers[key] for key in ("etag", "cache-control") if key in headers}
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match com a ETag (lista separada por vírgulas, "*" ou W/ aceitos na comparação fraca)
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
@@ -7,10 +7,11 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import JWTError, jwt
 
 from app.core.config import settings
 from app.core.database import get_db
+from app.core.module_config import ModuleConfig, module_configs
+from app.core.permissions import Permission, has_permissions
 from app.domain.schemas.user import UserResponse
 from app.domain.schemas.tenant import TenantResponse
 from app.infrastructure.repositories.user_repository import UserRepository
@@ -31,6 +32,8 @@ async def get_current_user(
     """
     Obter usuário atual baseado no JWT token
     """
+    from jose import JWTError, jwt
+    
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Não foi possível validar as credenciais",
@@ -56,7 +59,7 @@ async def get_current_user(
     
     # Buscar usuário no banco
     user_repo = UserRepository(db)
-    user = await user_repo.get_user_by_id_and_tenant(user_id, tenant_id)
+    user = await user_repo.get_by_id_and_tenant(int(user_id), tenant_id)
     
     if user is None:
         raise credentials_exception
@@ -99,9 +102,10 @@ async def get_current_tenant(
 
 def require_role(required_roles: list[str]):
     """
-    Decorator para exigir roles específicas
+    Decorator para exigir roles específicas (preferir require_permissions)
     """
-    def role_checker(current_user: UserResponse = Depends(get_current_user)):
+    # async para rodar na mesma task da requisição (sem threadpool)
+    async def role_checker(current_user: UserResponse = Depends(get_current_user)):
         if current_user.role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -112,19 +116,58 @@ def require_role(required_roles: list[str]):
     return role_checker
 
 
-# Dependências para roles específicas
-require_super_admin = require_role(["SUPER_ADMIN"])
-require_admin_access = require_role([
-    "SUPER_ADMIN", 
-    "ADMIN_MASTER", 
-    "DONO_CLINICA"
-])
-require_dentist_access = require_role([
-    "SUPER_ADMIN", 
-    "ADMIN_MASTER", 
-    "DONO_CLINICA", 
-    "DENTISTA"
-])
+def require_permissions(required: Permission):
+    """
+    Exigir todos os bits de permissão informados (role + exceções do usuário, compiladas)
+    """
+    required = int(required)
+    
+    async def permission_checker(current_user: UserResponse = Depends(get_current_user)):
+        if not has_permissions(current_user.permission_mask, required):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Permissões insuficientes"
+            )
+        return current_user
+    
+    return permission_checker
+
+
+# Dependências por permissão
+require_super_admin = require_permissions(Permission.PLATFORM_ADMIN)
+require_admin_access = require_permissions(Permission.USERS_MANAGE)
+require_dentist_access = require_permissions(Permission.CLINICAL_ACCESS)
+require_users_read = require_permissions(Permission.USERS_READ)
+require_users_import = require_permissions(Permission.USERS_IMPORT)
+require_tenant_settings = require_permissions(Permission.TENANT_SETTINGS)
+require_profiling = require_permissions(Permission.PROFILING)
+require_files_read = require_permissions(Permission.FILES_READ)
+require_files_manage = require_permissions(Permission.FILES_MANAGE)
+
+
+async def get_module_config(
+    current_user: UserResponse = Depends(get_current_user),
+    current_tenant: TenantResponse = Depends(get_current_tenant)
+) -> ModuleConfig:
+    """
+    Módulos e configurações efetivos do usuário atual (visão compilada em cache por tenant)
+    """
+    return module_configs.for_user(current_tenant, current_user)
+
+
+def require_module(module: str):
+    """
+    Exigir um módulo HUBB habilitado para o usuário atual
+    """
+    async def module_checker(config: ModuleConfig = Depends(get_module_config)) -> ModuleConfig:
+        if not config.enabled(module):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Módulo não habilitado para esta clínica"
+            )
+        return config
+    
+    return module_checker
 
 
 async def get_current_active_user(
@@ -154,7 +197,7 @@ async def get_current_active_superuser(
             detail="Usuário inativo"
         )
     
-    if current_user.role != "SUPER_ADMIN":
+    if not has_permissions(current_user.permission_mask, Permission.PLATFORM_ADMIN):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Privilégios insuficientes"
@@ -11,6 +11,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.module_config import ModuleConfig
 from app.core.security import create_access_token, verify_password, get_password_hash
 from app.domain.schemas.auth import (
     Token, 
@@ -23,7 +24,7 @@ from app.domain.schemas.user import UserResponse
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.tenant_repository import TenantRepository
 from app.application.services.auth_service import AuthService
-from app.api.dependencies import get_current_user, get_current_tenant
+from app.api.dependencies import get_current_user, get_current_tenant, get_module_config
 
 
 router = APIRouter()
@@ -125,6 +126,16 @@ async def get_current_user_info(
     return current_user
 
 
+@router.get("/me/modules")
+async def get_current_user_modules(
+    config: ModuleConfig = Depends(get_module_config)
+):
+    """
+    Módulos habilitados e configurações efetivas do usuário atual
+    """
+    return {"modules": dict(config.modules), "settings": dict(config.settings)}
+
+
 @router.post("/logout")
 async def logout(
     current_user: UserResponse = Depends(get_current_user),
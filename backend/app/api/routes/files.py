@@ -0,0 +1,169 @@
+"""
+File Routes
+Upload, listagem, download e remoção de arquivos do tenant
+"""
+
+import os
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_db
+from app.domain.schemas.file import StoredFileResponse
+from app.domain.schemas.user import UserResponse
+from app.infrastructure.file_storage import UploadTooLarge, UnsupportedFileType, blob_key
+from app.infrastructure.repositories.file_repository import StoredFileRepository
+from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+from app.application.services.file_service import FileService, blob_path
+from app.application.services.storage_service import StorageQuotaExceeded, StorageService
+from app.api.dependencies import get_current_tenant, require_files_manage, require_files_read
+from app.api.blob_response import BlobResponse
+
+
+router = APIRouter()
+
+
+def get_file_service(db: AsyncSession) -> FileService:
+    return FileService(StoredFileRepository(db), StorageService(StorageLedgerRepository(db)))
+
+
+def declared_length(request: Request) -> Optional[int]:
+    """
+    Content-Length da requisição (None se ausente, ex.: chunked)
+    """
+    value = request.headers.get("content-length")
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Content-Length inválido"
+        )
+
+
+def upload_error(error: Exception) -> HTTPException:
+    """
+    Resposta para as recusas do upload: tamanho (413), tipo (415) e cota (507)
+    """
+    if isinstance(error, UploadTooLarge):
+        status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    elif isinstance(error, UnsupportedFileType):
+        status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    else:
+        status_code = status.HTTP_507_INSUFFICIENT_STORAGE
+    return HTTPException(status_code=status_code, detail=str(error))
+
+
+@router.post("/", response_model=StoredFileResponse, status_code=status.HTTP_201_CREATED)
+async def upload_file(
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    current_user: UserResponse = Depends(require_files_manage),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enviar arquivo: o corpo da requisição é o próprio arquivo (sem multipart), lido em blocos.
+    Content-Length acima do limite ou da cota é recusado antes de ler o corpo
+    """
+    file_service = get_file_service(db)
+    
+    try:
+        return await file_service.upload(
+            tenant_id=current_tenant.id,
+            user_id=current_user.id,
+            filename=filename,
+            chunks=request.stream(),
+            declared_size=declared_length(request),
+        )
+    
+    except (UploadTooLarge, UnsupportedFileType, StorageQuotaExceeded) as e:
+        raise upload_error(e)
+
+
+@router.get("/", response_model=List[StoredFileResponse])
+async def list_files(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserResponse = Depends(require_files_read),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Listar arquivos do tenant
+    """
+    return await get_file_service(db).list_files(current_tenant.id, skip, limit)
+
+
+DOWNLOAD_RESPONSES = {
+    200: {"description": "Conteúdo do arquivo", "content": {"application/octet-stream": {}}},
+    206: {"description": "Parte do conteúdo (Range)"},
+    304: {"description": "Não modificado (If-None-Match)"},
+    416: {"description": "Range fora do arquivo"},
+}
+
+
+# BlobResponse é devolvida diretamente: como response_class, quebra a geração do OpenAPI no HEAD
+@router.get("/{file_id}/content", response_class=Response, responses=DOWNLOAD_RESPONSES)
+@router.head("/{file_id}/content", response_class=Response, responses=DOWNLOAD_RESPONSES)
+async def download_file(
+    file_id: int,
+    current_user: UserResponse = Depends(require_files_read),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Baixar o conteúdo de um arquivo: Range (206), ETag forte (SHA-256) com 304 e cache imutável
+    """
+    stored = await get_file_service(db).get_file(current_tenant.id, file_id)
+    if not stored:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Arquivo não encontrado"
+        )
+    
+    path = blob_path(stored.sha256)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Conteúdo do arquivo indisponível"
+        )
+    
+    accel_redirect = None
+    if settings.FILE_ACCEL_REDIRECT_PREFIX:
+        accel_redirect = settings.FILE_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + blob_key(stored.sha256)
+    
+    return BlobResponse(
+        path,
+        sha256=stored.sha256,
+        media_type=stored.content_type,
+        filename=stored.filename,
+        stat_result=stat_result,
+        accel_redirect=accel_redirect,
+    )
+
+
+@router.delete("/{file_id}")
+async def delete_file(
+    file_id: int,
+    current_user: UserResponse = Depends(require_files_manage),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Remover arquivo e liberar o espaço
+    """
+    try:
+        await get_file_service(db).delete_file(current_tenant.id, file_id)
+        return {"message": "Arquivo removido com sucesso"}
+    
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
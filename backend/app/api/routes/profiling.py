@@ -0,0 +1,59 @@
+"""
+Profiling Routes
+Rotas administrativas para profiling sob demanda de requisições
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiling import PROFILE_HEADER, profile_store
+from app.core.security import create_profiling_token
+from app.domain.schemas.user import UserResponse
+from app.api.dependencies import require_profiling
+
+
+router = APIRouter()
+
+
+@router.post("/token")
+async def create_token(
+    current_user: UserResponse = Depends(require_profiling)
+):
+    """
+    Gerar token assinado para perfilar requisições via header
+    """
+    return {
+        "token": create_profiling_token(current_user.id),
+        "header": PROFILE_HEADER,
+        "expires_in": settings.PROFILING_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+
+@router.get("/")
+async def list_profiles(
+    current_user: UserResponse = Depends(require_profiling)
+):
+    """
+    Listar profiles armazenados
+    """
+    return profile_store.list()
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: str,
+    current_user: UserResponse = Depends(require_profiling)
+):
+    """
+    Obter profile em formato de stacks colapsadas (flame graph)
+    """
+    profile = profile_store.get(profile_id)
+    
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile não encontrado"
+        )
+    
+    return profile.collapsed()
@@ -4,9 +4,10 @@ Rotas para gerenciamento de tenants (clínicas)
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.domain.schemas.tenant import (
     TenantCreate,
@@ -21,8 +22,17 @@ from app.domain.schemas.tenant import (
 from app.domain.schemas.user import UserResponse
 from app.infrastructure.repositories.tenant_repository import TenantRepository
 from app.infrastructure.repositories.user_repository import UserRepository
+from app.infrastructure.repositories.cep_repository import CepCacheRepository
+from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+from app.infrastructure.external.viacep_client import ViaCepUnavailable
 from app.application.services.tenant_service import TenantService
-from app.api.dependencies import get_current_user, require_super_admin
+from app.application.services.cep_service import CepService
+from app.application.services.provisioning_service import TenantProvisioningService
+from app.application.services.storage_service import StorageQuotaExceeded, StorageService
+from app.infrastructure.file_storage import UploadTooLarge, UnsupportedFileType
+from app.api.dependencies import get_current_user, get_current_tenant, require_super_admin, require_tenant_settings
+from app.api.routes.files import declared_length, get_file_service, upload_error
+from app.api.streaming import body_lines, ndjson_response
 
 
 router = APIRouter()
@@ -107,6 +117,97 @@ async def onboarding_step3(
         )
 
 
+@router.get("/onboarding/cep/{cep}", response_model=dict)
+async def lookup_cep(
+    cep: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Consultar endereço pelo CEP (autopreenchimento do passo 2)
+    """
+    cep_service = CepService(CepCacheRepository(db))
+    
+    try:
+        address = await cep_service.lookup(cep)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except ViaCepUnavailable:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Consulta de CEP indisponível no momento"
+        )
+    
+    if address is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="CEP não encontrado"
+        )
+    
+    return address
+
+
+@router.post("/provisioning")
+async def provision_tenants(
+    request: Request,
+    current_user: UserResponse = Depends(require_super_admin)
+):
+    """
+    Provisionamento em lote (apenas SUPER_ADMIN): NDJSON com uma clínica e seu dono por linha.
+    Responde em NDJSON, um resultado por linha à medida que cada lote é gravado, e um resumo no final.
+    Os lotes são processados enquanto o corpo ainda está chegando
+    """
+    lines = body_lines(request, settings.PROVISIONING_MAX_ROWS, settings.PROVISIONING_MAX_BYTES)
+    
+    def results(db: AsyncSession):
+        service = TenantProvisioningService(TenantRepository(db), UserRepository(db))
+        return service.provision(lines)
+    
+    return ndjson_response(results)
+
+
+@router.get("/me/storage", response_model=dict)
+async def get_storage_usage(
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Uso de armazenamento e cota do tenant atual
+    """
+    storage_service = StorageService(StorageLedgerRepository(db))
+    return await storage_service.get_usage(current_tenant.id)
+
+
+@router.put("/me/logo", response_model=TenantResponse)
+async def upload_tenant_logo(
+    request: Request,
+    filename: str = Query("logo", min_length=1, max_length=255),
+    current_user: UserResponse = Depends(require_tenant_settings),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enviar o logo do tenant (corpo = imagem): gravado no armazenamento de arquivos, com logo_url
+    apontando para o conteúdo; o logo anterior é removido
+    """
+    try:
+        await get_file_service(db).replace_image(
+            tenant_id=current_tenant.id,
+            user_id=current_user.id,
+            filename=filename,
+            chunks=request.stream(),
+            declared_size=declared_length(request),
+            target=current_tenant,
+            attribute="logo_url",
+        )
+    except (UploadTooLarge, UnsupportedFileType, StorageQuotaExceeded) as e:
+        raise upload_error(e)
+    
+    return current_tenant
+
+
 @router.get("/", response_model=List[TenantResponse])
 async def list_tenants(
     skip: int = Query(0, ge=0),
@@ -4,9 +4,10 @@ Rotas para gerenciamento de usuários
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.domain.schemas.user import (
     UserCreate,
@@ -17,11 +18,18 @@ from app.domain.schemas.user import (
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.tenant_repository import TenantRepository
 from app.application.services.auth_service import AuthService
+from app.application.services.storage_service import StorageQuotaExceeded
+from app.application.services.user_import_service import UserImportService, open_csv
+from app.infrastructure.file_storage import UploadTooLarge, UnsupportedFileType
 from app.api.dependencies import (
     get_current_user, 
     get_current_tenant,
-    require_admin_access
+    require_admin_access,
+    require_users_import,
+    require_users_read
 )
+from app.api.routes.files import declared_length, get_file_service, upload_error
+from app.api.streaming import BodyLimitExceeded, body_lines, ndjson_response
 
 
 router = APIRouter()
@@ -32,7 +40,7 @@ async def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
-    current_user: UserResponse = Depends(require_admin_access),
+    current_user: UserResponse = Depends(require_users_read),
     current_tenant = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db)
 ):
@@ -54,7 +62,7 @@ async def list_users(
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
-    current_user: UserResponse = Depends(require_admin_access),
+    current_user: UserResponse = Depends(require_users_read),
     current_tenant = Depends(get_current_tenant),
     db: AsyncSession = Depends(get_db)
 ):
@@ -63,7 +71,7 @@ async def get_user(
     """
     user_repo = UserRepository(db)
     
-    user = await user_repo.get_user_by_id_and_tenant(
+    user = await user_repo.get_by_id_and_tenant(
         user_id=user_id,
         tenant_id=current_tenant.id
     )
@@ -105,6 +113,75 @@ async def create_user(
         )
 
 
+@router.post("/import")
+async def import_users(
+    request: Request,
+    current_user: UserResponse = Depends(require_users_import),
+    current_tenant = Depends(get_current_tenant)
+):
+    """
+    Importar usuários em lote no tenant atual a partir de um CSV (colunas email, full_name e
+    opcionalmente phone, role, cpf, professional_id, password). Responde em NDJSON: resultado
+    por linha, progresso a cada lote e um resumo no final
+    """
+    # Terminadores preservados: campos entre aspas podem conter quebras de linha. Só o cabeçalho
+    # é lido antes de responder; os lotes são importados enquanto o resto do corpo chega
+    lines = body_lines(
+        request, settings.USER_IMPORT_MAX_ROWS + 1, settings.USER_IMPORT_MAX_BYTES, keepends=True
+    )
+    
+    try:
+        _, rows = await open_csv(lines)
+    except BodyLimitExceeded as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    tenant_id = current_tenant.id
+    
+    def results(db: AsyncSession):
+        service = UserImportService(UserRepository(db), TenantRepository(db))
+        return service.import_rows(tenant_id, rows)
+    
+    return ndjson_response(results)
+
+
+@router.put("/me/avatar", response_model=UserResponse)
+async def upload_avatar(
+    request: Request,
+    filename: str = Query("avatar", min_length=1, max_length=255),
+    current_user: UserResponse = Depends(get_current_user),
+    current_tenant = Depends(get_current_tenant),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enviar o avatar do usuário atual (corpo = imagem): gravado no armazenamento de arquivos do
+    tenant, com avatar_url apontando para o conteúdo; o avatar anterior é removido
+    """
+    user = await UserRepository(db).get_by_id_and_tenant(current_user.id, current_tenant.id)
+    
+    try:
+        await get_file_service(db).replace_image(
+            tenant_id=current_tenant.id,
+            user_id=current_user.id,
+            filename=filename,
+            chunks=request.stream(),
+            declared_size=declared_length(request),
+            target=user,
+            attribute="avatar_url",
+        )
+    except (UploadTooLarge, UnsupportedFileType, StorageQuotaExceeded) as e:
+        raise upload_error(e)
+    
+    return user
+
+
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(
     user_id: int,
@@ -119,7 +196,7 @@ async def update_user(
     user_repo = UserRepository(db)
     
     # Verificar se usuário existe no tenant
-    user = await user_repo.get_user_by_id_and_tenant(
+    user = await user_repo.get_by_id_and_tenant(
         user_id=user_id,
         tenant_id=current_tenant.id
     )
@@ -155,7 +232,7 @@ async def update_user_password(
     user_repo = UserRepository(db)
     
     # Verificar se usuário existe no tenant
-    user = await user_repo.get_user_by_id_and_tenant(
+    user = await user_repo.get_by_id_and_tenant(
         user_id=user_id,
         tenant_id=current_tenant.id
     )
@@ -190,7 +267,7 @@ async def deactivate_user(
     user_repo = UserRepository(db)
     
     # Verificar se usuário existe no tenant
-    user = await user_repo.get_user_by_id_and_tenant(
+    user = await user_repo.get_by_id_and_tenant(
         user_id=user_id,
         tenant_id=current_tenant.id
     )
@@ -232,7 +309,7 @@ async def activate_user(
     user_repo = UserRepository(db)
     
     # Verificar se usuário existe no tenant
-    user = await user_repo.get_user_by_id_and_tenant(
+    user = await user_repo.get_by_id_and_tenant(
         user_id=user_id,
         tenant_id=current_tenant.id
     )
@@ -0,0 +1,131 @@
+"""
+Streaming Helpers
+Leitura de corpos por linha (NDJSON/CSV) e respostas NDJSON com resultados à medida que são gerados
+"""
+
+import json
+from typing import Any, AsyncIterator, Callable, Dict
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.types import Receive, Scope, Send
+
+from app.core.database import AsyncSessionLocal
+
+
+# Maior linha física aceita (um registro NDJSON, ou uma linha do CSV)
+MAX_LINE_BYTES = 64 * 1024
+
+
+class BodyLimitExceeded(ValueError):
+    """
+    Corpo acima do limite de bytes, de linhas ou de tamanho de linha
+    """
+    pass
+
+
+def body_lines(
+    request: Request,
+    max_lines: int,
+    max_bytes: int,
+    keepends: bool = False,
+    max_line_bytes: int = MAX_LINE_BYTES
+) -> AsyncIterator[bytes]:
+    """
+    Linhas do corpo à medida que chegam. Content-Length acima de `max_bytes` é recusado aqui (413),
+    antes de responder; durante a leitura, passar de `max_bytes`, `max_lines` ou `max_line_bytes`
+    levanta BodyLimitExceeded. Com `keepends` as linhas mantêm o terminador (\n ou \r\n), como num
+    arquivo aberto com newline="" (CSV)
+    """
+    declared = request.headers.get("content-length")
+    if declared is not None:
+        try:
+            declared_size = int(declared)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Content-Length inválido"
+            )
+        if declared_size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Máximo de {max_bytes} bytes por envio"
+            )
+    
+    return _iter_lines(request, max_lines, max_bytes, keepends, max_line_bytes)
+
+
+async def _iter_lines(
+    request: Request,
+    max_lines: int,
+    max_bytes: int,
+    keepends: bool,
+    max_line_bytes: int
+) -> AsyncIterator[bytes]:
+    # Contagem corrente: um corpo chunked (ou com Content-Length falso) para no limite
+    received = 0
+    count = 0
+    buffer = bytearray()
+    
+    def line_of(raw: bytes) -> bytes:
+        nonlocal count
+        count += 1
+        if count > max_lines:
+            raise BodyLimitExceeded(f"Máximo de {max_lines} linhas por envio")
+        if len(raw) > max_line_bytes:
+            raise BodyLimitExceeded(f"Linha {count} com mais de {max_line_bytes} bytes")
+        return raw if keepends else raw.rstrip(b"\r\n")
+    
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise BodyLimitExceeded(f"Máximo de {max_bytes} bytes por envio")
+        
+        buffer += chunk
+        start = 0
+        end = buffer.find(b"\n")
+        while end >= 0:
+            line = line_of(bytes(buffer[start:end + 1]))
+            start = end + 1
+            yield line
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+        
+        # Linha ainda sem terminador: não deixar o buffer crescer sem limite
+        if len(buffer) > max_line_bytes:
+            raise BodyLimitExceeded(f"Linha {count + 1} com mais de {max_line_bytes} bytes")
+    
+    if buffer.strip():
+        yield line_of(bytes(buffer))
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse cujo corpo pode ler o corpo da requisição: não disputa o receive() para
+    detectar desconexão (a desconexão chega como ClientDisconnect na leitura do corpo)
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.stream_response(send)
+        
+        if self.background is not None:
+            await self.background()
+
+
+def ndjson_response(produce: Callable[[AsyncSession], AsyncIterator[Dict[str, Any]]]) -> StreamingResponse:
+    """
+    Resposta NDJSON com os resultados de `produce(db)`, uma linha por resultado. `produce` pode
+    consumir o corpo da requisição (body_lines) enquanto os resultados são enviados; um limite
+    estourado no meio do envio vira uma última linha de erro
+    """
+    async def body():
+        # Sessão própria: a de get_db é fechada antes do corpo da resposta ser enviado
+        async with AsyncSessionLocal() as db:
+            try:
+                async for result in produce(db):
+                    yield json.dumps(result, ensure_ascii=False, default=str) + "\n"
+            except BodyLimitExceeded as e:
+                yield json.dumps({"status": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+    
+    return DuplexStreamingResponse(body(), media_type="application/x-ndjson")
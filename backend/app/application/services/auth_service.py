@@ -5,8 +5,6 @@ Serviço de autenticação com suporte multi-tenant
 
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-import httpx
-import json
 
 from app.core.config import settings
 from app.core.security import (
@@ -14,11 +12,12 @@ from app.core.security import (
     create_refresh_token,
     verify_token,
     get_password_hash,
+    get_password_hash_async,
     create_password_reset_token,
     verify_password_reset_token
 )
-from app.domain.schemas.auth import Token
-from app.domain.schemas.user import UserCreate, UserResponse, UserRegister
+from app.domain.schemas.auth import Token, UserRegister
+from app.domain.schemas.user import UserCreate, UserResponse
 from app.domain.models.user import User, UserRole
 from app.infrastructure.repositories.user_repository import UserRepository
 from app.infrastructure.repositories.tenant_repository import TenantRepository
@@ -143,6 +142,19 @@ class AuthService:
             }
         )
     
+    async def _insert_user(self, user_data: UserCreate) -> User:
+        """
+        Inserir usuário com ON CONFLICT (email único por tenant, sem diferenciar maiúsculas):
+        dispensa a consulta prévia e também cobre cadastros simultâneos do mesmo email
+        """
+        hashed_password = await get_password_hash_async(user_data.password)
+        user = await self.user_repo.insert_if_absent(user_data, hashed_password)
+        if user is None:
+            raise ValueError("Email já cadastrado neste tenant")
+        
+        await self.user_repo.db.commit()
+        return user
+    
     async def register_user(self, user_data: UserRegister) -> UserResponse:
         """
         Registrar novo usuário em tenant existente
@@ -155,13 +167,6 @@ class AuthService:
         if not tenant.is_active:
             raise ValueError("Tenant inativo")
         
-        # Verificar se email já existe no tenant
-        existing_user = await self.user_repo.get_by_email_and_tenant(
-            user_data.email, tenant.id
-        )
-        if existing_user:
-            raise ValueError("Email já cadastrado neste tenant")
-        
         # Verificar limite de usuários
         user_count = await self.user_repo.count_by_tenant(tenant.id)
         if user_count >= tenant.max_users:
@@ -177,7 +182,7 @@ class AuthService:
             role=UserRole.ASSISTENTE  # Role padrão
         )
         
-        user = await self.user_repo.create(user_create)
+        user = await self._insert_user(user_create)
         
         # Atualizar contagem de usuários no tenant
         await self.tenant_repo.update_user_count(tenant.id)
@@ -188,13 +193,6 @@ class AuthService:
         """
         Criar usuário (usado por admins)
         """
-        # Verificar se email já existe no tenant
-        existing_user = await self.user_repo.get_by_email_and_tenant(
-            user_data.email, user_data.tenant_id
-        )
-        if existing_user:
-            raise ValueError("Email já cadastrado neste tenant")
-        
         # Buscar tenant
         tenant = await self.tenant_repo.get_by_id(user_data.tenant_id)
         if not tenant:
@@ -206,7 +204,7 @@ class AuthService:
             raise ValueError("Limite de usuários excedido")
         
         # Criar usuário
-        user = await self.user_repo.create(user_data)
+        user = await self._insert_user(user_data)
         
         # Atualizar contagem de usuários no tenant
         await self.tenant_repo.update_user_count(tenant.id)
@@ -0,0 +1,182 @@
+"""
+CEP Service
+Consulta de CEP com cache persistente, coalescência de requisições e fallback para cache expirado
+"""
+
+import asyncio
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.domain.models.cep_cache import CepCache
+from app.infrastructure.external.cep_index import CepIndex, get_cep_index
+from app.infrastructure.external.viacep_client import ViaCepClient, ViaCepUnavailable, viacep_client
+from app.infrastructure.repositories.cep_repository import CepCacheRepository
+
+
+def normalize_cep(cep: str) -> str:
+    """
+    Normalizar CEP para 8 dígitos
+    """
+    digits = re.sub(r"\D", "", cep or "")
+    if len(digits) != 8:
+        raise ValueError("CEP inválido")
+    return digits
+
+
+class CepService:
+    """
+    Serviço de consulta de CEP
+    """
+    
+    # Consultas em andamento por CEP, compartilhadas entre requisições do worker
+    _inflight: Dict[str, "asyncio.Task"] = {}
+    
+    def __init__(
+        self,
+        cep_repo: CepCacheRepository,
+        client: ViaCepClient = viacep_client,
+        index: Optional[CepIndex] = None
+    ):
+        self.cep_repo = cep_repo
+        self.client = client
+        self.index = index if index is not None else get_cep_index()
+    
+    def lookup_offline(self, cep: str) -> Optional[Dict[str, Any]]:
+        """
+        Consulta apenas no índice offline (sem I/O), para validação em lote
+        """
+        if self.index is None:
+            return None
+        return self.index.lookup(normalize_cep(cep))
+    
+    @staticmethod
+    def is_fresh(entry: CepCache) -> bool:
+        """
+        Entrada ainda dentro do TTL (menor para CEPs inexistentes)
+        """
+        if entry.found:
+            ttl = timedelta(days=settings.CEP_CACHE_TTL_DAYS)
+        else:
+            ttl = timedelta(hours=settings.CEP_NEGATIVE_CACHE_TTL_HOURS)
+        return datetime.utcnow() - entry.fetched_at < ttl
+    
+    @staticmethod
+    async def _save(addresses: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """
+        Gravar no cache numa sessão própria e curta: a sessão do serviço é a da requisição (tenant,
+        provisionamento), e o upsert não pode confirmar a transação do chamador nem segurar as
+        linhas de cep_cache travadas até o fim dela
+        """
+        if not addresses:
+            return
+        async with AsyncSessionLocal() as db:
+            await CepCacheRepository(db).save_many(addresses)
+            await db.commit()
+    
+    @classmethod
+    def _forget(cls, cep: str, task: "asyncio.Task") -> None:
+        cls._inflight.pop(cep, None)
+        # Marca a exceção como recuperada mesmo se todos os chamadores foram cancelados
+        if not task.cancelled():
+            task.exception()
+    
+    async def _fetch_shared(self, cep: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Uma única chamada externa por CEP, mesmo com várias requisições simultâneas;
+        retorna o endereço e se esta chamada foi a que consultou a API (líder)
+        """
+        task = self._inflight.get(cep)
+        leader = task is None
+        if leader:
+            task = asyncio.ensure_future(self.client.fetch(cep))
+            self._inflight[cep] = task
+            task.add_done_callback(lambda done: self._forget(cep, done))
+        
+        # shield: o cancelamento de uma requisição não cancela a consulta das demais
+        return await asyncio.shield(task), leader
+    
+    async def _fetch_coalesced(self, cep: str) -> Optional[Dict[str, Any]]:
+        address, leader = await self._fetch_shared(cep)
+        if leader:
+            await self._save({cep: address})
+        return address
+    
+    async def lookup(self, cep: str) -> Optional[Dict[str, Any]]:
+        """
+        Buscar endereço do CEP; None quando o CEP não existe.
+        Levanta ViaCepUnavailable se a API falhar e não houver cache (nem expirado)
+        """
+        cep = normalize_cep(cep)
+        
+        # Primeira camada: índice offline memory-mapped
+        if self.index is not None:
+            address = self.index.lookup(cep)
+            if address is not None:
+                return address
+        
+        entry = await self.cep_repo.get(cep)
+        if entry is not None and self.is_fresh(entry):
+            return entry.address
+        
+        try:
+            return await self._fetch_coalesced(cep)
+        except ViaCepUnavailable:
+            # Endereço de CEP muda raramente: cache expirado é melhor que erro
+            if entry is not None and entry.found:
+                return entry.address
+            raise
+    
+    async def lookup_many(
+        self,
+        ceps: Iterable[str],
+        concurrency: int = 10
+    ) -> Tuple[Dict[str, Optional[Dict[str, Any]]], Set[str]]:
+        """
+        Buscar vários CEPs (já normalizados) de uma vez: índice, uma consulta ao cache e chamadas
+        externas em paralelo só para os restantes. Retorna {cep: endereço ou None} e os CEPs
+        que ficaram sem resposta (API indisponível e sem cache)
+        """
+        pending = set(ceps)
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        
+        if self.index is not None:
+            for cep in list(pending):
+                address = self.index.lookup(cep)
+                if address is not None:
+                    found[cep] = address
+                    pending.discard(cep)
+        
+        entries = await self.cep_repo.get_many(pending)
+        for cep, entry in entries.items():
+            if self.is_fresh(entry):
+                found[cep] = entry.address
+                pending.discard(cep)
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch(cep: str):
+            async with semaphore:
+                try:
+                    return cep, *(await self._fetch_shared(cep))
+                except ViaCepUnavailable:
+                    return cep, None, None
+        
+        unavailable: Set[str] = set()
+        to_save: Dict[str, Optional[Dict[str, Any]]] = {}
+        for cep, address, leader in await asyncio.gather(*(fetch(cep) for cep in pending)):
+            if leader is None:
+                entry = entries.get(cep)
+                if entry is not None and entry.found:
+                    found[cep] = entry.address
+                else:
+                    unavailable.add(cep)
+                continue
+            found[cep] = address
+            if leader:
+                to_save[cep] = address
+        
+        await self._save(to_save)
+        return found, unavailable
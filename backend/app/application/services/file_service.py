@@ -0,0 +1,216 @@
+"""
+File Service
+Arquivos dos tenants: o corpo do upload é lido em streaming direto para o disco, a cota é
+reservada pelo livro-razão de armazenamento e o conteúdo é gravado uma única vez por SHA-256,
+compartilhado entre arquivos e tenants
+"""
+
+import logging
+import os
+import re
+from typing import Any, AsyncIterator, Iterable, List, Optional
+
+from app.core.config import settings
+from app.core.security import sanitize_filename
+from app.domain.models.storage import StoredFile
+from app.infrastructure.file_storage import UploadTooLarge, blob_key, publish, receive_upload
+from app.infrastructure.repositories.file_repository import StoredFileRepository
+from app.application.services.storage_service import StorageQuotaExceeded, StorageService
+
+
+logger = logging.getLogger(__name__)
+
+
+def blob_path(sha256: str) -> str:
+    """
+    Caminho do conteúdo em UPLOAD_DIR
+    """
+    return os.path.join(settings.UPLOAD_DIR, blob_key(sha256))
+
+
+# Rota de conteúdo dos arquivos (files.download_file), usada em Tenant.logo_url e User.avatar_url
+CONTENT_URL = "/api/v1/files/{file_id}/content"
+CONTENT_URL_PATTERN = re.compile(r"/api/v1/files/(\d+)/content")
+
+
+def content_url(file_id: int) -> str:
+    """
+    URL do conteúdo do arquivo
+    """
+    return CONTENT_URL.format(file_id=file_id)
+
+
+def file_id_from_url(url: Optional[str]) -> Optional[int]:
+    """
+    Arquivo apontado por uma URL de conteúdo (None para URLs externas)
+    """
+    match = CONTENT_URL_PATTERN.fullmatch(url or "")
+    return int(match.group(1)) if match else None
+
+
+def image_types() -> List[str]:
+    """
+    Tipos de imagem aceitos para logos e avatares
+    """
+    return [content_type for content_type in settings.ALLOWED_FILE_TYPES if content_type.startswith("image/")]
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.exception("Falha ao remover %s", path)
+
+
+class FileService:
+    """
+    Serviço de arquivos dos tenants
+    """
+    
+    def __init__(self, file_repo: StoredFileRepository, storage_service: StorageService):
+        self.file_repo = file_repo
+        self.storage_service = storage_service
+    
+    async def check_declared_size(self, tenant_id: int, declared_size: Optional[int]) -> None:
+        """
+        Recusar pelo Content-Length antes de ler o corpo: UploadTooLarge acima de MAX_FILE_SIZE,
+        StorageQuotaExceeded se não cabe no espaço livre do tenant
+        """
+        if declared_size is None:
+            return
+        if declared_size > settings.MAX_FILE_SIZE:
+            raise UploadTooLarge(f"Arquivo excede o limite de {settings.MAX_FILE_SIZE // (1024 * 1024)} MB")
+        
+        usage = await self.storage_service.get_usage(tenant_id)
+        if usage is not None and declared_size > usage["available_bytes"]:
+            raise StorageQuotaExceeded("Limite de armazenamento do plano excedido")
+    
+    async def upload(
+        self,
+        tenant_id: int,
+        user_id: Optional[int],
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        declared_size: Optional[int] = None,
+        allowed_types: Optional[Iterable[str]] = None
+    ) -> StoredFile:
+        """
+        Receber um arquivo em streaming, reservar a cota e registrar; um conteúdo já armazenado
+        (mesmo SHA-256, de qualquer tenant) só ganha mais uma referência. Em qualquer falha o
+        arquivo temporário é removido e nada é confirmado
+        """
+        await self.check_declared_size(tenant_id, declared_size)
+        db = self.file_repo.db
+        # Devolver a conexão ao pool enquanto o corpo chega (uploads lentos não seguram conexões)
+        await db.commit()
+        
+        received = await receive_upload(
+            chunks,
+            os.path.join(settings.UPLOAD_DIR, "tmp"),
+            max_size=settings.MAX_FILE_SIZE,
+            allowed_types=settings.ALLOWED_FILE_TYPES if allowed_types is None else allowed_types,
+            chunk_size=settings.UPLOAD_CHUNK_SIZE,
+        )
+        
+        published = False
+        try:
+            # A referência trava a linha do conteúdo até o commit: uploads simultâneos do mesmo
+            # conteúdo e a coleta esperam. Ordem das travas: conteúdo, depois tenant (cota)
+            references = await self.file_repo.acquire_blob(received.sha256, received.size, received.content_type)
+            if references == 1:
+                await publish(received, blob_path(received.sha256))
+                published = True
+            stored = await self.file_repo.create(
+                tenant_id=tenant_id,
+                uploaded_by=user_id,
+                filename=sanitize_filename(filename) or "arquivo",
+                content_type=received.content_type,
+                size_bytes=received.size,
+                sha256=received.sha256,
+            )
+            # A cota é lógica: cada tenant paga pelos seus arquivos, mesmo com conteúdo compartilhado
+            await self.storage_service.reserve(tenant_id, received.size, f"files/{stored.id}")
+        except BaseException:
+            received.discard()
+            if published:
+                # Ainda com a linha travada: ninguém mais referenciou este conteúdo
+                _remove_quietly(blob_path(received.sha256))
+            await db.rollback()
+            raise
+        
+        # Conteúdo já armazenado: o temporário não é usado (sem fsync)
+        received.discard()
+        await db.commit()
+        return stored
+    
+    async def replace_image(
+        self,
+        tenant_id: int,
+        user_id: Optional[int],
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        declared_size: Optional[int],
+        target: Any,
+        attribute: str
+    ) -> StoredFile:
+        """
+        Enviar uma imagem (logo do tenant, avatar do usuário) e apontar `target.<attribute>` para o
+        conteúdo; a imagem anterior, se era um arquivo do tenant, é removida (libera a cota)
+        """
+        stored = await self.upload(tenant_id, user_id, filename, chunks, declared_size, image_types())
+        
+        previous = file_id_from_url(getattr(target, attribute))
+        setattr(target, attribute, content_url(stored.id))
+        await self.file_repo.db.commit()
+        
+        if previous is not None and previous != stored.id:
+            try:
+                await self.delete_file(tenant_id, previous)
+            except ValueError:
+                # Já removido pela rota de arquivos
+                pass
+        return stored
+    
+    async def list_files(self, tenant_id: int, skip: int = 0, limit: int = 100) -> List[StoredFile]:
+        """
+        Arquivos do tenant
+        """
+        return await self.file_repo.list_by_tenant(tenant_id, skip, limit)
+    
+    async def get_file(self, tenant_id: int, file_id: int) -> Optional[StoredFile]:
+        """
+        Arquivo do tenant
+        """
+        return await self.file_repo.get_by_id_and_tenant(file_id, tenant_id)
+    
+    async def delete_file(self, tenant_id: int, file_id: int) -> None:
+        """
+        Remover arquivo, liberar a cota e coletar o conteúdo se era a última referência
+        """
+        stored = await self.file_repo.get_by_id_and_tenant(file_id, tenant_id)
+        if not stored:
+            raise ValueError("Arquivo não encontrado")
+        
+        references = await self.file_repo.release_blob(stored.sha256)
+        await self.storage_service.release(tenant_id, stored.size_bytes, f"files/{stored.id}")
+        await self.file_repo.delete(stored)
+        await self.file_repo.db.commit()
+        
+        if references == 0:
+            await self.collect_blobs()
+    
+    async def collect_blobs(self, limit: int = 1000) -> int:
+        """
+        Apagar do disco e do banco os conteúdos sem referências. O arquivo é removido antes do
+        commit, com a linha travada: um upload simultâneo do mesmo conteúdo espera e o grava de novo
+        """
+        db = self.file_repo.db
+        sha256s = await self.file_repo.lock_unreferenced_blobs(limit)
+        for sha256 in sha256s:
+            _remove_quietly(blob_path(sha256))
+        if sha256s:
+            await self.file_repo.delete_blobs(sha256s)
+        await db.commit()
+        return len(sha256s)
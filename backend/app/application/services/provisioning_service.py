@@ -0,0 +1,311 @@
+"""
+Tenant Provisioning Service
+Provisionamento de tenants em lote para revendedores: validação, consultas de unicidade e de CEP,
+hash de senhas e inserção feitos por lote, com um resultado por linha
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.documents import BATCH_CONTEXT, normalize_document, validate_cnpjs, validate_cpfs
+from app.core.security import (
+    create_password_reset_token,
+    generate_tenant_slug,
+    get_password_hash_async,
+    make_unusable_password
+)
+from app.domain.models.user import UserRole
+from app.domain.schemas.tenant import TenantCreate, TenantProvisionRow
+from app.infrastructure.existence_filters import normalize_cnpj, normalize_email
+from app.infrastructure.repositories.cep_repository import CepCacheRepository
+from app.infrastructure.repositories.tenant_repository import TenantRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.application.services.cep_service import CepService, normalize_cep
+
+
+Line = Tuple[int, bytes]
+
+
+class ProvisionItem:
+    """
+    Linha válida em processamento
+    """
+    
+    def __init__(self, line: int, row: TenantProvisionRow):
+        self.line = line
+        self.row = row
+        self.cep: Optional[str] = None
+        self.cep_verified = False
+        self.slug: Optional[str] = None
+        self.hash_task: Optional[asyncio.Future] = None
+
+
+def validation_error_message(error: ValidationError) -> str:
+    """
+    Primeiro erro de validação como "campo: mensagem", para resultados por linha
+    """
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    message = first.get("msg", "inválido").removeprefix("Value error, ")
+    return f"{location}: {message}" if location else message
+
+
+def _ref_of(raw: bytes) -> Optional[str]:
+    try:
+        ref = json.loads(raw).get("ref")
+    except (ValueError, AttributeError):
+        return None
+    return str(ref) if ref is not None else None
+
+
+def _invalid_documents(items: List[ProvisionItem]) -> Dict[int, str]:
+    """
+    Linhas com CNPJ ou CPF inválido, validados em lote
+    """
+    invalid: Dict[int, str] = {}
+    for field, validate_many in (("cnpj", validate_cnpjs), ("cpf", validate_cpfs)):
+        informed = [item for item in items if getattr(item.row, field)]
+        checks = validate_many([getattr(item.row, field) for item in informed])
+        for item, ok in zip(informed, checks):
+            if not ok:
+                invalid.setdefault(item.line, f"{field}: {field.upper()} inválido")
+    return invalid
+
+
+class TenantProvisioningService:
+    """
+    Serviço de provisionamento em lote
+    """
+    
+    def __init__(
+        self,
+        tenant_repo: TenantRepository,
+        user_repo: UserRepository,
+        cep_service: Optional[CepService] = None
+    ):
+        self.tenant_repo = tenant_repo
+        self.user_repo = user_repo
+        self.cep_service = cep_service or CepService(CepCacheRepository(tenant_repo.db))
+        self.batch_size = settings.PROVISIONING_BATCH_SIZE
+        # Emails e CNPJs já vistos neste envio (duplicados entre linhas)
+        self._seen_emails: Set[str] = set()
+        self._seen_cnpjs: Set[str] = set()
+    
+    async def provision(self, lines: AsyncIterable[bytes]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Processar linhas NDJSON em lotes à medida que chegam, emitindo o resultado de cada linha
+        ao fim do seu lote e um resumo no final
+        """
+        started = time.perf_counter()
+        counts = {"created": 0, "error": 0}
+        batch: List[Line] = []
+        
+        async def flush():
+            for result in await self._provision_batch(batch):
+                counts[result["status"]] += 1
+                yield result
+        
+        line_no = 0
+        async for raw in lines:
+            line_no += 1
+            if not raw.strip():
+                continue
+            batch.append((line_no, raw))
+            if len(batch) >= self.batch_size:
+                async for result in flush():
+                    yield result
+                batch = []
+        if batch:
+            async for result in flush():
+                yield result
+        
+        yield {
+            "status": "summary",
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    @staticmethod
+    def _error(line: int, ref: Optional[str], message: str) -> Dict[str, Any]:
+        return {"line": line, "ref": ref, "status": "error", "error": message}
+    
+    async def _provision_batch(self, batch: List[Line]) -> List[Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        items: List[ProvisionItem] = []
+        
+        def reject(item: ProvisionItem, message: str) -> None:
+            results[item.line] = self._error(item.line, item.row.ref, message)
+            if item.hash_task is not None:
+                item.hash_task.cancel()
+        
+        # 1. Validação (schema, senha), CPFs/CNPJs do lote de uma vez e duplicados dentro do envio
+        parsed: List[ProvisionItem] = []
+        for line_no, raw in batch:
+            try:
+                row = TenantProvisionRow.model_validate_json(raw, context=BATCH_CONTEXT)
+            except ValidationError as e:
+                results[line_no] = self._error(line_no, _ref_of(raw), validation_error_message(e))
+                continue
+            parsed.append(ProvisionItem(line_no, row))
+        
+        invalid = _invalid_documents(parsed)
+        for item in parsed:
+            row = item.row
+            if item.line in invalid:
+                reject(item, invalid[item.line])
+                continue
+            
+            email = normalize_email(row.email)
+            cnpj = normalize_cnpj(row.cnpj) if row.cnpj else None
+            try:
+                item.cep = normalize_cep(row.cep)
+            except ValueError as e:
+                reject(item, str(e))
+                continue
+            if email in self._seen_emails:
+                reject(item, "Email duplicado no envio")
+                continue
+            if cnpj and cnpj in self._seen_cnpjs:
+                reject(item, "CNPJ duplicado no envio")
+                continue
+            self._seen_emails.add(email)
+            if cnpj:
+                self._seen_cnpjs.add(cnpj)
+            
+            # Hashes em threads enquanto as consultas do lote seguem no loop
+            if row.owner_password:
+                item.hash_task = asyncio.ensure_future(get_password_hash_async(row.owner_password))
+            items.append(item)
+        
+        # 2. Unicidade no banco: uma consulta por campo para o lote inteiro
+        taken_emails = await self.tenant_repo.find_taken("email", [item.row.email for item in items])
+        taken_cnpjs = await self.tenant_repo.find_taken(
+            "cnpj", [item.row.cnpj for item in items if item.row.cnpj]
+        )
+        remaining = []
+        for item in items:
+            if item.row.email.lower() in taken_emails:
+                reject(item, "Email já cadastrado")
+            elif item.row.cnpj and normalize_document(item.row.cnpj) in taken_cnpjs:
+                reject(item, "CNPJ já cadastrado")
+            else:
+                remaining.append(item)
+        items = remaining
+        
+        # 3. Endereços: CEPs distintos do lote, com chamadas externas em paralelo
+        addresses, unavailable = await self.cep_service.lookup_many(
+            {item.cep for item in items},
+            concurrency=settings.PROVISIONING_CEP_CONCURRENCY
+        )
+        remaining = []
+        for item in items:
+            if item.cep in unavailable:
+                # Mesmo comportamento do onboarding: segue com o endereço informado
+                remaining.append(item)
+                continue
+            found = addresses.get(item.cep)
+            if found is None:
+                reject(item, "CEP não encontrado")
+            elif found["state"] and found["state"] != item.row.state.upper():
+                reject(item, "CEP não corresponde à UF informada")
+            else:
+                item.cep_verified = True
+                remaining.append(item)
+        items = remaining
+        
+        # 4. Slugs: gerados em lote e conferidos numa consulta por tentativa
+        pending = items
+        for _ in range(5):
+            if not pending:
+                break
+            for item in pending:
+                item.slug = generate_tenant_slug(item.row.company_name)
+            taken = await self.tenant_repo.find_taken("slug", [item.slug for item in pending])
+            used: Set[str] = set()
+            retry = []
+            for item in pending:
+                if item.slug in taken or item.slug in used:
+                    retry.append(item)
+                else:
+                    used.add(item.slug)
+            pending = retry
+        for item in pending:
+            reject(item, "Não foi possível gerar um identificador para a clínica")
+        items = [item for item in items if item.line not in results]
+        
+        # 5. Hashes e inserção multi-linha numa transação
+        hashes = await asyncio.gather(*(item.hash_task for item in items if item.hash_task))
+        hashed = iter(hashes)
+        passwords = [next(hashed) if item.hash_task else None for item in items]
+        
+        try:
+            created = await self._insert(items, passwords)
+        except IntegrityError:
+            # Corrida com outra escrita: repetir linha a linha para isolar o conflito
+            await self.tenant_repo.db.rollback()
+            created = []
+            for item, password in zip(items, passwords):
+                try:
+                    created.extend(await self._insert([item], [password]))
+                except IntegrityError:
+                    await self.tenant_repo.db.rollback()
+                    reject(item, "Conflito ao gravar a clínica, tente novamente")
+        
+        results.update((result["line"], result) for result in created)
+        return [results[line_no] for line_no, _ in batch if line_no in results]
+    
+    async def _insert(
+        self,
+        items: List[ProvisionItem],
+        passwords: List[Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        if not items:
+            return []
+        
+        tenant_fields = set(TenantCreate.model_fields)
+        tenant_creates = []
+        for item in items:
+            data = item.row.model_dump(include=tenant_fields)
+            data.update(cep=item.cep, state=item.row.state.upper(), slug=item.slug)
+            # Dados já validados pelo TenantProvisionRow: sem revalidar
+            tenant_creates.append(TenantCreate.model_construct(**data))
+        tenants = await self.tenant_repo.insert_many_onboarded(tenant_creates)
+        
+        owner_rows = []
+        invites = []
+        for item, tenant, password in zip(items, tenants, passwords):
+            # Sem senha: dono convidado, define a senha pelo fluxo de reset
+            invite = None if password else create_password_reset_token(item.row.owner_email, tenant["id"])
+            invites.append(invite)
+            owner_rows.append({
+                "email": item.row.owner_email,
+                "full_name": item.row.owner_name,
+                "hashed_password": password or make_unusable_password(),
+                "phone": item.row.owner_phone,
+                "role": UserRole.DONO_CLINICA,
+                "tenant_id": tenant["id"],
+                "is_active": True,
+                "password_reset_token": invite,
+            })
+        owners = await self.user_repo.insert_many_returning(owner_rows)
+        await self.tenant_repo.db.commit()
+        
+        return [
+            {
+                "line": item.line,
+                "ref": item.row.ref,
+                "status": "created",
+                "tenant_id": tenant["id"],
+                "slug": tenant["slug"],
+                "owner_id": owner["id"],
+                "cep_verified": item.cep_verified,
+                "invite_token": invite,
+            }
+            for item, tenant, owner, invite in zip(items, tenants, owners, invites)
+        ]
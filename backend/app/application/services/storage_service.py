@@ -0,0 +1,110 @@
+"""
+Storage Service
+Uso de armazenamento por tenant: reserva de cota antes de gravar, liberação ao remover e
+reconciliação periódica dos totais com o livro-razão, sem percorrer os arquivos do tenant
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.domain.models.tenant import GIB
+from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+class StorageQuotaExceeded(ValueError):
+    """
+    Gravação excederia a cota de armazenamento do tenant
+    """
+
+
+class StorageService:
+    """
+    Serviço de uso de armazenamento
+    """
+    
+    def __init__(self, ledger_repo: StorageLedgerRepository):
+        self.ledger_repo = ledger_repo
+    
+    async def reserve(self, tenant_id: int, size_bytes: int, object_key: Optional[str] = None) -> int:
+        """
+        Reservar espaço para um arquivo; StorageQuotaExceeded se não couber. Sem commit: o
+        chamador confirma junto com o registro do arquivo (ou desfaz se a gravação falhar)
+        """
+        used = await self.ledger_repo.reserve(tenant_id, size_bytes, object_key)
+        if used is None:
+            raise StorageQuotaExceeded("Limite de armazenamento do plano excedido")
+        return used
+    
+    async def release(self, tenant_id: int, size_bytes: int, object_key: Optional[str] = None) -> Optional[int]:
+        """
+        Liberar o espaço de um arquivo removido. Sem commit
+        """
+        return await self.ledger_repo.release(tenant_id, size_bytes, object_key)
+    
+    async def get_usage(self, tenant_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Uso e cota do tenant (bytes e GB)
+        """
+        usage = await self.ledger_repo.get_usage(tenant_id)
+        if usage is None:
+            return None
+        return {
+            **usage,
+            "used_gb": round(usage["used_bytes"] / GIB, 3),
+            "quota_gb": round(usage["quota_bytes"] / GIB, 3),
+            "available_bytes": max(0, usage["quota_bytes"] - usage["used_bytes"]),
+        }
+
+
+async def reconcile_storage() -> Optional[Dict[int, int]]:
+    """
+    Uma passada de reconciliação (None se outro worker estava reconciliando)
+    """
+    async with AsyncSessionLocal() as session:
+        fixed = await StorageLedgerRepository(session).reconcile()
+        await session.commit()
+    if fixed:
+        logger.warning("Uso de armazenamento corrigido pela reconciliação: %s", fixed)
+    return fixed
+
+
+class StorageReconciler:
+    """
+    Reconciliação periódica em background (STORAGE_RECONCILE_SECONDS); com vários workers, um
+    lock consultivo garante uma passada por vez
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last_result: Optional[Dict[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                self.last_result = await reconcile_storage()
+            except Exception:
+                logger.exception("Falha na reconciliação de armazenamento")
+    
+    def start(self) -> None:
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+storage_reconciler = StorageReconciler(settings.STORAGE_RECONCILE_SECONDS)
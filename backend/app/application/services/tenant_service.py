@@ -0,0 +1,257 @@
+"""
+Tenant Service
+Serviço de tenants: onboarding em 3 passos e administração de clínicas
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.exc import IntegrityError
+
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    generate_tenant_slug,
+    get_password_hash_async
+)
+from app.domain.models.tenant import Tenant
+from app.domain.models.user import UserRole
+from app.domain.schemas.tenant import (
+    TenantCreate,
+    TenantUpdate,
+    OnboardingStep1,
+    OnboardingStep2,
+    OnboardingStep3
+)
+from app.domain.schemas.user import UserCreate
+from app.infrastructure.external.viacep_client import ViaCepUnavailable
+from app.infrastructure.onboarding_sessions import OnboardingSessionStore, onboarding_sessions
+from app.infrastructure.repositories.cep_repository import CepCacheRepository
+from app.infrastructure.repositories.tenant_repository import TenantRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.application.services.cep_service import CepService
+
+
+SESSION_EXPIRED = "Sessão de onboarding expirada ou inválida"
+
+
+class TenantService:
+    """
+    Serviço de tenants
+    """
+    
+    def __init__(
+        self,
+        tenant_repo: TenantRepository,
+        user_repo: UserRepository,
+        sessions: OnboardingSessionStore = onboarding_sessions,
+        cep_service: Optional[CepService] = None
+    ):
+        self.tenant_repo = tenant_repo
+        self.user_repo = user_repo
+        self.sessions = sessions
+        self.cep_service = cep_service or CepService(CepCacheRepository(tenant_repo.db))
+    
+    async def _check_tenant_uniqueness(self, email: str, cnpj: Optional[str], use_filter: bool = True) -> None:
+        if await self.tenant_repo.email_exists(email, use_filter=use_filter):
+            raise ValueError("Email já cadastrado")
+        if cnpj and await self.tenant_repo.cnpj_exists(cnpj, use_filter=use_filter):
+            raise ValueError("CNPJ já cadastrado")
+    
+    async def validate_onboarding_step1(self, step1_data: OnboardingStep1) -> Dict[str, Any]:
+        """
+        Passo 1: validar dados da empresa e abrir a sessão de onboarding
+        """
+        await self._check_tenant_uniqueness(step1_data.email, step1_data.cnpj)
+        
+        session_id = await self.sessions.create({
+            "step": 1,
+            "company": step1_data.model_dump(mode="json"),
+        })
+        return {"session_id": session_id}
+    
+    async def validate_onboarding_step2(self, step2_data: OnboardingStep2) -> Dict[str, Any]:
+        """
+        Passo 2: validar endereço (CEP) e guardar na sessão
+        """
+        session = await self.sessions.get(step2_data.session_id)
+        if not session:
+            raise ValueError(SESSION_EXPIRED)
+        
+        address_data = step2_data.model_dump(mode="json", exclude={"session_id"})
+        
+        try:
+            found = await self.cep_service.lookup(step2_data.cep)
+        except ViaCepUnavailable:
+            # Sem a API de CEP o onboarding segue com o endereço informado
+            found = None
+            address_data["cep_verified"] = False
+        else:
+            if found is None:
+                raise ValueError("CEP não encontrado")
+            if found["state"] and found["state"] != step2_data.state.upper():
+                raise ValueError("CEP não corresponde à UF informada")
+            address_data["cep_verified"] = True
+        
+        address_data["cep"] = found["cep"] if found else step2_data.cep.replace("-", "")
+        address_data["state"] = step2_data.state.upper()
+        
+        session.update(step=2, address=address_data)
+        await self.sessions.save(step2_data.session_id, session)
+        
+        return {"address_data": address_data}
+    
+    async def _unique_slug(self, company_name: str) -> str:
+        for _ in range(5):
+            slug = generate_tenant_slug(company_name)
+            if not await self.tenant_repo.slug_exists(slug):
+                return slug
+        raise ValueError("Não foi possível gerar um identificador para a clínica")
+    
+    async def complete_onboarding(self, step3_data: OnboardingStep3) -> Dict[str, Any]:
+        """
+        Passo 3: criar tenant e usuário dono numa única transação e emitir os tokens
+        """
+        session = await self.sessions.get(step3_data.session_id)
+        if not session or session.get("step") != 2:
+            raise ValueError(SESSION_EXPIRED)
+        
+        company = session["company"]
+        address = session["address"]
+        
+        # O hash (bcrypt, ~centenas de ms) roda numa thread enquanto as consultas seguem no loop
+        hash_task = asyncio.create_task(get_password_hash_async(step3_data.owner_password))
+        try:
+            # Revalidar no banco (sem filtro: outro worker pode ter usado o email/CNPJ durante o wizard)
+            await self._check_tenant_uniqueness(company["email"], company.get("cnpj"), use_filter=False)
+            slug = await self._unique_slug(company["company_name"])
+            hashed_password = await hash_task
+        except BaseException:
+            hash_task.cancel()
+            raise
+        
+        tenant_create = TenantCreate(
+            **company,
+            **{key: value for key, value in address.items() if key != "cep_verified"},
+            slug=slug,
+            plan=step3_data.plan
+        )
+        
+        db = self.tenant_repo.db
+        try:
+            tenant = await self.tenant_repo.insert_onboarded(tenant_create)
+            owner = await self.user_repo.insert_returning(UserCreate(
+                email=step3_data.owner_email,
+                password=step3_data.owner_password,
+                full_name=step3_data.owner_name,
+                phone=step3_data.owner_phone,
+                role=UserRole.DONO_CLINICA,
+                tenant_id=tenant["id"]
+            ), hashed_password)
+            await db.commit()
+        except IntegrityError:
+            # Corrida com outro onboarding (ex.: mesmo slug): nada foi gravado
+            await db.rollback()
+            raise ValueError("Não foi possível concluir o onboarding, tente novamente")
+        except BaseException:
+            await db.rollback()
+            raise
+        
+        await self.sessions.delete(step3_data.session_id)
+        
+        return self._onboarding_result(
+            tenant_id=tenant["id"],
+            slug=tenant["slug"],
+            company_name=tenant["company_name"],
+            plan=tenant["plan"].value,
+            owner_id=owner["id"],
+            owner_email=owner["email"],
+            owner_name=owner["full_name"]
+        )
+    
+    def _onboarding_result(
+        self,
+        tenant_id: int,
+        slug: str,
+        company_name: str,
+        plan: str,
+        owner_id: int,
+        owner_email: str,
+        owner_name: str
+    ) -> Dict[str, Any]:
+        access_token = create_access_token(
+            data={"sub": str(owner_id), "tenant_id": tenant_id, "role": UserRole.DONO_CLINICA.value}
+        )
+        refresh_token = create_refresh_token(
+            data={"sub": str(owner_id), "tenant_id": tenant_id}
+        )
+        
+        return {
+            "tenant": {
+                "id": tenant_id,
+                "slug": slug,
+                "company_name": company_name,
+                "plan": plan
+            },
+            "owner": {
+                "id": owner_id,
+                "email": owner_email,
+                "full_name": owner_name,
+                "role": UserRole.DONO_CLINICA.value
+            },
+            "access_token": access_token,
+            "refresh_token": refresh_token,
+            "login_url": f"/login?tenant={slug}",
+            "message": "Onboarding concluído com sucesso"
+        }
+    
+    async def list_tenants(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        search: Optional[str] = None
+    ) -> List[Tenant]:
+        """
+        Listar tenants
+        """
+        return await self.tenant_repo.list_tenants(skip=skip, limit=limit, search=search)
+    
+    async def get_tenant_by_id(self, tenant_id: int) -> Optional[Tenant]:
+        """
+        Buscar tenant por ID
+        """
+        return await self.tenant_repo.get_by_id(tenant_id)
+    
+    async def get_tenant_stats(self, tenant_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Estatísticas do tenant
+        """
+        return await self.tenant_repo.get_tenant_stats(tenant_id)
+    
+    async def update_tenant(self, tenant_id: int, tenant_update: TenantUpdate) -> Tenant:
+        """
+        Atualizar tenant
+        """
+        if tenant_update.email:
+            existing = await self.tenant_repo.get_by_email(tenant_update.email)
+            if existing and existing.id != tenant_id:
+                raise ValueError("Email já cadastrado")
+        
+        tenant = await self.tenant_repo.update_tenant(tenant_id, tenant_update)
+        if not tenant:
+            raise ValueError("Tenant não encontrado")
+        return tenant
+    
+    async def deactivate_tenant(self, tenant_id: int) -> None:
+        """
+        Desativar tenant (soft delete)
+        """
+        if not await self.tenant_repo.deactivate_tenant(tenant_id):
+            raise ValueError("Tenant não encontrado")
+    
+    async def activate_tenant(self, tenant_id: int) -> None:
+        """
+        Reativar tenant
+        """
+        if not await self.tenant_repo.activate_tenant(tenant_id):
+            raise ValueError("Tenant não encontrado")
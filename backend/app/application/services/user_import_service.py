@@ -0,0 +1,292 @@
+"""
+User Import Service
+Importação em lote de usuários (CSV) para clínicas migrando de outros sistemas: validação,
+duplicados numa consulta por lote, hashes em paralelo e inserção multi-linha, com progresso
+e erros por linha sem abortar o lote
+"""
+
+import csv
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+
+from app.core.config import settings
+from app.core.documents import BATCH_CONTEXT, validate_cpfs
+from app.core.security import create_password_reset_token, get_password_hashes, make_unusable_password
+from app.domain.models.user import UserRole
+from app.domain.schemas.user import UserImportRow
+from app.infrastructure.repositories.tenant_repository import TenantRepository
+from app.infrastructure.repositories.user_repository import UserRepository
+from app.application.services.provisioning_service import validation_error_message
+
+
+REQUIRED_COLUMNS = {"email", "full_name"}
+IMPORT_COLUMNS = ["email", "full_name", "phone", "role", "cpf", "professional_id", "password"]
+
+# Roles globais não podem ser criadas pela importação de um tenant
+FORBIDDEN_ROLES = {UserRole.SUPER_ADMIN}
+
+Row = Tuple[int, Dict[str, Optional[str]]]
+
+
+class _LineFeed:
+    """
+    Entrada do csv.reader: linhas já recebidas e ainda não lidas. `dry` indica que o reader pediu
+    uma linha que ainda não chegou, ou seja, o registro atual pode estar incompleto
+    """
+    
+    def __init__(self):
+        self.pending: Deque[str] = deque()
+        self.taken: List[str] = []
+        self.dry = False
+    
+    def __iter__(self) -> "_LineFeed":
+        return self
+    
+    def __next__(self) -> str:
+        if not self.pending:
+            self.dry = True
+            raise StopIteration
+        line = self.pending.popleft()
+        self.taken.append(line)
+        return line
+    
+    def start_record(self) -> None:
+        self.taken = []
+        self.dry = False
+    
+    def rewind(self) -> None:
+        """Devolver as linhas do registro incompleto para relê-lo com mais dados"""
+        self.pending.extendleft(reversed(self.taken))
+        self.taken = []
+
+
+async def open_csv(lines: AsyncIterator[bytes]) -> Tuple[List[str], AsyncIterator[Row]]:
+    """
+    Cabeçalho e registros (linha onde começam, valores) do CSV à medida que as linhas chegam;
+    ValueError se faltar coluna obrigatória. Só o cabeçalho é lido aqui (antes de responder).
+    As linhas devem manter o terminador (body_lines(..., keepends=True)) para que campos entre
+    aspas com quebras de linha cheguem inteiros ao csv.reader
+    """
+    sample = (await anext(lines, b"")).decode("utf-8-sig", errors="replace")
+    dialect = ";" if sample.count(";") > sample.count(",") else ","
+    header = [column.strip().lower() for column in next(csv.reader([sample], delimiter=dialect), [])]
+    
+    missing = REQUIRED_COLUMNS - set(header)
+    if missing:
+        raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(sorted(missing))}")
+    
+    async def rows() -> AsyncIterator[Row]:
+        feed = _LineFeed()
+        reader = csv.reader(feed, delimiter=dialect)
+        finished = False
+        # Linha física onde começa o próximo registro (o cabeçalho é a linha 1)
+        line = 2
+        
+        async def receive(count: int) -> None:
+            nonlocal finished
+            for _ in range(count):
+                raw = await anext(lines, None)
+                if raw is None:
+                    finished = True
+                    return
+                feed.pending.append(raw.decode("utf-8-sig", errors="replace"))
+        
+        while True:
+            if not feed.pending and not finished:
+                await receive(1)
+            feed.start_record()
+            values = next(reader, None)
+            if feed.dry and not finished:
+                # Registro multilinha ainda incompleto: reler com mais linhas (dobrando a leitura,
+                # para que um campo entre aspas muito longo não seja relido linha a linha)
+                count = max(1, len(feed.taken))
+                feed.rewind()
+                await receive(count)
+                continue
+            if values is None:
+                return
+            
+            start, line = line, line + len(feed.taken)
+            if not any(value.strip() for value in values):
+                continue
+            row = {
+                column: (value.strip() or None)
+                for column, value in zip(header, values)
+                if column in IMPORT_COLUMNS
+            }
+            yield start, row
+    
+    return header, rows()
+
+
+class UserImportService:
+    """
+    Serviço de importação de usuários
+    """
+    
+    def __init__(self, user_repo: UserRepository, tenant_repo: TenantRepository):
+        self.user_repo = user_repo
+        self.tenant_repo = tenant_repo
+        self.batch_size = settings.USER_IMPORT_BATCH_SIZE
+        # Vagas restantes no plano e emails já vistos no arquivo
+        self._capacity = 0
+        self._seen: Set[str] = set()
+    
+    async def import_rows(self, tenant_id: int, rows: AsyncIterator[Row]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Importar as linhas em lotes à medida que chegam, emitindo o resultado de cada linha e o progresso ao fim de
+        cada lote, e um resumo no final
+        """
+        tenant = await self.tenant_repo.get_by_id(tenant_id)
+        if not tenant:
+            raise ValueError("Tenant não encontrado")
+        
+        started = time.perf_counter()
+        self._capacity = tenant.max_users - await self.user_repo.count_by_tenant(tenant_id)
+        counts = {"processed": 0, "created": 0, "error": 0}
+        
+        batch: List[Row] = []
+        
+        async def flush():
+            for result in await self._import_batch(tenant_id, batch):
+                counts[result["status"]] += 1
+                yield result
+            counts["processed"] += len(batch)
+            await self.tenant_repo.update_user_count(tenant_id)
+            yield {"status": "progress", **counts}
+        
+        async for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                async for result in flush():
+                    yield result
+                batch = []
+        if batch:
+            async for result in flush():
+                yield result
+        
+        yield {
+            "status": "summary",
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
+    @staticmethod
+    def _error(line: int, email: Optional[str], message: str) -> Dict[str, Any]:
+        return {"line": line, "email": email, "status": "error", "error": message}
+    
+    async def _import_batch(self, tenant_id: int, batch: List[Row]) -> List[Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        valid: List[Tuple[int, UserImportRow]] = []
+        
+        # 1. Validação (schema, senha, role), CPFs do lote de uma vez e duplicados dentro do arquivo
+        parsed: List[Tuple[int, UserImportRow]] = []
+        for line, values in batch:
+            if values.get("role"):
+                values["role"] = values["role"].upper()
+            try:
+                row = UserImportRow.model_validate(
+                    {k: v for k, v in values.items() if v is not None},
+                    context=BATCH_CONTEXT
+                )
+            except ValidationError as e:
+                results[line] = self._error(line, values.get("email"), validation_error_message(e))
+                continue
+            parsed.append((line, row))
+        
+        with_cpf = [(line, row.cpf) for line, row in parsed if row.cpf]
+        invalid_cpfs = {
+            line for (line, _), ok in zip(with_cpf, validate_cpfs([cpf for _, cpf in with_cpf])) if not ok
+        }
+        
+        for line, row in parsed:
+            email = row.email.lower()
+            if line in invalid_cpfs:
+                results[line] = self._error(line, row.email, "cpf: CPF inválido")
+            elif row.role in FORBIDDEN_ROLES:
+                results[line] = self._error(line, row.email, "Role não permitida na importação")
+            elif email in self._seen:
+                results[line] = self._error(line, row.email, "Email duplicado no arquivo")
+            else:
+                self._seen.add(email)
+                valid.append((line, row))
+        
+        # 2. Emails já cadastrados no tenant: uma consulta para o lote
+        existing = await self.user_repo.find_existing_emails(tenant_id, [row.email for _, row in valid])
+        accepted: List[Tuple[int, UserImportRow]] = []
+        for line, row in valid:
+            if row.email.lower() in existing:
+                results[line] = self._error(line, row.email, "Email já cadastrado neste tenant")
+            elif self._capacity <= 0:
+                results[line] = self._error(line, row.email, "Limite de usuários excedido")
+            else:
+                self._capacity -= 1
+                accepted.append((line, row))
+        
+        # 3. Hashes em paralelo (pool de hash, um por núcleo) e inserção multi-linha
+        hashes = iter(await get_password_hashes([row.password for _, row in accepted if row.password]))
+        passwords = [next(hashes) if row.password else None for _, row in accepted]
+        
+        try:
+            created = await self._insert(tenant_id, accepted, passwords)
+        except IntegrityError:
+            # Conflito com outra escrita: repetir linha a linha para isolar as linhas com erro
+            await self.user_repo.db.rollback()
+            created = []
+            for item, password in zip(accepted, passwords):
+                try:
+                    created.extend(await self._insert(tenant_id, [item], [password]))
+                except IntegrityError:
+                    await self.user_repo.db.rollback()
+                    # A vaga reservada para a linha não foi usada
+                    self._capacity += 1
+                    results[item[0]] = self._error(item[0], item[1].email, "Conflito ao gravar o usuário")
+        
+        results.update((result["line"], result) for result in created)
+        return [results[line] for line, _ in batch if line in results]
+    
+    async def _insert(
+        self,
+        tenant_id: int,
+        rows: List[Tuple[int, UserImportRow]],
+        passwords: List[Optional[str]]
+    ) -> List[Dict[str, Any]]:
+        if not rows:
+            return []
+        
+        values = []
+        invites = []
+        for (_, row), password in zip(rows, passwords):
+            # Sem senha: usuário convidado, define a senha pelo fluxo de reset
+            invite = None if password else create_password_reset_token(row.email, tenant_id)
+            invites.append(invite)
+            values.append({
+                "email": row.email,
+                "full_name": row.full_name,
+                "hashed_password": password or make_unusable_password(),
+                "phone": row.phone,
+                "role": row.role,
+                "tenant_id": tenant_id,
+                "cpf": row.cpf,
+                "professional_id": row.professional_id,
+                "is_active": row.is_active,
+                "password_reset_token": invite,
+            })
+        
+        users = await self.user_repo.insert_many_returning(values)
+        await self.user_repo.db.commit()
+        
+        return [
+            {
+                "line": line,
+                "email": user["email"],
+                "status": "created",
+                "user_id": user["id"],
+                "invite_token": invite,
+            }
+            for (line, _), user, invite in zip(rows, users, invites)
+        ]
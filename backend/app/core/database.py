@@ -3,13 +3,19 @@ Database Configuration
 Configuração do banco de dados PostgreSQL com SQLAlchemy 2.0
 """
 
+import asyncio
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, text
 
 from app.core.config import settings
 
 
+# Expressão de colunas geradas com só os dígitos de um documento (vazio vira NULL)
+DIGITS_ONLY = "NULLIF(regexp_replace({}, '[^0-9]', '', 'g'), '')"
+
+
 # Garantir que a URL use asyncpg
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgresql://"):
@@ -23,6 +29,8 @@ engine = create_async_engine(
     echo=settings.DEBUG,
     pool_pre_ping=True,
     pool_recycle=300,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
 )
 
 # Session factory
@@ -61,6 +69,22 @@ async def get_db():
             await session.close()
 
 
+# Pré-aquecimento do pool (cada worker abre suas conexões antes de aceitar tráfego)
+async def warm_pool(connections: int = settings.DB_POOL_SIZE) -> int:
+    """
+    Abrir `connections` conexões em paralelo e devolvê-las ao pool
+    """
+    conns = [engine.connect() for _ in range(connections)]
+    try:
+        # Todas abertas ao mesmo tempo, para não reutilizar a mesma conexão
+        await asyncio.gather(*(conn.start() for conn in conns))
+        await asyncio.gather(*(conn.execute(text("SELECT 1")) for conn in conns))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in conns), return_exceptions=True)
+    
+    return engine.pool.checkedin()
+
+
 # Função para criar todas as tabelas
 async def create_tables():
     """
@@ -0,0 +1,123 @@
+"""
+Document Validation
+Validação em lote de CPF/CNPJ para importações e conciliações: os dígitos verificadores de todos
+os documentos são calculados de uma vez sobre uma matriz de dígitos (numpy), com resultado idêntico
+a validate_cpf/validate_cnpj
+"""
+
+import importlib.util
+import logging
+from typing import List, Optional, Sequence
+
+from app.core.security import validate_cnpj, validate_cpf
+
+
+logger = logging.getLogger(__name__)
+
+# Pesos dos dígitos verificadores (mesmos de validate_cpf/validate_cnpj)
+CPF_WEIGHTS = ([10, 9, 8, 7, 6, 5, 4, 3, 2], [11, 10, 9, 8, 7, 6, 5, 4, 3, 2])
+CNPJ_WEIGHTS = ([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+# Linhas da matriz por bloco (limita a memória em lotes de milhões)
+CHUNK_ROWS = 1 << 16
+
+# Tudo que não é dígito ASCII, como o r'[^0-9]' dos validadores escalares
+_NON_DIGITS = bytes(b for b in range(256) if not 0x30 <= b <= 0x39)
+# Idem, preservando o separador usado para processar o lote como um único buffer
+_SEPARATOR = "\x00"
+_NON_DIGITS_KEEP_SEPARATOR = _NON_DIGITS[1:]
+
+# numpy é dependência do projeto, importado no primeiro uso (fora do startup); sem ele, os
+# validadores escalares, bem mais lentos em lotes grandes
+VECTORIZED = importlib.util.find_spec("numpy") is not None
+if not VECTORIZED:
+    logger.warning("numpy não instalado: validação de documentos em lote usa os validadores escalares")
+
+# Contexto de validação pydantic: os schemas deixam CPF/CNPJ para a validação em lote do chamador
+BATCH_CONTEXT = {"batch_documents": True}
+
+
+def _numpy():
+    import numpy
+    
+    return numpy
+
+
+def only_digits(value: str) -> bytes:
+    """
+    Dígitos ASCII do documento (caracteres não ASCII nunca são dígitos em [0-9])
+    """
+    return value.encode("ascii", "ignore").translate(None, _NON_DIGITS)
+
+
+def normalize_document(value: Optional[str]) -> Optional[str]:
+    """
+    CPF/CNPJ só com dígitos, como as colunas *_normalized (DIGITS_ONLY); vazio vira None
+    """
+    return (only_digits(value).decode() or None) if value else None
+
+
+def _digits_buffer(values: Sequence[Optional[str]]):
+    """
+    Dígitos de todos os documentos num buffer uint8, com início e tamanho de cada um
+    """
+    np = _numpy()
+    joined = _SEPARATOR.join([value or "" for value in values])
+    if joined.count(_SEPARATOR) == len(values) - 1:
+        data = joined.encode("ascii", "ignore").translate(None, _NON_DIGITS_KEEP_SEPARATOR)
+    else:
+        # Algum valor contém o separador: remover a formatação documento a documento
+        data = b"\x00".join([only_digits(value) if value else b"" for value in values])
+    
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    separators = np.flatnonzero(buffer == 0)
+    starts = np.concatenate(([0], separators + 1))
+    ends = np.concatenate((separators, [len(buffer)]))
+    return buffer, starts, ends - starts
+
+
+def _check_digits(matrix, weights: List[int]):
+    np = _numpy()
+    remainder = (matrix[:, :len(weights)] @ np.array(weights, dtype=np.int32)) % 11
+    return np.where(remainder < 2, 0, 11 - remainder)
+
+
+def _validate_many(values: Sequence[Optional[str]], length: int, weights) -> List[bool]:
+    if not values:
+        return []
+    
+    np = _numpy()
+    buffer, starts, lengths = _digits_buffer(values)
+    valid = np.zeros(len(values), dtype=bool)
+    positions = np.flatnonzero(lengths == length)
+    offsets = np.arange(length)
+    
+    for start in range(0, len(positions), CHUNK_ROWS):
+        rows = positions[start:start + CHUNK_ROWS]
+        matrix = (buffer[starts[rows, None] + offsets] - 0x30).astype(np.int32)
+        
+        # Todos os dígitos iguais (000..., 111...) são inválidos
+        repeated = (matrix == matrix[:, :1]).all(axis=1)
+        dv1 = _check_digits(matrix, weights[0])
+        dv2 = _check_digits(matrix, weights[1])
+        valid[rows] = ~repeated & (dv1 == matrix[:, length - 2]) & (dv2 == matrix[:, length - 1])
+    
+    return valid.tolist()
+
+
+def validate_cpfs(values: Sequence[Optional[str]]) -> List[bool]:
+    """
+    Validar CPFs em lote (formatados ou não); vazios e None são inválidos
+    """
+    if not VECTORIZED:
+        return [bool(value) and validate_cpf(value) for value in values]
+    return _validate_many(values, 11, CPF_WEIGHTS)
+
+
+def validate_cnpjs(values: Sequence[Optional[str]]) -> List[bool]:
+    """
+    Validar CNPJs em lote (formatados ou não); vazios e None são inválidos
+    """
+    if not VECTORIZED:
+        return [bool(value) and validate_cnpj(value) for value in values]
+    return _validate_many(values, 14, CNPJ_WEIGHTS)
@@ -0,0 +1,228 @@
+"""
+Health Checks
+Probes de liveness/readiness com verificações de dependências em cache, atualizadas em background
+"""
+
+import asyncio
+import importlib.util
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+CheckFunction = Callable[[], Awaitable[Dict[str, Any]]]
+
+
+class CheckFailed(Exception):
+    """
+    Falha de uma verificação de dependência (com detalhes para o relatório)
+    """
+    
+    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.details = details or {}
+
+
+async def check_database() -> Dict[str, Any]:
+    """
+    Verificar conectividade e estado do pool do banco
+    """
+    from app.core.database import engine
+    
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    
+    pool = engine.pool
+    return {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+    }
+
+
+def cache_client_error() -> Optional[str]:
+    """
+    Erro de configuração do cache: REDIS_URL definido sem o cliente redis instalado
+    """
+    if settings.REDIS_URL and importlib.util.find_spec("redis") is None:
+        return "REDIS_URL configurado, mas o cliente redis não está instalado"
+    return None
+
+
+async def check_cache() -> Dict[str, Any]:
+    """
+    Verificar backend de cache (Redis), quando configurado
+    """
+    if not settings.REDIS_URL:
+        return {"configured": False}
+    
+    try:
+        import redis.asyncio as redis
+    except ImportError:
+        # Erro de configuração, reportado no startup: não derrubar a readiness a cada probe
+        return {"configured": True, "misconfigured": cache_client_error()}
+    
+    client = redis.from_url(settings.REDIS_URL)
+    try:
+        await client.ping()
+    except Exception as e:
+        # Configurado mas indisponível: o relatório não pode cair em "não configurado"
+        raise CheckFailed(f"{type(e).__name__}: {e}", {"configured": True})
+    finally:
+        await client.aclose()
+    
+    return {"configured": True}
+
+
+async def check_migrations() -> Dict[str, Any]:
+    """
+    Verificar se o banco está na última revisão das migrações
+    """
+    from app.core.database import engine
+    from app.core.migrations import current_revision, head_revision
+    
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+    
+    head = head_revision()
+    if current != head:
+        raise CheckFailed("Migrações pendentes", {"revision": current, "head": head})
+    
+    return {"revision": current}
+
+
+class HealthMonitor:
+    """
+    Executa as verificações periodicamente e guarda o último resultado,
+    para que os probes nunca toquem o banco nem bloqueiem em conexões lentas
+    """
+    
+    def __init__(
+        self,
+        checks: Dict[str, CheckFunction],
+        interval: float,
+        timeout: float,
+        optional: tuple = ()
+    ):
+        self.checks = checks
+        self.interval = interval
+        self.timeout = timeout
+        self.optional = set(optional)
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.last_refresh: Optional[float] = None
+        self.draining = False
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run_check(self, name: str, check: CheckFunction) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), timeout=self.timeout)
+            status = "ok"
+            error = None
+        except asyncio.TimeoutError:
+            details, status, error = {}, "error", f"timeout após {self.timeout}s"
+        except CheckFailed as e:
+            details, status, error = e.details, "error", str(e)
+        except Exception as e:
+            details, status, error = {}, "error", f"{type(e).__name__}: {e}"
+        
+        result = {
+            "status": status,
+            "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+            **details,
+        }
+        if error:
+            result["error"] = error
+        return result
+    
+    async def refresh(self) -> None:
+        """
+        Executar todas as verificações em paralelo
+        """
+        names = list(self.checks)
+        results = await asyncio.gather(
+            *(self._run_check(name, self.checks[name]) for name in names)
+        )
+        for name, result in zip(names, results):
+            previous = self.results.get(name, {}).get("status")
+            if previous != result["status"]:
+                log = logger.info if result["status"] == "ok" else logger.warning
+                log("Health check '%s': %s", name, result.get("error", result["status"]))
+        self.results = dict(zip(names, results))
+        self.last_refresh = time.monotonic()
+    
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Falha ao atualizar health checks")
+    
+    async def start(self) -> None:
+        """
+        Primeira verificação síncrona e início do refresh em background
+        """
+        self.draining = False
+        await self.refresh()
+        self._task = asyncio.create_task(self._loop())
+    
+    async def stop(self) -> None:
+        """
+        Parar refresh e passar a reportar not-ready (drenagem no load balancer)
+        """
+        self.draining = True
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    @property
+    def is_stale(self) -> bool:
+        """Resultados antigos demais para serem confiáveis"""
+        if self.last_refresh is None:
+            return True
+        return time.monotonic() - self.last_refresh > self.interval * 3
+    
+    @property
+    def is_ready(self) -> bool:
+        """Todas as dependências obrigatórias saudáveis"""
+        if self.draining or self.is_stale:
+            return False
+        return all(
+            result["status"] == "ok"
+            for name, result in self.results.items()
+            if name not in self.optional
+        )
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Relatório de readiness a partir do cache
+        """
+        age = None if self.last_refresh is None else round(time.monotonic() - self.last_refresh, 2)
+        return {
+            "status": "ready" if self.is_ready else "not_ready",
+            "draining": self.draining,
+            "checked_seconds_ago": age,
+            "checks": self.results,
+        }
+
+
+health_monitor = HealthMonitor(
+    checks={
+        "database": check_database,
+        "cache": check_cache,
+        "migrations": check_migrations,
+    },
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT
+)
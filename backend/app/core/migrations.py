@@ -0,0 +1,85 @@
+"""
+Schema Migrations
+Revisões do Alembic (backend/migrations): verificação no startup e aplicação programática
+"""
+
+import asyncio
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+class SchemaOutOfDate(RuntimeError):
+    """
+    O banco não está na revisão esperada pelo código (migração pendente ou código desatualizado)
+    """
+
+
+def alembic_config():
+    """
+    Configuração do Alembic sem reconfigurar o logging da aplicação
+    """
+    from alembic.config import Config
+    
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """
+    Última revisão em migrations/versions
+    """
+    from alembic.script import ScriptDirectory
+    
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def current_revision(conn) -> Optional[str]:
+    """
+    Revisão registrada no banco (None se as migrações nunca rodaram)
+    """
+    exists = await conn.scalar(text("SELECT to_regclass('alembic_version') IS NOT NULL"))
+    if not exists:
+        return None
+    return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+
+
+async def check_schema() -> str:
+    """
+    Falhar se o banco não estiver na revisão head; retorna a revisão
+    """
+    from app.core.database import engine
+    
+    async with engine.connect() as conn:
+        current = await current_revision(conn)
+    
+    head = head_revision()
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Schema do banco na revisão {current or 'nenhuma'}, esperado {head}: "
+            "rode `alembic upgrade head` (em backend/) antes de iniciar a aplicação"
+        )
+    return current
+
+
+def upgrade(revision: str = "head") -> None:
+    """
+    Aplicar as migrações até `revision` (mesmo efeito de `alembic upgrade`)
+    """
+    from alembic import command
+    
+    command.upgrade(alembic_config(), revision)
+
+
+async def upgrade_database(revision: str = "head") -> None:
+    """
+    Versão assíncrona de upgrade: o env.py tem seu próprio event loop, então roda em outra thread
+    """
+    await asyncio.to_thread(upgrade, revision)
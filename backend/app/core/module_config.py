@@ -0,0 +1,174 @@
+"""
+Module Configuration
+Módulos HUBB e configurações efetivas de cada tenant, em camadas: padrões da plataforma
+(HUBB_*_ENABLED), padrões do plano, exceções do tenant (modules_enabled, settings) e preferências
+do usuário. A visão de cada tenant é compilada uma vez e reaproveitada enquanto o
+tenants.config_version não mudar
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, FrozenSet, Mapping, Optional, Tuple
+
+from app.core.config import settings
+
+
+MODULES = ("hubb_core", "hubb_hof", "hubb_vision", "hubb_rh", "hubb_ia")
+
+# Chaves iguais aos valores de TenantPlan (str enum: TenantPlan.X e "X" são a mesma chave)
+PLAN_MODULES: Dict[str, FrozenSet[str]] = {
+    "TRIAL": frozenset(MODULES),
+    "BASIC": frozenset({"hubb_core"}),
+    "PROFESSIONAL": frozenset({"hubb_core", "hubb_hof", "hubb_vision", "hubb_rh"}),
+    "ENTERPRISE": frozenset(MODULES),
+}
+
+# Configurações padrão da plataforma, sobrepostas por tenant.settings e user.preferences
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    "locale": "pt-BR",
+    "timezone": "America/Sao_Paulo",
+    "currency": "BRL",
+}
+
+
+def platform_modules() -> FrozenSet[str]:
+    """
+    Módulos disponíveis na plataforma (HUBB_*_ENABLED); um módulo desligado aqui não é
+    habilitado por plano, tenant ou usuário
+    """
+    return frozenset(module for module in MODULES if getattr(settings, f"{module.upper()}_ENABLED", False))
+
+
+@dataclass(frozen=True)
+class ModuleConfig:
+    """
+    Visão compilada e imutável dos módulos e configurações de um tenant (ou de um usuário)
+    """
+    tenant_id: int
+    version: int
+    modules: Mapping[str, bool]
+    settings: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    
+    def enabled(self, module: str) -> bool:
+        """Verificar se o módulo está habilitado"""
+        return self.modules.get(module, False)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Configuração efetiva"""
+        return self.settings.get(key, default)
+
+
+def compile_tenant_config(tenant: Any, available: Optional[FrozenSet[str]] = None) -> ModuleConfig:
+    """
+    Compilar a visão do tenant: plataforma -> plano -> tenant.modules_enabled/settings
+    """
+    available = platform_modules() if available is None else available
+    enabled = set(PLAN_MODULES.get(tenant.plan, ()))
+    for module, value in (tenant.modules_enabled or {}).items():
+        if isinstance(value, bool):
+            (enabled.add if value else enabled.discard)(module)
+    
+    return ModuleConfig(
+        tenant_id=tenant.id,
+        version=tenant.config_version or 0,
+        modules=MappingProxyType({module: module in enabled and module in available for module in MODULES}),
+        settings=MappingProxyType({**DEFAULT_SETTINGS, **(tenant.settings or {})}),
+    )
+
+
+def apply_preferences(config: ModuleConfig, preferences: Optional[Mapping[str, Any]]) -> ModuleConfig:
+    """
+    Sobrepor as preferências do usuário: {"modules": {"hubb_ia": false}} só oculta módulos (não
+    habilita o que o tenant não tem); as demais chaves sobrepõem as configurações
+    """
+    if not preferences:
+        return config
+    
+    hidden = {module for module, value in (preferences.get("modules") or {}).items() if value is False}
+    overrides = {key: value for key, value in preferences.items() if key != "modules"}
+    return ModuleConfig(
+        tenant_id=config.tenant_id,
+        version=config.version,
+        modules=MappingProxyType({
+            module: enabled and module not in hidden for module, enabled in config.modules.items()
+        }),
+        settings=MappingProxyType({**config.settings, **overrides}) if overrides else config.settings,
+    )
+
+
+class ModuleConfigResolver:
+    """
+    Cache das visões compiladas por tenant (e por usuário com preferências), invalidado pela
+    versão: cada requisição já carrega o tenant, então comparar config_version não custa
+    consulta e escritas de outros workers são vistas na requisição seguinte
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._tenants: Dict[int, ModuleConfig] = {}
+        self._users: Dict[Tuple[int, int], Tuple[Any, ModuleConfig]] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def for_tenant(self, tenant: Any) -> ModuleConfig:
+        """
+        Visão do tenant, recompilada só se a versão mudou
+        """
+        config = self._tenants.get(tenant.id)
+        if config is not None and config.version == (tenant.config_version or 0):
+            self.hits += 1
+            return config
+        
+        self.misses += 1
+        config = compile_tenant_config(tenant)
+        if len(self._tenants) >= self.max_entries:
+            self._tenants.clear()
+            self._users.clear()
+        self._tenants[tenant.id] = config
+        return config
+    
+    def for_user(self, tenant: Any, user: Any) -> ModuleConfig:
+        """
+        Visão do tenant com as preferências do usuário; usuários sem preferências compartilham
+        a do tenant
+        """
+        config = self.for_tenant(tenant)
+        if not user.preferences:
+            return config
+        
+        key = (tenant.id, user.id)
+        # Versão do usuário: updated_at muda em qualquer escrita pelo ORM
+        version = (config.version, user.updated_at)
+        cached = self._users.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        user_config = apply_preferences(config, user.preferences)
+        if len(self._users) >= self.max_entries:
+            self._users.clear()
+        self._users[key] = (version, user_config)
+        return user_config
+    
+    def invalidate(self, tenant_id: Optional[int] = None) -> None:
+        """
+        Descartar as visões de um tenant (ou todas)
+        """
+        if tenant_id is None:
+            self._tenants.clear()
+            self._users.clear()
+            return
+        self._tenants.pop(tenant_id, None)
+        for key in [key for key in self._users if key[0] == tenant_id]:
+            del self._users[key]
+    
+    def report(self) -> Dict[str, Any]:
+        return {
+            "tenants": len(self._tenants),
+            "users": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Instância do processo (um cache por worker)
+module_configs = ModuleConfigResolver()
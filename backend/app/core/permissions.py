@@ -0,0 +1,92 @@
+"""
+Permission Engine
+Permissões como bits: a role e as exceções do usuário (User.permissions) são compiladas uma vez
+numa máscara inteira, e cada rota exige um conjunto de bits, conferido com um único AND
+"""
+
+import enum
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+
+class Permission(enum.IntFlag):
+    """
+    Permissões do sistema; as chaves em User.permissions são os nomes em minúsculas
+    (ex.: {"financial_read": true, "users_manage": false})
+    """
+    NONE = 0
+    USERS_READ = 1 << 0          # Listar e consultar usuários do tenant
+    USERS_MANAGE = 1 << 1        # Criar, alterar, desativar usuários e trocar senhas
+    USERS_IMPORT = 1 << 2        # Importação de usuários em lote
+    FINANCIAL_READ = 1 << 3      # Dados financeiros do tenant
+    CLINICAL_ACCESS = 1 << 4     # Área clínica (dentistas)
+    TENANT_SETTINGS = 1 << 5     # Configurações e módulos do tenant
+    PLATFORM_ADMIN = 1 << 6      # Administração da plataforma (todos os tenants)
+    PROFILING = 1 << 7           # Endpoints de diagnóstico
+    FILES_READ = 1 << 8          # Listar e baixar arquivos do tenant
+    FILES_MANAGE = 1 << 9        # Enviar e remover arquivos do tenant
+
+
+# Administração do tenant (dono e admin master)
+TENANT_ADMIN = (
+    Permission.USERS_READ
+    | Permission.USERS_MANAGE
+    | Permission.USERS_IMPORT
+    | Permission.FINANCIAL_READ
+    | Permission.CLINICAL_ACCESS
+    | Permission.TENANT_SETTINGS
+    | Permission.FILES_READ
+    | Permission.FILES_MANAGE
+)
+
+# Chaves iguais aos valores de UserRole (str enum: UserRole.X e "X" são a mesma chave)
+ROLE_PERMISSIONS: Dict[str, Permission] = {
+    "SUPER_ADMIN": ~Permission.NONE,
+    "ADMIN_MASTER": TENANT_ADMIN,
+    "DONO_CLINICA": TENANT_ADMIN,
+    "DENTISTA": Permission.CLINICAL_ACCESS | Permission.FILES_READ | Permission.FILES_MANAGE,
+    "ASSISTENTE": Permission.FILES_READ,
+    "RECEPCIONISTA": Permission.FILES_READ,
+    "FINANCEIRO": Permission.FINANCIAL_READ | Permission.FILES_READ,
+    "RH": Permission.FILES_READ,
+    "PACIENTE": Permission.NONE,
+}
+
+# Só a role concede permissões de plataforma; exceções por usuário não as concedem
+PLATFORM_ONLY = Permission.PLATFORM_ADMIN | Permission.PROFILING
+
+_BY_NAME = {permission.name.lower(): permission for permission in Permission if permission.name != "NONE"}
+
+
+@lru_cache(maxsize=1024)
+def _compile(role: str, overrides: Tuple[Tuple[str, bool], ...]) -> int:
+    mask = ROLE_PERMISSIONS.get(role, Permission.NONE)
+    for name, granted in overrides:
+        permission = _BY_NAME.get(name)
+        if permission is None:
+            continue
+        if granted:
+            mask |= permission & ~PLATFORM_ONLY
+        else:
+            mask &= ~permission
+    return int(mask)
+
+
+def compile_permissions(role: str, overrides: Optional[Mapping[str, Any]] = None) -> int:
+    """
+    Máscara de permissões da role com as exceções do usuário (true concede, false revoga;
+    chaves desconhecidas e valores não booleanos são ignorados). Principais com a mesma role
+    e as mesmas exceções compartilham a máscara compilada (UserRole é str: serve como chave)
+    """
+    if not overrides:
+        return _compile(role, ())
+    items = tuple(sorted((name, value) for name, value in overrides.items() if isinstance(value, bool)))
+    return _compile(role, items)
+
+
+def has_permissions(mask: int, required: int) -> bool:
+    """
+    A máscara contém todos os bits exigidos
+    """
+    required = int(required)
+    return mask & required == required
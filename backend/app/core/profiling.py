@@ -0,0 +1,270 @@
+"""
+Request Profiling
+Profiler por amostragem sob demanda para requisições em produção (stacks colapsadas para flame graphs)
+"""
+
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.security import verify_token
+
+
+PROFILE_HEADER = "x-profile-token"
+PROFILE_ID_HEADER = "x-profile-id"
+
+
+def _frame_name(frame) -> str:
+    """
+    Nome de um frame no formato usado pelas stacks colapsadas
+    """
+    code = frame.f_code
+    path = code.co_filename.replace(os.sep, "/").rsplit("/", 2)
+    location = "/".join(path[-2:])
+    return f"{code.co_name} ({location}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _await_chain(coro) -> List[str]:
+    """
+    Percorrer a cadeia de awaits de uma coroutine suspensa (da mais externa à mais interna)
+    """
+    names = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        names.append(_frame_name(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    return names
+
+
+class RequestProfile:
+    """
+    Amostras colapsadas de uma única requisição
+    """
+    
+    def __init__(self, label: str, task: asyncio.Task, thread_id: int):
+        self.id = uuid.uuid4().hex
+        self.label = label
+        self.task = task
+        self.thread_id = thread_id
+        self.root_code = task.get_coro().cr_code
+        self.samples: Counter = Counter()
+        self.started_at = datetime.utcnow()
+        self.duration_ms = 0.0
+        self._start = time.perf_counter()
+    
+    @property
+    def total_samples(self) -> int:
+        """Total de amostras coletadas"""
+        return sum(self.samples.values())
+    
+    def finish(self) -> None:
+        """Encerrar a coleta"""
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        self.task = None
+    
+    def collapsed(self) -> str:
+        """
+        Stacks no formato colapsado (compatível com flamegraph.pl / speedscope)
+        """
+        return "\n".join(
+            f"{stack} {count}"
+            for stack, count in self.samples.most_common()
+        )
+    
+    def summary(self) -> Dict:
+        """Metadados do profile"""
+        return {
+            "id": self.id,
+            "label": self.label,
+            "started_at": self.started_at,
+            "duration_ms": round(self.duration_ms, 2),
+            "samples": self.total_samples,
+        }
+
+
+class SamplingProfiler:
+    """
+    Amostrador em thread dedicada, ativa somente enquanto houver profiles abertos
+    """
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._active: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self, profile: RequestProfile) -> None:
+        """Iniciar amostragem de um profile"""
+        with self._lock:
+            self._active.append(profile)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="request-profiler",
+                    daemon=True
+                )
+                self._thread.start()
+    
+    def stop(self, profile: RequestProfile) -> None:
+        """Encerrar amostragem de um profile"""
+        with self._lock:
+            if profile in self._active:
+                self._active.remove(profile)
+        profile.finish()
+    
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                profiles = list(self._active)
+            
+            frames = sys._current_frames()
+            for profile in profiles:
+                stack = self._sample(profile, frames)
+                if stack:
+                    profile.samples[stack] += 1
+    
+    def _sample(self, profile: RequestProfile, frames) -> Optional[str]:
+        """
+        Capturar a stack da task da requisição: on-CPU se ela estiver executando
+        no loop, ou a cadeia de awaits (off-CPU) se estiver suspensa
+        """
+        task = profile.task
+        try:
+            loop = task.get_loop()
+            if asyncio.current_task(loop) is task:
+                frame = frames.get(profile.thread_id)
+                names = []
+                while frame is not None:
+                    names.append(_frame_name(frame))
+                    if frame.f_code is profile.root_code:
+                        break
+                    frame = frame.f_back
+                names.reverse()
+                return ";".join(names)
+            
+            names = _await_chain(task.get_coro())
+            if not names:
+                return None
+            return ";".join(names) + ";[await]"
+        except Exception:
+            # Frames podem mudar durante a leitura; a amostra é descartada
+            return None
+
+
+class ProfileStore:
+    """
+    Armazenamento em memória (e opcionalmente em disco) dos últimos profiles
+    """
+    
+    def __init__(self, max_profiles: int, output_dir: Optional[str] = None):
+        self._profiles: Deque[RequestProfile] = deque(maxlen=max_profiles)
+        self.output_dir = output_dir
+    
+    async def add(self, profile: RequestProfile) -> None:
+        """Guardar profile concluído; a gravação em disco roda numa thread, fora do event loop"""
+        self._profiles.append(profile)
+        
+        if self.output_dir:
+            await asyncio.to_thread(self._write, profile)
+    
+    def _write(self, profile: RequestProfile) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f"{profile.id}.collapsed")
+        with open(path, "w") as f:
+            f.write(profile.collapsed())
+    
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        """Buscar profile por ID"""
+        for profile in self._profiles:
+            if profile.id == profile_id:
+                return profile
+        return None
+    
+    def list(self) -> List[Dict]:
+        """Listar profiles armazenados (mais recentes primeiro)"""
+        return [profile.summary() for profile in reversed(self._profiles)]
+
+
+profiler = SamplingProfiler(interval=settings.PROFILING_INTERVAL_MS / 1000)
+profile_store = ProfileStore(
+    max_profiles=settings.PROFILING_MAX_STORED,
+    output_dir=settings.PROFILING_OUTPUT_DIR
+)
+
+
+def should_profile(path: str, token: Optional[str]) -> bool:
+    """
+    Decidir se a requisição deve ser perfilada: token assinado de admin
+    ou amostragem configurada por rota
+    """
+    if token is not None:
+        return verify_token(token, "profiling") is not None
+    
+    if settings.PROFILING_SAMPLE_RATE <= 0:
+        return False
+    
+    if settings.PROFILING_SAMPLE_ROUTES and not any(
+        path.startswith(route) for route in settings.PROFILING_SAMPLE_ROUTES
+    ):
+        return False
+    
+    return random.random() < settings.PROFILING_SAMPLE_RATE
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI que perfila requisições selecionadas e devolve o
+    ID do profile no header X-Profile-Id
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        token = None
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER.encode():
+                token = value.decode("latin-1")
+                break
+        
+        if not should_profile(scope["path"], token):
+            await self.app(scope, receive, send)
+            return
+        
+        profile = RequestProfile(
+            label=f"{scope['method']} {scope['path']}",
+            task=asyncio.current_task(),
+            thread_id=threading.get_ident()
+        )
+        
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER.encode(), profile.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        profiler.start(profile)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop(profile)
+            await profile_store.add(profile)
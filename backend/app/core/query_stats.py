@@ -0,0 +1,221 @@
+"""
+Query Statistics
+Instrumentação de queries por requisição: contagem, tempo total, detecção de N+1 e log de queries lentas
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Estatísticas da requisição corrente (None fora de uma requisição instrumentada)
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+# Normalização de statements para agrupar queries de mesmo formato
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_IN_LIST_RE = re.compile(r"\(\s*(?:\$\d+|\?|%\([^)]+\)s)(?:\s*,\s*(?:\$\d+|\?|%\([^)]+\)s))*\s*\)")
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Normalizar statement SQL removendo literais e listas de parâmetros
+    """
+    shape = _STRING_RE.sub("?", statement)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Descrever os parâmetros apenas pelos tipos (nunca registrar valores)
+    """
+    if parameters is None:
+        return None
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return [f"{len(parameters)} rows", parameter_shape(parameters[0])]
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class QueryStats:
+    """
+    Estatísticas acumuladas de queries de uma requisição
+    """
+    
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.slow_queries: List[Dict[str, Any]] = []
+    
+    @property
+    def total_time_ms(self) -> float:
+        """Tempo total de banco em milissegundos"""
+        return self.total_time * 1000
+    
+    def record(self, statement: str, duration: float) -> str:
+        """
+        Registrar execução de um statement
+        """
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_time += duration
+        self.shapes[shape] += 1
+        return shape
+    
+    def repeated_shapes(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """
+        Statements de mesmo formato repetidos acima do limite (suspeita de N+1)
+        """
+        threshold = threshold or settings.N_PLUS_ONE_THRESHOLD
+        return {
+            shape: count
+            for shape, count in self.shapes.items()
+            if count >= threshold
+        }
+    
+    def server_timing(self) -> str:
+        """
+        Valor do header Server-Timing com os totais de banco
+        """
+        return f'db;dur={self.total_time_ms:.2f};desc="{self.count} queries"'
+    
+    def report(self) -> None:
+        """
+        Emitir alertas de N+1 ao final da requisição
+        """
+        for shape, count in self.repeated_shapes().items():
+            logger.warning(
+                "Possível N+1 em %s: statement repetido %d vezes: %s",
+                self.label,
+                count,
+                shape,
+            )
+
+
+def start_query_stats(label: str = "") -> QueryStats:
+    """
+    Iniciar acumulação de estatísticas no contexto atual
+    """
+    stats = QueryStats(label)
+    _current_stats.set(stats)
+    return stats
+
+
+def get_query_stats() -> Optional[QueryStats]:
+    """
+    Obter estatísticas da requisição corrente
+    """
+    return _current_stats.get()
+
+
+def _explain(conn, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Capturar plano de execução de um SELECT lento
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    
+    try:
+        # Cursor DBAPI direto: não dispara os eventos de novo
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute("EXPLAIN " + statement, parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as e:
+        return f"EXPLAIN indisponível: {e}"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    
+    duration_ms = duration * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+    
+    slow_query = {
+        "statement": _WHITESPACE_RE.sub(" ", statement).strip(),
+        "parameters": parameter_shape(parameters),
+        "duration_ms": round(duration_ms, 2),
+        "plan": _explain(conn, statement, parameters) if settings.SLOW_QUERY_EXPLAIN else None,
+    }
+    if stats is not None:
+        stats.slow_queries.append(slow_query)
+    
+    logger.warning(
+        "Query lenta (%.2f ms) em %s: %s | parâmetros=%s%s",
+        duration_ms,
+        stats.label if stats is not None else "-",
+        slow_query["statement"],
+        slow_query["parameters"],
+        f"\n{slow_query['plan']}" if slow_query["plan"] else "",
+    )
+
+
+def install_query_listeners(engine: Engine) -> None:
+    """
+    Registrar listeners de execução no engine (idempotente)
+    """
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que abre um escopo de estatísticas por requisição
+    e publica os totais no header Server-Timing
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        stats = start_query_stats(f"{scope['method']} {scope['path']}")
+        
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            stats.report()
@@ -4,23 +4,45 @@ Utilitários para autenticação, autorização e criptografia
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from passlib.context import CryptContext
-from jose import JWTError, jwt
+from typing import Optional, Dict, Any, List
+import asyncio
+import os
+import re
 import secrets
 import string
 
 from app.core.config import settings
 
 
-# Context para hash de senhas
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Context para hash de senhas (passlib e jose são importados sob demanda, fora do import da app)
+_pwd_context = None
+
+
+def get_pwd_context():
+    """
+    Obter o CryptContext de senhas, criado no primeiro uso
+    """
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
+
+
+def __getattr__(name: str):
+    # Compatibilidade: `from app.core.security import pwd_context`
+    if name == "pwd_context":
+        return get_pwd_context()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Criar access token JWT
     """
+    from jose import jwt
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -43,6 +65,8 @@ def create_refresh_token(data: Dict[str, Any], expires_delta: Optional[timedelta
     """
     Criar refresh token JWT
     """
+    from jose import jwt
+    
     to_encode = data.copy()
     
     if expires_delta:
@@ -65,6 +89,8 @@ def create_password_reset_token(email: str, tenant_id: int) -> str:
     """
     Criar token para reset de senha
     """
+    from jose import jwt
+    
     delta = timedelta(hours=settings.PASSWORD_RESET_TOKEN_EXPIRE_HOURS)
     now = datetime.utcnow()
     expires = now + delta
@@ -85,10 +111,33 @@ def create_password_reset_token(email: str, tenant_id: int) -> str:
     return encoded_jwt
 
 
+def create_profiling_token(user_id: int) -> str:
+    """
+    Criar token assinado para perfilar requisições (apenas SUPER_ADMIN)
+    """
+    from jose import jwt
+    
+    expire = datetime.utcnow() + timedelta(minutes=settings.PROFILING_TOKEN_EXPIRE_MINUTES)
+    
+    encoded_jwt = jwt.encode(
+        {
+            "exp": expire,
+            "sub": str(user_id),
+            "type": "profiling"
+        },
+        settings.SECRET_KEY,
+        algorithm=settings.ALGORITHM,
+    )
+    
+    return encoded_jwt
+
+
 def verify_password_reset_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Verificar token de reset de senha
     """
+    from jose import JWTError, jwt
+    
     try:
         decoded_token = jwt.decode(
             token, 
@@ -109,6 +158,8 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
     """
     Verificar e decodificar token JWT
     """
+    from jose import JWTError, jwt
+    
     try:
         payload = jwt.decode(
             token, 
@@ -129,14 +180,59 @@ def get_password_hash(password: str) -> str:
     """
     Gerar hash da senha
     """
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+# Pool dedicado ao bcrypt: ele libera o GIL, então as threads usam todos os núcleos
+_hash_executor = None
+
+
+def get_hash_executor():
+    """
+    Obter o pool de threads de hash de senhas, criado no primeiro uso
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        
+        workers = settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1
+        _hash_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+    return _hash_executor
+
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Gerar hash da senha no pool de hash, sem bloquear o event loop
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hash_executor(), get_password_hash, password)
+
+
+async def get_password_hashes(passwords: List[str]) -> List[str]:
+    """
+    Gerar vários hashes em paralelo (um por núcleo), na ordem da entrada
+    """
+    return list(await asyncio.gather(*(get_password_hash_async(p) for p in passwords)))
+
+
+# Prefixo de senha inutilizável (usuário convidado, ainda sem senha definida)
+UNUSABLE_PASSWORD_PREFIX = "!"
+
+
+def make_unusable_password() -> str:
+    """
+    Valor de hashed_password que nunca confere com nenhuma senha
+    """
+    return UNUSABLE_PASSWORD_PREFIX + generate_random_string(40)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verificar senha plain text contra hash
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return False
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def generate_random_string(length: int = 32) -> str:
@@ -202,8 +298,6 @@ def validate_cnpj(cnpj: str) -> bool:
     """
     Validar CNPJ brasileiro
     """
-    import re
-    
     # Remover formatação
     cnpj = re.sub(r'[^0-9]', '', cnpj)
     
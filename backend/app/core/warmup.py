@@ -0,0 +1,210 @@
+"""
+Startup Warm-up
+Aquecimento dos custos de primeira requisição (mappers, validadores, bcrypt, JWT, pool, filtros, OpenAPI)
+e relatório de tempo de boot por fase
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class StartupTimer:
+    """
+    Cronometra as fases do boot do worker
+    """
+    
+    def __init__(self, started: float):
+        self.started = started
+        self.phases: List[Dict[str, Any]] = []
+        self.errors: Dict[str, str] = {}
+    
+    def mark(self, name: str, since: float, until: Optional[float] = None) -> None:
+        """
+        Registrar uma fase já concluída (ex.: imports de app.main)
+        """
+        until = time.perf_counter() if until is None else until
+        self.phases.append({"phase": name, "ms": round((until - since) * 1000, 2)})
+    
+    @contextmanager
+    def phase(self, name: str, required: bool = True):
+        """
+        Cronometrar um bloco; fases opcionais registram o erro sem abortar o boot
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            if required:
+                raise
+            self.errors[name] = f"{type(e).__name__}: {e}"
+            logger.warning("Warm-up '%s' falhou: %s", name, e)
+        finally:
+            self.mark(name, start)
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Relatório de boot: total desde o início do processo e fases mais lentas primeiro
+        """
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "phases": self.phases,
+            "slowest": sorted(self.phases, key=lambda p: p["ms"], reverse=True)[:3],
+            "errors": self.errors,
+        }
+
+
+def warm_mappers() -> None:
+    """
+    Configurar os mappers SQLAlchemy (relacionamentos, colunas instrumentadas)
+    """
+    from sqlalchemy.orm import configure_mappers
+    
+    import app.domain.models  # noqa: F401 - registrar modelos
+    
+    configure_mappers()
+
+
+def _sample_user() -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": 1,
+        "tenant_id": 1,
+        "email": "warmup@hubbassist.com",
+        "full_name": "Warm Up",
+        "phone": None,
+        "role": "ASSISTENTE",
+        "is_active": True,
+        "is_verified": True,
+        "created_at": now,
+        "updated_at": now,
+        "last_login": None,
+        "avatar_url": None,
+    }
+
+
+def _sample_tenant() -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "id": 1,
+        "slug": "warmup",
+        "company_name": "Clínica Warm Up",
+        "fantasy_name": None,
+        "email": "contato@warmup.com",
+        "phone": "11999999999",
+        "segment": "ODONTOLOGIA",
+        "cnpj": None,
+        "cpf": None,
+        "cep": "01001000",
+        "street": "Praça da Sé",
+        "number": "1",
+        "complement": None,
+        "neighborhood": "Sé",
+        "city": "São Paulo",
+        "state": "SP",
+        "country": "Brasil",
+        "plan": "TRIAL",
+        "status": "ACTIVE",
+        "is_active": True,
+        "max_users": 5,
+        "max_storage_gb": 1,
+        "monthly_fee": Decimal("0"),
+        "onboarding_completed": True,
+        "created_at": now,
+        "updated_at": now,
+        "total_users": 1,
+        "logo_url": None,
+    }
+
+
+def warm_schemas() -> None:
+    """
+    Exercitar validação e serialização dos schemas da rota de login e das respostas principais
+    """
+    from app.domain.schemas.auth import Token
+    from app.domain.schemas.tenant import TenantResponse
+    from app.domain.schemas.user import UserResponse
+    
+    user = UserResponse.model_validate(_sample_user())
+    tenant = TenantResponse.model_validate(_sample_tenant())
+    token = Token(
+        access_token="warmup",
+        refresh_token="warmup",
+        expires_in=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        user=user.model_dump(mode="json"),
+        tenant=tenant.model_dump(mode="json"),
+    )
+    token.model_dump_json()
+
+
+def warm_security() -> None:
+    """
+    Carregar o backend do bcrypt e os backends de assinatura JWT
+    """
+    from app.core.security import create_access_token, get_pwd_context, verify_token
+    
+    # Carrega o backend sem pagar o custo de um hash completo
+    get_pwd_context().handler("bcrypt").get_backend()
+    verify_token(create_access_token({"sub": "0", "tenant_id": 0}), "access")
+
+
+def warm_cep_index() -> None:
+    """
+    Abrir o índice offline de CEPs e tocar as páginas das chaves (busca binária)
+    """
+    from app.infrastructure.external.cep_index import get_cep_index
+    
+    index = get_cep_index()
+    if index is not None:
+        index.lookup("01001000")
+
+
+async def warm_existence_filters() -> None:
+    """
+    Carregar os filtros de existência de slug/email/CNPJ usados na validação do onboarding
+    """
+    if not settings.EXISTENCE_FILTERS_ENABLED:
+        return
+    
+    from app.infrastructure.existence_filters import tenant_filters
+    
+    await tenant_filters.rebuild()
+
+
+def warm_openapi(app) -> None:
+    """
+    Gerar (e deixar em cache) o schema OpenAPI, normalmente construído na primeira chamada a /docs
+    """
+    app.openapi()
+
+
+async def run_warmup(app, timer: StartupTimer, warm_pool: Optional[Callable] = None) -> Dict[str, Any]:
+    """
+    Executar todas as etapas de aquecimento, cronometradas; só o pool de conexões é obrigatório
+    """
+    if warm_pool is not None:
+        with timer.phase("database_pool"):
+            await warm_pool()
+    
+    with timer.phase("existence_filters", required=False):
+        await warm_existence_filters()
+    with timer.phase("sqlalchemy_mappers", required=False):
+        warm_mappers()
+    with timer.phase("pydantic_schemas", required=False):
+        warm_schemas()
+    with timer.phase("security_backends", required=False):
+        warm_security()
+    with timer.phase("cep_index", required=False):
+        warm_cep_index()
+    with timer.phase("openapi_schema", required=False):
+        warm_openapi(app)
+    
+    return timer.report()
@@ -5,5 +5,7 @@ Modelos de domínio da aplicação
 
 from app.domain.models.user import User
 from app.domain.models.tenant import Tenant
+from app.domain.models.cep_cache import CepCache
+from app.domain.models.storage import StorageLedgerEntry, StoredBlob, StoredFile
 
-__all__ = ["User", "Tenant"]
+__all__ = ["User", "Tenant", "CepCache", "StorageLedgerEntry", "StoredBlob", "StoredFile"]
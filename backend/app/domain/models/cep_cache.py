@@ -0,0 +1,31 @@
+"""
+CEP Cache Domain Model
+Cache persistente de consultas de CEP (ViaCEP)
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, String, DateTime, Boolean, Text
+
+from app.core.database import Base
+
+
+class CepCache(Base):
+    """
+    Resultado de consulta de CEP, incluindo CEPs inexistentes (cache negativo)
+    """
+    __tablename__ = "cep_cache"
+    
+    cep = Column(String(8), primary_key=True)  # Apenas dígitos
+    found = Column(Boolean, nullable=False)
+    data = Column(Text, nullable=True)  # JSON com o endereço normalizado
+    fetched_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    @property
+    def address(self) -> Optional[Dict[str, Any]]:
+        """Endereço normalizado, ou None para CEP inexistente"""
+        return json.loads(self.data) if self.data else None
+    
+    def __repr__(self):
+        return f"<CepCache(cep='{self.cep}', found={self.found})>"
@@ -0,0 +1,76 @@
+"""
+Storage Domain Model
+Arquivos enviados pelos tenants, conteúdos deduplicados e livro-razão de uso de armazenamento
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, ForeignKey, Index, text
+
+from app.core.database import Base
+
+
+class StorageLedgerEntry(Base):
+    """
+    Variação de bytes armazenados de um tenant (positiva ao gravar, negativa ao remover). A soma
+    das entradas é o uso do tenant; tenants.storage_used_bytes é o total corrente
+    """
+    __tablename__ = "storage_ledger"
+    __table_args__ = (
+        # Soma por tenant na reconciliação
+        Index("ix_storage_ledger_tenant_delta", "tenant_id", "delta_bytes"),
+    )
+    
+    id = Column(BigInteger, primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    delta_bytes = Column(BigInteger, nullable=False)
+    object_key = Column(String(255), nullable=True)  # Arquivo a que a variação se refere
+    reason = Column(String(20), nullable=False)  # upload, delete, reconcile
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<StorageLedgerEntry(tenant_id={self.tenant_id}, delta_bytes={self.delta_bytes}, reason='{self.reason}')>"
+
+
+class StoredBlob(Base):
+    """
+    Conteúdo armazenado uma única vez, endereçado pelo SHA-256 (em UPLOAD_DIR/blobs/), com a
+    contagem de arquivos de qualquer tenant que o referenciam
+    """
+    __tablename__ = "stored_blobs"
+    __table_args__ = (
+        # Coleta dos conteúdos sem referências
+        Index("ix_stored_blobs_unreferenced", "sha256", postgresql_where=text("ref_count = 0")),
+    )
+    
+    sha256 = Column(String(64), primary_key=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=False)  # Detectado pelos bytes iniciais
+    ref_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<StoredBlob(sha256='{self.sha256}', ref_count={self.ref_count})>"
+
+
+class StoredFile(Base):
+    """
+    Arquivo de um tenant (logo, avatar, documentos, exames): nome lógico no tenant apontando para
+    um conteúdo compartilhado
+    """
+    __tablename__ = "stored_files"
+    __table_args__ = (
+        # Listagem do tenant, mais recentes primeiro
+        Index("ix_stored_files_tenant_created_at", "tenant_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
+    uploaded_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    filename = Column(String(255), nullable=False)  # Nome informado, sanitizado
+    content_type = Column(String(100), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)  # Tamanho lógico, cobrado da cota do tenant
+    sha256 = Column(String(64), ForeignKey("stored_blobs.sha256"), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f"<StoredFile(id={self.id}, tenant_id={self.tenant_id}, filename='{self.filename}')>"
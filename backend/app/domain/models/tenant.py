@@ -4,12 +4,16 @@ Modelo de tenant (clínica) para multi-tenancy
 """
 
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum, Numeric
+from typing import Any, FrozenSet, List, Optional
+from sqlalchemy import BigInteger, Column, Computed, Integer, String, DateTime, Boolean, Enum, Numeric, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, DIGITS_ONLY
+
+
+GIB = 1024 ** 3
 
 
 class TenantStatus(str, enum.Enum):
@@ -50,16 +54,40 @@ class Tenant(Base):
     Modelo de tenant (clínica) para isolamento multi-tenant
     """
     __tablename__ = "tenants"
+    # Índices escolhidos pelas consultas dos repositórios (conferidos por benchmarks.plan_check)
+    __table_args__ = (
+        # Listagem administrativa (mais recentes primeiro, com ou sem filtro de status)
+        Index("ix_tenants_created_at", "created_at"),
+        Index("ix_tenants_status_created_at", "status", "created_at"),
+        # Trials expirando: só tenants ativos
+        Index("ix_tenants_active_plan_trial_end", "plan", "trial_end_date", postgresql_where=text("is_active")),
+        # Buscas por conteúdo JSON (@>): tenants com um módulo habilitado, com uma especialidade
+        Index(
+            "ix_tenants_modules_enabled",
+            "modules_enabled",
+            postgresql_using="gin",
+            postgresql_ops={"modules_enabled": "jsonb_path_ops"}
+        ),
+        Index(
+            "ix_tenants_specialties",
+            "specialties",
+            postgresql_using="gin",
+            postgresql_ops={"specialties": "jsonb_path_ops"}
+        ),
+    )
     
     # Identificação
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     slug = Column(String(100), unique=True, nullable=False, index=True)
     company_name = Column(String(255), nullable=False)
     fantasy_name = Column(String(255), nullable=True)
     
     # Documentos
-    cnpj = Column(String(18), nullable=True, index=True)
-    cpf = Column(String(14), nullable=True, index=True)  # Para MEI
+    cnpj = Column(String(18), nullable=True)
+    cpf = Column(String(14), nullable=True)  # Para MEI
+    # Só dígitos, mantidos pelo banco: buscas exatas independentes da formatação
+    cnpj_normalized = Column(String(18), Computed(DIGITS_ONLY.format("cnpj"), persisted=True), unique=True, index=True)
+    cpf_normalized = Column(String(14), Computed(DIGITS_ONLY.format("cpf"), persisted=True), index=True)
     ie = Column(String(20), nullable=True)  # Inscrição Estadual
     im = Column(String(20), nullable=True)  # Inscrição Municipal
     
@@ -74,13 +102,14 @@ class Tenant(Base):
     country = Column(String(2), default="BR", nullable=False)
     
     # Contato
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(String(255), nullable=False)
+    email_normalized = Column(String(255), Computed("lower(email)", persisted=True), unique=True, index=True)
     phone = Column(String(20), nullable=False)
     website = Column(String(255), nullable=True)
     
     # Classificação
     segment = Column(Enum(TenantSegment), nullable=False, default=TenantSegment.ODONTOLOGIA)
-    specialties = Column(Text, nullable=True)  # JSON com especialidades
+    specialties = Column(JSONB, nullable=True)  # Lista de especialidades
     
     # Plano e Status
     plan = Column(Enum(TenantPlan), nullable=False, default=TenantPlan.TRIAL)
@@ -90,6 +119,9 @@ class Tenant(Base):
     # Limites
     max_users = Column(Integer, default=10, nullable=False)
     max_storage_gb = Column(Integer, default=5, nullable=False)
+    # Total corrente do livro-razão (storage_ledger), atualizado junto com cada entrada
+    storage_used_bytes = Column(BigInteger, default=0, server_default="0", nullable=False)
+    storage_reconciled_at = Column(DateTime, nullable=True)
     
     # Financeiro
     monthly_fee = Column(Numeric(10, 2), default=0.00, nullable=False)
@@ -100,13 +132,15 @@ class Tenant(Base):
     # Onboarding
     onboarding_completed = Column(Boolean, default=False, nullable=False)
     onboarding_step = Column(Integer, default=1, nullable=False)
-    onboarding_data = Column(Text, nullable=True)  # JSON com dados do onboarding
+    onboarding_data = Column(JSONB, nullable=True)  # Dados do onboarding
     
     # Módulos habilitados
-    modules_enabled = Column(Text, nullable=True)  # JSON com módulos habilitados
+    modules_enabled = Column(JSONB, nullable=True)  # {"hubb_vision": true, ...}
     
     # Configurações
-    settings = Column(Text, nullable=True)  # JSON com configurações específicas
+    settings = Column(JSONB, nullable=True)  # Configurações específicas
+    # Incrementado a cada alteração do tenant: invalida as visões compiladas (app.core.module_config)
+    config_version = Column(Integer, default=0, server_default="0", nullable=False)
     theme = Column(String(50), default="default", nullable=False)
     logo_url = Column(String(500), nullable=True)
     
@@ -148,6 +182,16 @@ class Tenant(Base):
         """Verificar se pode adicionar mais usuários"""
         return self.total_users < self.max_users
     
+    @property
+    def max_storage_bytes(self) -> int:
+        """Cota de armazenamento em bytes"""
+        return self.max_storage_gb * GIB
+    
+    @property
+    def storage_used_gb(self) -> float:
+        """Armazenamento usado em GB"""
+        return round((self.storage_used_bytes or 0) / GIB, 3)
+    
     @property
     def subscription_days_remaining(self) -> Optional[int]:
         """Dias restantes da assinatura"""
@@ -165,3 +209,25 @@ class Tenant(Base):
         
         delta = self.trial_end_date - datetime.utcnow()
         return max(0, delta.days)
+    
+    # Colunas JSONB chegam decodificadas uma vez, na carga da linha; os acessores só leem o valor.
+    # Para alterar, atribuir um novo dict/lista (mutações in-place não são detectadas pelo ORM)
+    
+    @property
+    def enabled_modules(self) -> FrozenSet[str]:
+        """Módulos habilitados explicitamente no tenant"""
+        return frozenset(name for name, enabled in (self.modules_enabled or {}).items() if enabled is True)
+    
+    def module_enabled(self, module: str) -> Optional[bool]:
+        """Módulo habilitado/desabilitado no tenant, ou None se o tenant não define"""
+        value = (self.modules_enabled or {}).get(module)
+        return value if isinstance(value, bool) else None
+    
+    @property
+    def specialty_list(self) -> List[str]:
+        """Especialidades da clínica"""
+        return list(self.specialties or [])
+    
+    def get_setting(self, key: str, default: Any = None) -> Any:
+        """Configuração específica do tenant"""
+        return (self.settings or {}).get(key, default)
@@ -4,12 +4,14 @@ Modelo de usuário com suporte multi-tenant
 """
 
 from datetime import datetime
-from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Enum
+from typing import Any, Dict, List, Optional
+from sqlalchemy import Column, Computed, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
 
-from app.core.database import Base
+from app.core.database import Base, DIGITS_ONLY
+from app.core.permissions import Permission, compile_permissions, has_permissions
 
 
 class UserRole(str, enum.Enum):
@@ -32,10 +34,34 @@ class User(Base):
     Modelo de usuário com isolamento multi-tenant
     """
     __tablename__ = "users"
+    # Índices escolhidos pelas consultas dos repositórios (conferidos por benchmarks.plan_check)
+    __table_args__ = (
+        # Email único por tenant, sem diferenciar maiúsculas (login, cadastro)
+        Index("uq_users_tenant_email_normalized", "tenant_id", "email_normalized", unique=True),
+        Index("ix_users_tenant_cpf_normalized", "tenant_id", "cpf_normalized"),
+        # Listagem do tenant por data; também atende filtros só por tenant_id (e a FK)
+        Index("ix_users_tenant_created_at", "tenant_id", "created_at"),
+        # Contagem de usuários ativos (limite do plano, total_users)
+        Index("ix_users_tenant_active", "tenant_id", postgresql_where=text("is_active")),
+        # Reset de senha: só as linhas com token pendente
+        Index(
+            "ix_users_password_reset_token",
+            "password_reset_token",
+            postgresql_where=text("password_reset_token IS NOT NULL")
+        ),
+        # Usuários com uma especialidade (@>), combinado com o filtro de tenant
+        Index(
+            "ix_users_specialties",
+            "specialties",
+            postgresql_using="gin",
+            postgresql_ops={"specialties": "jsonb_path_ops"}
+        ),
+    )
     
     # Identificação
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     email = Column(String(255), nullable=False, index=True)
+    email_normalized = Column(String(255), Computed("lower(email)", persisted=True))
     full_name = Column(String(255), nullable=False)
     
     # Autenticação
@@ -44,20 +70,21 @@ class User(Base):
     is_verified = Column(Boolean, default=False, nullable=False)
     
     # Multi-tenant
-    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False, index=True)
+    tenant_id = Column(Integer, ForeignKey("tenants.id"), nullable=False)
     
     # Autorização
     role = Column(Enum(UserRole), nullable=False, default=UserRole.ASSISTENTE)
-    permissions = Column(Text, nullable=True)  # JSON com permissões específicas
+    permissions = Column(JSONB, nullable=True)  # Permissões específicas do usuário
     
     # Dados pessoais
     phone = Column(String(20), nullable=True)
-    cpf = Column(String(14), nullable=True, index=True)
+    cpf = Column(String(14), nullable=True)
+    cpf_normalized = Column(String(14), Computed(DIGITS_ONLY.format("cpf"), persisted=True))
     birth_date = Column(DateTime, nullable=True)
     
     # Dados profissionais
     professional_id = Column(String(50), nullable=True)  # CRO, etc
-    specialties = Column(Text, nullable=True)  # JSON com especialidades
+    specialties = Column(JSONB, nullable=True)  # Lista de especialidades
     
     # Tokens
     refresh_token = Column(String(500), nullable=True)
@@ -70,7 +97,7 @@ class User(Base):
     last_login = Column(DateTime, nullable=True)
     
     # Configurações
-    preferences = Column(Text, nullable=True)  # JSON com preferências do usuário
+    preferences = Column(JSONB, nullable=True)  # Preferências do usuário
     avatar_url = Column(String(500), nullable=True)
     
     # Relacionamentos
@@ -79,15 +106,19 @@ class User(Base):
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', tenant_id={self.tenant_id})>"
     
+    @property
+    def permission_mask(self) -> int:
+        """Permissões da role com as exceções do usuário, compiladas (app.core.permissions)"""
+        return compile_permissions(self.role, self.permissions)
+    
+    def has_permissions(self, required: int) -> bool:
+        """Verificar se o usuário tem todos os bits de permissão exigidos"""
+        return has_permissions(self.permission_mask, required)
+    
     @property
     def is_admin(self) -> bool:
         """Verificar se usuário tem privilégios administrativos"""
-        admin_roles = [
-            UserRole.SUPER_ADMIN,
-            UserRole.ADMIN_MASTER,
-            UserRole.DONO_CLINICA
-        ]
-        return self.role in admin_roles
+        return self.has_permissions(Permission.USERS_MANAGE)
     
     @property
     def is_super_admin(self) -> bool:
@@ -97,18 +128,26 @@ class User(Base):
     @property
     def can_manage_users(self) -> bool:
         """Verificar se pode gerenciar usuários"""
-        return self.role in [
-            UserRole.SUPER_ADMIN,
-            UserRole.ADMIN_MASTER,
-            UserRole.DONO_CLINICA
-        ]
+        return self.has_permissions(Permission.USERS_MANAGE)
     
     @property
     def can_access_financial(self) -> bool:
         """Verificar se pode acessar dados financeiros"""
-        return self.role in [
-            UserRole.SUPER_ADMIN,
-            UserRole.ADMIN_MASTER,
-            UserRole.DONO_CLINICA,
-            UserRole.FINANCEIRO
-        ]
+        return self.has_permissions(Permission.FINANCIAL_READ)
+    
+    # Colunas JSONB chegam decodificadas uma vez, na carga da linha; os acessores só leem o valor.
+    # Para alterar, atribuir um novo dict/lista (mutações in-place não são detectadas pelo ORM)
+    
+    @property
+    def specialty_list(self) -> List[str]:
+        """Especialidades do profissional"""
+        return list(self.specialties or [])
+    
+    @property
+    def permission_overrides(self) -> Dict[str, bool]:
+        """Permissões concedidas (true) ou revogadas (false) ao usuário além da role"""
+        return {name: value for name, value in (self.permissions or {}).items() if isinstance(value, bool)}
+    
+    def get_preference(self, key: str, default: Any = None) -> Any:
+        """Preferência do usuário"""
+        return (self.preferences or {}).get(key, default)
@@ -0,0 +1,22 @@
+"""
+File Schemas
+Schemas Pydantic para arquivos dos tenants
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+
+class StoredFileResponse(BaseModel):
+    """Schema para resposta de arquivo"""
+    id: int
+    filename: str
+    content_type: str
+    size_bytes: int
+    sha256: str
+    uploaded_by: Optional[int]
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
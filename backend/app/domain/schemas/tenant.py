@@ -6,7 +6,7 @@ Schemas Pydantic para tenants (clínicas)
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from decimal import Decimal
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, EmailStr, Field, ValidationInfo, field_validator
 
 from app.domain.models.tenant import TenantStatus, TenantPlan, TenantSegment
 
@@ -32,9 +32,9 @@ class OnboardingStep1(BaseModel):
     
     @field_validator('cnpj')
     @classmethod
-    def validate_cnpj(cls, v):
-        """Validar CNPJ"""
-        if not v:
+    def validate_cnpj(cls, v, info: ValidationInfo):
+        """Validar CNPJ (em lote pelo chamador quando o contexto traz batch_documents)"""
+        if not v or (info.context or {}).get("batch_documents"):
             return v
         
         # Importar aqui para evitar circular import
@@ -47,9 +47,9 @@ class OnboardingStep1(BaseModel):
     
     @field_validator('cpf')
     @classmethod
-    def validate_cpf(cls, v):
-        """Validar CPF"""
-        if not v:
+    def validate_cpf(cls, v, info: ValidationInfo):
+        """Validar CPF (em lote pelo chamador quando o contexto traz batch_documents)"""
+        if not v or (info.context or {}).get("batch_documents"):
             return v
         
         # Importar aqui para evitar circular import
@@ -108,6 +108,38 @@ class OnboardingComplete(BaseModel):
     message: str
 
 
+class TenantProvisionRow(OnboardingStep1):
+    """Linha do provisionamento em lote (NDJSON): empresa, endereço e dono"""
+    ref: Optional[str] = Field(None, max_length=100)  # Identificador do revendedor, devolvido no resultado
+    cep: str = Field(..., min_length=8, max_length=9)
+    street: str = Field(..., min_length=2, max_length=255)
+    number: str = Field(..., min_length=1, max_length=20)
+    complement: Optional[str] = Field(None, max_length=255)
+    neighborhood: str = Field(..., min_length=2, max_length=255)
+    city: str = Field(..., min_length=2, max_length=255)
+    state: str = Field(..., min_length=2, max_length=2)
+    owner_name: str = Field(..., min_length=2, max_length=255)
+    owner_email: EmailStr
+    owner_password: Optional[str] = Field(None, min_length=6)  # Sem senha: dono recebe convite
+    owner_phone: Optional[str] = Field(None, max_length=20)
+    plan: TenantPlan = TenantPlan.TRIAL
+    
+    @field_validator('owner_password')
+    @classmethod
+    def validate_password(cls, v):
+        """Validar força da senha"""
+        if v is None:
+            return v
+        
+        has_letter = any(c.isalpha() for c in v)
+        has_number = any(c.isdigit() for c in v)
+        
+        if not (has_letter and has_number):
+            raise ValueError('Senha deve conter pelo menos uma letra e um número')
+        
+        return v
+
+
 class TenantCreate(TenantBase):
     """Schema para criação de tenant"""
     slug: Optional[str] = None
@@ -135,6 +167,9 @@ class TenantUpdate(BaseModel):
     max_users: Optional[int] = Field(None, ge=1, le=1000)
     max_storage_gb: Optional[int] = Field(None, ge=1, le=1000)
     logo_url: Optional[str] = Field(None, max_length=500)
+    specialties: Optional[List[str]] = None
+    modules_enabled: Optional[Dict[str, bool]] = None
+    settings: Optional[Dict[str, Any]] = None
 
 
 class TenantResponse(TenantBase):
@@ -4,8 +4,8 @@ Schemas Pydantic para usuários
 """
 
 from datetime import datetime
-from typing import Optional, List
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, EmailStr, Field, ValidationInfo, field_validator
 
 from app.domain.models.user import UserRole
 
@@ -42,6 +42,43 @@ class UserCreate(UserBase):
         return v
 
 
+class UserImportRow(UserBase):
+    """Linha da importação em lote (CSV) de usuários"""
+    password: Optional[str] = Field(None, min_length=6)  # Sem senha: usuário recebe convite
+    cpf: Optional[str] = Field(None, max_length=14)
+    professional_id: Optional[str] = Field(None, max_length=50)
+    
+    @field_validator('password')
+    @classmethod
+    def validate_password(cls, v):
+        """Validar força da senha"""
+        if v is None:
+            return v
+        
+        has_letter = any(c.isalpha() for c in v)
+        has_number = any(c.isdigit() for c in v)
+        
+        if not (has_letter and has_number):
+            raise ValueError('Senha deve conter pelo menos uma letra e um número')
+        
+        return v
+    
+    @field_validator('cpf')
+    @classmethod
+    def validate_cpf(cls, v, info: ValidationInfo):
+        """Validar CPF (em lote pelo chamador quando o contexto traz batch_documents)"""
+        if not v or (info.context or {}).get("batch_documents"):
+            return v
+        
+        # Importar aqui para evitar circular import
+        from app.core.security import validate_cpf
+        
+        if not validate_cpf(v):
+            raise ValueError('CPF inválido')
+        
+        return v
+
+
 class UserUpdate(BaseModel):
     """Schema para atualização de usuário"""
     full_name: Optional[str] = Field(None, min_length=2, max_length=255)
@@ -51,6 +88,8 @@ class UserUpdate(BaseModel):
     cpf: Optional[str] = Field(None, max_length=14)
     professional_id: Optional[str] = Field(None, max_length=50)
     avatar_url: Optional[str] = Field(None, max_length=500)
+    specialties: Optional[List[str]] = None
+    preferences: Optional[Dict[str, Any]] = None
 
 
 class UserPasswordUpdate(BaseModel):
@@ -92,8 +131,8 @@ class UserProfile(UserResponse):
     cpf: Optional[str]
     birth_date: Optional[datetime]
     professional_id: Optional[str]
-    specialties: Optional[dict]
-    preferences: Optional[dict]
+    specialties: Optional[List[str]]
+    preferences: Optional[Dict[str, Any]]
 
 
 class UserListResponse(BaseModel):
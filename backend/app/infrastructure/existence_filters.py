@@ -0,0 +1,205 @@
+"""
+Tenant Existence Filters
+Filtros de Bloom em memória com os slugs, emails e CNPJs já usados por tenants. Um "certamente
+livre" dispensa o banco; só os possíveis positivos seguem para a consulta indexada
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom (sem falsos negativos) com double hashing sobre blake2b
+    """
+    
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, value: str) -> Iterable[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+    
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, value: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+    
+    @property
+    def saturated(self) -> bool:
+        """Acima da capacidade a taxa de falsos positivos passa da configurada"""
+        return self.count > self.capacity
+
+
+def normalize_email(email: str) -> str:
+    return email.strip().lower()
+
+
+def normalize_cnpj(cnpj: str) -> str:
+    return re.sub(r"\D", "", cnpj)
+
+
+class TenantExistenceFilters:
+    """
+    Filtros de slug, email e CNPJ de tenants: reconstruídos do banco no startup (e a cada
+    EXISTENCE_FILTER_REFRESH_SECONDS, para incluir escritas de outros workers) e atualizados
+    nas escritas deste worker
+    """
+    
+    KINDS = ("slug", "email", "cnpj")
+    
+    def __init__(self, capacity: int, error_rate: float, refresh_seconds: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.refresh_seconds = refresh_seconds
+        self._filters: Optional[Dict[str, BloomFilter]] = None
+        self._built_at = 0.0
+        self._pending: Optional[List[Tuple[str, str]]] = None
+        self._rebuild_task: Optional[asyncio.Task] = None
+        self.stats = {"skipped": 0, "checked": 0, "rebuilds": 0}
+    
+    @property
+    def ready(self) -> bool:
+        """Filtros carregados do banco"""
+        return self._filters is not None
+    
+    @staticmethod
+    def _normalize(kind: str, value: str) -> str:
+        if kind == "email":
+            return normalize_email(value)
+        if kind == "cnpj":
+            return normalize_cnpj(value)
+        return value
+    
+    def might_exist(self, kind: str, value: str) -> bool:
+        """
+        False = certamente não existe (dispensa o banco); True = pode existir, consultar o banco
+        """
+        self._refresh_if_stale()
+        if self._filters is None:
+            return True
+        
+        if self._normalize(kind, value) in self._filters[kind]:
+            self.stats["checked"] += 1
+            return True
+        self.stats["skipped"] += 1
+        return False
+    
+    def add(self, kind: str, value: Optional[str]) -> None:
+        """
+        Registrar um valor gravado (antes do commit: um rollback só gera falso positivo)
+        """
+        if not value:
+            return
+        value = self._normalize(kind, value)
+        if self._pending is not None:
+            self._pending.append((kind, value))
+        if self._filters is not None:
+            self._filters[kind].add(value)
+            if self._filters[kind].saturated:
+                self._refresh_if_stale(force=True)
+    
+    def add_tenant(self, slug: Optional[str], email: Optional[str], cnpj: Optional[str]) -> None:
+        self.add("slug", slug)
+        self.add("email", email)
+        self.add("cnpj", cnpj)
+    
+    async def rebuild(self) -> int:
+        """
+        Recarregar os filtros a partir da tabela de tenants; retorna o número de tenants
+        """
+        from sqlalchemy import func, select
+        
+        from app.core.database import AsyncSessionLocal
+        from app.domain.models.tenant import Tenant
+        
+        # Escritas durante a leitura entram depois da troca
+        self._pending = []
+        try:
+            async with AsyncSessionLocal() as session:
+                total = (await session.execute(select(func.count(Tenant.id)))).scalar() or 0
+                # Folga para crescer até o próximo refresh sem saturar
+                capacity = max(self.capacity, total * 2)
+                filters = {kind: BloomFilter(capacity, self.error_rate) for kind in self.KINDS}
+                
+                result = await session.stream(
+                    select(Tenant.slug, Tenant.email, Tenant.cnpj).execution_options(yield_per=5000)
+                )
+                async for slug, email, cnpj in result:
+                    filters["slug"].add(slug)
+                    filters["email"].add(normalize_email(email))
+                    if cnpj:
+                        filters["cnpj"].add(normalize_cnpj(cnpj))
+            
+            for kind, value in self._pending:
+                filters[kind].add(value)
+            self._filters = filters
+            self._built_at = time.monotonic()
+            self.stats["rebuilds"] += 1
+            return total
+        finally:
+            self._pending = None
+    
+    def _refresh_if_stale(self, force: bool = False) -> None:
+        if self._filters is None and not force:
+            return
+        if not force and time.monotonic() - self._built_at < self.refresh_seconds:
+            return
+        if self._rebuild_task is not None and not self._rebuild_task.done():
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._built_at = time.monotonic()  # Evita reagendar enquanto reconstrói
+        self._rebuild_task = loop.create_task(self._rebuild_in_background())
+    
+    async def _rebuild_in_background(self) -> None:
+        try:
+            await self.rebuild()
+        except Exception:
+            # Os filtros antigos continuam válidos para tudo que este worker gravou
+            logger.exception("Falha ao reconstruir filtros de existência de tenants")
+    
+    def report(self) -> Dict[str, Any]:
+        """
+        Estado dos filtros e consultas ao banco evitadas
+        """
+        return {
+            "ready": self.ready,
+            "entries": {kind: f.count for kind, f in self._filters.items()} if self._filters else None,
+            "age_seconds": round(time.monotonic() - self._built_at, 1) if self._filters else None,
+            **self.stats,
+        }
+
+
+# Instância global (uma por worker)
+tenant_filters = TenantExistenceFilters(
+    capacity=settings.EXISTENCE_FILTER_CAPACITY,
+    error_rate=settings.EXISTENCE_FILTER_ERROR_RATE,
+    refresh_seconds=settings.EXISTENCE_FILTER_REFRESH_SECONDS
+)
@@ -0,0 +1,3 @@
+"""
+External Services - Clientes de APIs externas
+"""
@@ -0,0 +1,234 @@
+"""
+Offline CEP Index
+Índice binário ordenado e memory-mapped de CEP → logradouro/bairro/cidade/UF, com busca binária
+sem copiar o arquivo (as páginas do mmap são compartilhadas entre os workers pelo SO)
+
+Formato (little-endian):
+    cabeçalho   "<8sIIII": magic, quantidade, offset das chaves, offset dos registros, offset das strings
+    chaves      quantidade × uint32 (CEP como inteiro, ordenado)
+    registros   quantidade × "<III2s" (offsets de logradouro, bairro e cidade; UF)
+    strings     uint16 tamanho + UTF-8, deduplicadas
+
+Construção (a partir de backend/):
+    python -m app.infrastructure.external.cep_index build ceps.csv --output data/cep.idx
+    python -m app.infrastructure.external.cep_index lookup data/cep.idx 01001000
+"""
+
+import argparse
+import csv
+import gzip
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+MAGIC = b"HUBBCEP1"
+HEADER = struct.Struct("<8sIIII")
+RECORD = struct.Struct("<III2s")
+LENGTH = struct.Struct("<H")
+
+Row = Tuple[str, str, str, str, str]  # cep, logradouro, bairro, cidade, uf
+
+
+class CepIndex:
+    """
+    Índice de CEPs somente leitura sobre um arquivo memory-mapped
+    """
+    
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise RuntimeError("Índice de CEP requer plataforma little-endian")
+        
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        magic, self.count, keys_offset, self._records_offset, self._strings_offset = HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"Arquivo de índice de CEP inválido: {path}")
+        
+        # Visão uint32 das chaves direto sobre o mmap (sem cópia)
+        self._view = memoryview(self._mm)
+        self._keys = self._view[keys_offset:keys_offset + 4 * self.count].cast("I")
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def _position(self, cep: str) -> int:
+        digits = cep.replace("-", "")
+        if len(digits) != 8 or not digits.isdigit():
+            return -1
+        key = int(digits)
+        i = bisect_left(self._keys, key)
+        if i < self.count and self._keys[i] == key:
+            return i
+        return -1
+    
+    def __contains__(self, cep: str) -> bool:
+        return self._position(cep) >= 0
+    
+    def _string(self, offset: int) -> str:
+        (length,) = LENGTH.unpack_from(self._mm, offset)
+        start = offset + LENGTH.size
+        return str(self._view[start:start + length], "utf-8")
+    
+    def lookup(self, cep: str) -> Optional[Dict[str, Any]]:
+        """
+        Endereço do CEP no mesmo formato do cliente ViaCEP; None se ausente do índice
+        """
+        i = self._position(cep)
+        if i < 0:
+            return None
+        
+        street, neighborhood, city, state = RECORD.unpack_from(
+            self._mm, self._records_offset + i * RECORD.size
+        )
+        return {
+            "cep": f"{self._keys[i]:08d}",
+            "street": self._string(street),
+            "complement": None,
+            "neighborhood": self._string(neighborhood),
+            "city": self._string(city),
+            "state": state.decode("ascii"),
+        }
+    
+    def close(self) -> None:
+        """
+        Liberar o mapeamento
+        """
+        self._keys.release()
+        self._view.release()
+        self._mm.close()
+
+
+def build_index(rows: Iterable[Row], output: str) -> int:
+    """
+    Gerar o arquivo de índice (escrita atômica: workers com o arquivo antigo mapeado não são afetados)
+    """
+    entries: Dict[int, Tuple[str, str, str, str]] = {}
+    for cep, street, neighborhood, city, state in rows:
+        digits = "".join(c for c in cep if c.isdigit())
+        if len(digits) != 8 or len(state.strip()) != 2:
+            continue
+        entries[int(digits)] = (street.strip(), neighborhood.strip(), city.strip(), state.strip().upper())
+    
+    keys = sorted(entries)
+    strings = bytearray()
+    string_offsets: Dict[str, int] = {}
+    
+    def intern(value: str) -> int:
+        offset = string_offsets.get(value)
+        if offset is None:
+            # Corte no limite do comprimento (u16) sem partir um caractere multibyte ao meio
+            encoded = value.encode("utf-8")[:0xFFFF].decode("utf-8", "ignore").encode("utf-8")
+            offset = len(strings)
+            strings.extend(LENGTH.pack(len(encoded)))
+            strings.extend(encoded)
+            string_offsets[value] = offset
+        return offset
+    
+    keys_offset = HEADER.size
+    records_offset = keys_offset + 4 * len(keys)
+    strings_offset = records_offset + RECORD.size * len(keys)
+    
+    records = bytearray()
+    for key in keys:
+        street, neighborhood, city, state = entries[key]
+        records.extend(RECORD.pack(
+            strings_offset + intern(street),
+            strings_offset + intern(neighborhood),
+            strings_offset + intern(city),
+            state.encode("ascii")
+        ))
+    
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(keys), keys_offset, records_offset, strings_offset))
+        f.write(array("I", keys).tobytes())
+        f.write(records)
+        f.write(strings)
+    os.replace(tmp_path, output)
+    return len(keys)
+
+
+def read_csv_rows(
+    path: str,
+    columns: List[str],
+    delimiter: str = ",",
+    encoding: str = "utf-8"
+) -> Iterable[Row]:
+    """
+    Ler linhas de um CSV (opcionalmente .gz) com as colunas cep, logradouro, bairro, cidade e uf
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding=encoding, newline="") as f:
+        reader = csv.DictReader(f, delimiter=delimiter)
+        missing = [column for column in columns if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Colunas ausentes no CSV: {', '.join(missing)}")
+        for row in reader:
+            yield tuple(row[column] or "" for column in columns)
+
+
+_index: Optional[CepIndex] = None
+_index_loaded = False
+
+
+def get_cep_index() -> Optional[CepIndex]:
+    """
+    Índice configurado em CEP_INDEX_PATH (aberto uma vez por worker), ou None
+    """
+    global _index, _index_loaded
+    if not _index_loaded:
+        _index_loaded = True
+        if settings.CEP_INDEX_PATH and os.path.exists(settings.CEP_INDEX_PATH):
+            _index = CepIndex(settings.CEP_INDEX_PATH)
+    return _index
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Índice offline de CEPs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build = subparsers.add_parser("build", help="Gerar o índice a partir de um CSV")
+    build.add_argument("csv", help="Arquivo CSV (ou .csv.gz) da base de CEPs")
+    build.add_argument("--output", default=settings.CEP_INDEX_PATH or "data/cep.idx")
+    build.add_argument(
+        "--columns",
+        type=lambda v: v.split(","),
+        default=["cep", "logradouro", "bairro", "cidade", "uf"],
+        help="Nomes das colunas de CEP, logradouro, bairro, cidade e UF"
+    )
+    build.add_argument("--delimiter", default=",")
+    build.add_argument("--encoding", default="utf-8")
+    
+    lookup = subparsers.add_parser("lookup", help="Consultar CEPs no índice")
+    lookup.add_argument("index")
+    lookup.add_argument("ceps", nargs="+")
+    
+    args = parser.parse_args(argv)
+    
+    if args.command == "build":
+        if len(args.columns) != 5:
+            parser.error("--columns deve ter 5 nomes: cep,logradouro,bairro,cidade,uf")
+        rows = read_csv_rows(args.csv, args.columns, args.delimiter, args.encoding)
+        count = build_index(rows, args.output)
+        size = os.path.getsize(args.output)
+        print(f"{count} CEPs indexados em {args.output} ({size / 1024 / 1024:.1f} MB)")
+    else:
+        index = CepIndex(args.index)
+        for cep in args.ceps:
+            print(cep, index.lookup(cep))
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+ViaCEP Client
+Cliente HTTP assíncrono com pool compartilhado, timeout e circuit breaker
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class ViaCepUnavailable(Exception):
+    """
+    API de CEP indisponível (timeout, erro HTTP ou circuito aberto)
+    """
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker simples: abre após N falhas seguidas e libera uma tentativa
+    (half-open) depois de `reset_timeout` segundos
+    """
+    
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+    
+    @property
+    def state(self) -> str:
+        """closed, open ou half_open"""
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+    
+    def allow(self) -> bool:
+        """
+        Pode chamar a API? No half-open apenas uma requisição de teste passa
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return False
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("Circuito da API de CEP aberto após %d falhas", self.failures)
+            self.opened_at = time.monotonic()
+
+
+def normalize_address(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Converter a resposta do ViaCEP para os campos de endereço do onboarding
+    """
+    return {
+        "cep": payload.get("cep", "").replace("-", ""),
+        "street": payload.get("logradouro") or "",
+        "complement": payload.get("complemento") or None,
+        "neighborhood": payload.get("bairro") or "",
+        "city": payload.get("localidade") or "",
+        "state": payload.get("uf") or "",
+    }
+
+
+class ViaCepClient:
+    """
+    Cliente do ViaCEP (ou de um servidor substituto via VIACEP_API_URL) com um único
+    httpx.AsyncClient por worker, reaproveitando conexões keep-alive
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float,
+        max_connections: int,
+        breaker: CircuitBreaker
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.breaker = breaker
+        self._client = None
+    
+    def _get_client(self):
+        # httpx é importado sob demanda para não pesar no import da aplicação
+        if self._client is None:
+            import httpx
+            
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+                headers={"Accept": "application/json"},
+            )
+        return self._client
+    
+    async def fetch(self, cep: str) -> Optional[Dict[str, Any]]:
+        """
+        Consultar um CEP (8 dígitos); None quando o CEP não existe
+        """
+        import httpx
+        
+        if not self.breaker.allow():
+            raise ViaCepUnavailable("Circuito aberto para a API de CEP")
+        
+        try:
+            response = await self._get_client().get(f"/{cep}/json/")
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            raise ViaCepUnavailable(f"Falha ao consultar CEP: {type(e).__name__}") from e
+        
+        # 400 = formato inválido (não é falha do serviço)
+        if response.status_code == 400:
+            self.breaker.record_success()
+            return None
+        if response.status_code != 200:
+            self.breaker.record_failure()
+            raise ViaCepUnavailable(f"API de CEP respondeu {response.status_code}")
+        
+        try:
+            payload = response.json()
+        except ValueError as e:
+            self.breaker.record_failure()
+            raise ViaCepUnavailable("Resposta inválida da API de CEP") from e
+        
+        self.breaker.record_success()
+        if payload.get("erro") in (True, "true"):
+            return None
+        return normalize_address(payload)
+    
+    async def aclose(self) -> None:
+        """
+        Fechar o pool de conexões (shutdown)
+        """
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Instância global (uma por worker)
+viacep_client = ViaCepClient(
+    base_url=settings.VIACEP_API_URL,
+    timeout=settings.VIACEP_TIMEOUT,
+    max_connections=settings.VIACEP_MAX_CONNECTIONS,
+    breaker=CircuitBreaker(
+        failure_threshold=settings.VIACEP_BREAKER_FAILURES,
+        reset_timeout=settings.VIACEP_BREAKER_RESET_SECONDS
+    )
+)
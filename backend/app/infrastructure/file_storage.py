@@ -0,0 +1,183 @@
+"""
+File Storage
+Recebimento de uploads em streaming: o corpo é gravado em disco em blocos de tamanho fixo,
+com SHA-256 calculado durante a gravação, tipo detectado pelos bytes iniciais (não pelo
+Content-Type declarado) e aborto assim que o limite de tamanho é ultrapassado. Conteúdos são
+publicados uma única vez, endereçados pelo hash
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Optional
+
+
+# Assinaturas (magic bytes) dos tipos aceitos em ALLOWED_FILE_TYPES
+SIGNATURES = (
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+)
+# Bytes necessários para reconhecer qualquer assinatura
+SIGNATURE_BYTES = max(len(magic) for magic, _ in SIGNATURES)
+
+
+class UploadTooLarge(ValueError):
+    """
+    Arquivo maior que MAX_FILE_SIZE
+    """
+
+
+class UnsupportedFileType(ValueError):
+    """
+    Tipo de arquivo (pelos bytes iniciais) fora de ALLOWED_FILE_TYPES
+    """
+
+
+def detect_content_type(head: bytes) -> Optional[str]:
+    """
+    Tipo do arquivo pelos bytes iniciais, ou None se desconhecido
+    """
+    for magic, content_type in SIGNATURES:
+        if head.startswith(magic):
+            return content_type
+    return None
+
+
+@dataclass
+class ReceivedFile:
+    """
+    Upload gravado num arquivo temporário, ainda não publicado
+    """
+    path: str
+    size: int
+    sha256: str
+    content_type: str
+    
+    def discard(self) -> None:
+        _remove(self.path)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def temp_path(directory: str) -> str:
+    """
+    Caminho temporário no mesmo sistema de arquivos do destino (rename atômico ao publicar)
+    """
+    return os.path.join(directory, f".upload-{uuid.uuid4().hex}")
+
+
+async def receive_upload(
+    chunks: AsyncIterator[bytes],
+    directory: str,
+    max_size: int,
+    allowed_types: Iterable[str],
+    chunk_size: int
+) -> ReceivedFile:
+    """
+    Gravar o stream em `directory` em blocos de `chunk_size` bytes, calculando o SHA-256.
+    UnsupportedFileType logo no primeiro bloco e UploadTooLarge assim que o total passa de
+    `max_size`, sem ler o restante do corpo; nos dois casos o arquivo parcial é removido
+    """
+    allowed = set(allowed_types)
+    os.makedirs(directory, exist_ok=True)
+    path = temp_path(directory)
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    size = 0
+    content_type = None
+    
+    # Sem buffer do Python: cada bloco vai direto ao kernel (page cache)
+    output = open(path, "wb", buffering=0)
+    
+    # Hash e gravação numa thread: um disco lento não bloqueia o event loop
+    def write(block) -> None:
+        digest.update(block)
+        # FileIO.write pode gravar parcialmente
+        with memoryview(block) as view:
+            while view:
+                view = view[output.write(view):]
+    
+    async def write_in_thread(block) -> None:
+        pending = asyncio.ensure_future(asyncio.to_thread(write, block))
+        try:
+            await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            # Cliente desconectou: esperar o bloco em gravação antes de fechar o arquivo
+            await asyncio.wait([pending])
+            raise
+    
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLarge(f"Arquivo excede o limite de {max_size // (1024 * 1024)} MB")
+            buffer += chunk
+            
+            if content_type is None:
+                if len(buffer) < SIGNATURE_BYTES:
+                    continue
+                content_type = detect_content_type(bytes(buffer[:SIGNATURE_BYTES]))
+                if content_type not in allowed:
+                    raise UnsupportedFileType("Tipo de arquivo não permitido")
+            
+            if len(buffer) >= chunk_size:
+                # Blocos inteiros; o resto fica para o próximo
+                whole = len(buffer) - len(buffer) % chunk_size
+                with memoryview(buffer) as view:
+                    block = view[:whole]
+                    try:
+                        await write_in_thread(block)
+                    finally:
+                        # Liberar a view antes de redimensionar o buffer
+                        block.release()
+                del buffer[:whole]
+        
+        if content_type is None:
+            # Arquivo menor que a maior assinatura
+            content_type = detect_content_type(bytes(buffer))
+            if content_type not in allowed:
+                raise UnsupportedFileType("Tipo de arquivo não permitido")
+        if buffer:
+            await write_in_thread(buffer)
+        output.close()
+    except BaseException:
+        output.close()
+        _remove(path)
+        raise
+    
+    return ReceivedFile(path=path, size=size, sha256=digest.hexdigest(), content_type=content_type)
+
+
+def _fsync(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def blob_key(sha256: str) -> str:
+    """
+    Caminho relativo do conteúdo pelo hash (dois níveis de diretório, até 65536 pastas)
+    """
+    return os.path.join("blobs", sha256[:2], sha256[2:4], sha256)
+
+
+async def publish(received: ReceivedFile, destination: str) -> None:
+    """
+    Tornar o arquivo recebido durável (fsync fora do event loop) e movê-lo para o destino final
+    (rename atômico). Conteúdos já armazenados são descartados sem fsync
+    """
+    await asyncio.to_thread(_fsync, received.path)
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    os.replace(received.path, destination)
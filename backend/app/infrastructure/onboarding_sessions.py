@@ -0,0 +1,183 @@
+"""
+Onboarding Session Store
+Dados validados dos passos do onboarding, guardados por session_id com TTL até o passo 3,
+para que o wizard nunca grave tenants incompletos no banco
+"""
+
+import abc
+import json
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+class OnboardingSessionStore(abc.ABC):
+    """
+    Interface do store de sessões de onboarding
+    """
+    
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+    
+    @staticmethod
+    def new_session_id() -> str:
+        """
+        Identificador de sessão imprevisível
+        """
+        return secrets.token_urlsafe(24)
+    
+    async def create(self, data: Dict[str, Any]) -> str:
+        """
+        Criar sessão e retornar o session_id
+        """
+        session_id = self.new_session_id()
+        await self.save(session_id, data)
+        return session_id
+    
+    @abc.abstractmethod
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Dados da sessão (None se não existir ou tiver expirado)
+        """
+    
+    @abc.abstractmethod
+    async def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        """
+        Gravar os dados da sessão, renovando o TTL
+        """
+    
+    @abc.abstractmethod
+    async def delete(self, session_id: str) -> None:
+        """
+        Remover a sessão
+        """
+    
+    async def close(self) -> None:
+        pass
+
+
+class MemorySessionStore(OnboardingSessionStore):
+    """
+    Backend em processo: OrderedDict em ordem de expiração, com limite de sessões.
+    Só serve para um worker (ou balanceamento com afinidade)
+    """
+    
+    def __init__(self, ttl_seconds: int, max_sessions: int):
+        super().__init__(ttl_seconds)
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+    
+    def _purge(self) -> None:
+        # TTL fixo: a sessão mais antiga está sempre na frente
+        now = time.monotonic()
+        while self._sessions:
+            session_id, (expires_at, _) = next(iter(self._sessions.items()))
+            if expires_at > now:
+                break
+            del self._sessions[session_id]
+    
+    def __len__(self) -> int:
+        self._purge()
+        return len(self._sessions)
+    
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        self._purge()
+        entry = self._sessions.get(session_id)
+        return dict(entry[1]) if entry else None
+    
+    async def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        self._purge()
+        self._sessions.pop(session_id, None)
+        # Limite de memória: descartar as sessões mais antigas (provavelmente abandonadas)
+        while len(self._sessions) >= self.max_sessions:
+            self._sessions.popitem(last=False)
+        self._sessions[session_id] = (time.monotonic() + self.ttl_seconds, dict(data))
+    
+    async def delete(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+class RedisSessionStore(OnboardingSessionStore):
+    """
+    Backend Redis: compartilhado entre workers, expiração feita pelo próprio Redis
+    """
+    
+    KEY_PREFIX = "onboarding:"
+    
+    def __init__(self, ttl_seconds: int, redis_url: str):
+        super().__init__(ttl_seconds)
+        # Importar na criação (startup do worker), não no primeiro passo do onboarding
+        import redis.asyncio as redis
+        
+        self._redis = redis
+        self.redis_url = redis_url
+        self._client = None
+    
+    def _get_client(self):
+        if self._client is None:
+            self._client = self._redis.from_url(self.redis_url)
+        return self._client
+    
+    async def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = await self._get_client().get(self.KEY_PREFIX + session_id)
+        return json.loads(raw) if raw else None
+    
+    async def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        await self._get_client().set(
+            self.KEY_PREFIX + session_id,
+            json.dumps(data, ensure_ascii=False),
+            ex=self.ttl_seconds
+        )
+    
+    async def delete(self, session_id: str) -> None:
+        await self._get_client().delete(self.KEY_PREFIX + session_id)
+    
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def session_backend() -> str:
+    """
+    Backend configurado em ONBOARDING_SESSION_BACKEND (auto: Redis quando REDIS_URL existir)
+    """
+    backend = settings.ONBOARDING_SESSION_BACKEND
+    if backend == "auto":
+        backend = "redis" if settings.REDIS_URL else "memory"
+    return backend
+
+
+def check_worker_count(workers: int) -> None:
+    """
+    Sessões em memória ficam no worker que as criou: recusar o backend com mais de um worker
+    """
+    if workers > 1 and session_backend() == "memory":
+        raise ValueError(
+            f"Sessões de onboarding em memória não são compartilhadas entre {workers} workers: "
+            "configure REDIS_URL (ou ONBOARDING_SESSION_BACKEND=redis) ou use um único worker"
+        )
+
+
+def create_session_store() -> OnboardingSessionStore:
+    """
+    Criar o store do backend configurado
+    """
+    ttl_seconds = settings.ONBOARDING_SESSION_TTL_MINUTES * 60
+    backend = session_backend()
+    
+    if backend == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("ONBOARDING_SESSION_BACKEND=redis requer REDIS_URL")
+        return RedisSessionStore(ttl_seconds, settings.REDIS_URL)
+    
+    # No launcher (app.server) WEB_CONCURRENCY é o número real de workers; fora dele, 0 = um worker
+    check_worker_count(settings.WEB_CONCURRENCY)
+    return MemorySessionStore(ttl_seconds, settings.ONBOARDING_SESSION_MAX)
+
+
+# Instância global (uma por worker)
+onboarding_sessions = create_session_store()
@@ -0,0 +1,71 @@
+"""
+CEP Cache Repository
+Repositório do cache persistente de CEPs
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain.models.cep_cache import CepCache
+
+
+class CepCacheRepository:
+    """
+    Repositório para o cache de CEPs
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def get(self, cep: str) -> Optional[CepCache]:
+        """
+        Buscar entrada do cache (sem considerar validade)
+        """
+        stmt = select(CepCache).where(CepCache.cep == cep)
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def get_many(self, ceps: Iterable[str]) -> Dict[str, CepCache]:
+        """
+        Buscar várias entradas do cache numa única consulta
+        """
+        ceps = set(ceps)
+        if not ceps:
+            return {}
+        result = await self.db.execute(select(CepCache).where(CepCache.cep.in_(ceps)))
+        return {entry.cep: entry for entry in result.scalars().all()}
+    
+    async def save(self, cep: str, address: Optional[Dict[str, Any]]) -> None:
+        """
+        Gravar (ou renovar) resultado de consulta; address=None registra CEP inexistente. Sem commit
+        """
+        await self.save_many({cep: address})
+    
+    async def save_many(self, addresses: Dict[str, Optional[Dict[str, Any]]]) -> None:
+        """
+        Gravar (ou renovar) vários resultados num único upsert multi-linha. Sem commit: a transação
+        é do chamador
+        """
+        if not addresses:
+            return
+        
+        fetched_at = datetime.utcnow()
+        values = [
+            {
+                "cep": cep,
+                "found": address is not None,
+                "data": json.dumps(address, ensure_ascii=False) if address is not None else None,
+                "fetched_at": fetched_at,
+            }
+            for cep, address in addresses.items()
+        ]
+        stmt = insert(CepCache).values(values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CepCache.cep],
+            set_={key: stmt.excluded[key] for key in ("found", "data", "fetched_at")}
+        )
+        await self.db.execute(stmt)
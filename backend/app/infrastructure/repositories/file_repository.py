@@ -0,0 +1,122 @@
+"""
+Stored File Repository
+Arquivos dos tenants e conteúdos deduplicados: cada conteúdo (SHA-256) é registrado uma vez,
+com a contagem de arquivos que o referenciam atualizada atomicamente
+"""
+
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.domain.models.storage import StoredBlob, StoredFile
+
+
+class StoredFileRepository:
+    """
+    Repositório de arquivos dos tenants
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def create(self, **values) -> StoredFile:
+        """
+        Registrar arquivo. Sem commit: a transação é do chamador (junto com a reserva de cota)
+        """
+        stored = StoredFile(**values)
+        self.db.add(stored)
+        await self.db.flush()
+        return stored
+    
+    async def get_by_id_and_tenant(self, file_id: int, tenant_id: int) -> Optional[StoredFile]:
+        """
+        Buscar arquivo por ID dentro do tenant
+        """
+        stmt = select(StoredFile).where(
+            and_(StoredFile.id == file_id, StoredFile.tenant_id == tenant_id)
+        )
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def list_by_tenant(self, tenant_id: int, skip: int = 0, limit: int = 100) -> List[StoredFile]:
+        """
+        Arquivos do tenant, mais recentes primeiro
+        """
+        stmt = (
+            select(StoredFile)
+            .where(StoredFile.tenant_id == tenant_id)
+            .order_by(StoredFile.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+    
+    async def delete(self, stored: StoredFile) -> None:
+        """
+        Remover registro. Sem commit
+        """
+        await self.db.delete(stored)
+        await self.db.flush()
+    
+    async def acquire_blob(self, sha256: str, size_bytes: int, content_type: str) -> int:
+        """
+        Referenciar um conteúdo, registrando-o se novo (INSERT ... ON CONFLICT: uploads simultâneos
+        do mesmo conteúdo esperam a linha um do outro). Retorna a nova contagem: 1 significa que o
+        conteúdo precisa ser gravado no disco. Sem commit
+        """
+        stmt = (
+            insert(StoredBlob)
+            .values(
+                sha256=sha256,
+                size_bytes=size_bytes,
+                content_type=content_type,
+                ref_count=1,
+                created_at=datetime.utcnow(),
+            )
+            .on_conflict_do_update(
+                index_elements=[StoredBlob.sha256],
+                set_={"ref_count": StoredBlob.ref_count + 1},
+            )
+            .returning(StoredBlob.ref_count)
+        )
+        return (await self.db.execute(stmt)).scalar_one()
+    
+    async def release_blob(self, sha256: str) -> Optional[int]:
+        """
+        Remover uma referência ao conteúdo. Retorna a nova contagem. Sem commit
+        """
+        stmt = (
+            update(StoredBlob)
+            .where(and_(StoredBlob.sha256 == sha256, StoredBlob.ref_count > 0))
+            .values(ref_count=StoredBlob.ref_count - 1)
+            .returning(StoredBlob.ref_count)
+            .execution_options(synchronize_session=False)
+        )
+        return (await self.db.execute(stmt)).scalar_one_or_none()
+    
+    async def lock_unreferenced_blobs(self, limit: int = 1000) -> List[str]:
+        """
+        Travar conteúdos sem referências (SKIP LOCKED: coletas concorrentes não se esperam). Até o
+        commit, um upload do mesmo conteúdo espera a linha e, removida, registra de novo
+        """
+        stmt = (
+            select(StoredBlob.sha256)
+            .where(StoredBlob.ref_count == 0)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.db.execute(stmt)
+        return list(result.scalars().all())
+    
+    async def delete_blobs(self, sha256s: List[str]) -> None:
+        """
+        Remover registros de conteúdos sem referências. Sem commit
+        """
+        await self.db.execute(
+            delete(StoredBlob)
+            .where(and_(StoredBlob.sha256.in_(sha256s), StoredBlob.ref_count == 0))
+            .execution_options(synchronize_session=False)
+        )
@@ -0,0 +1,157 @@
+"""
+Storage Ledger Repository
+Livro-razão de armazenamento e total corrente por tenant: cada variação grava uma entrada e
+atualiza tenants.storage_used_bytes na mesma transação, e a cota é conferida no próprio UPDATE
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import BigInteger, select, insert, update, func, and_, cast, text
+
+from app.domain.models.storage import StorageLedgerEntry
+from app.domain.models.tenant import Tenant, GIB
+
+
+# Lock consultivo da reconciliação: um worker por vez no cluster
+RECONCILE_LOCK_ID = 0x5354_4F52  # "STOR"
+
+
+class StorageLedgerRepository:
+    """
+    Repositório do livro-razão de armazenamento
+    """
+    
+    def __init__(self, db: AsyncSession):
+        self.db = db
+    
+    async def _record(self, tenant_id: int, delta_bytes: int, object_key: Optional[str], reason: str) -> None:
+        await self.db.execute(insert(StorageLedgerEntry).values(
+            tenant_id=tenant_id,
+            delta_bytes=delta_bytes,
+            object_key=object_key,
+            reason=reason,
+            created_at=datetime.utcnow(),
+        ))
+    
+    async def reserve(
+        self,
+        tenant_id: int,
+        size_bytes: int,
+        object_key: Optional[str] = None,
+        reason: str = "upload"
+    ) -> Optional[int]:
+        """
+        Somar `size_bytes` ao uso do tenant se couber na cota, num único UPDATE condicional
+        (sem corrida entre uploads simultâneos). Retorna o novo total, ou None se excederia a
+        cota. Sem commit: a transação é do chamador
+        """
+        stmt = (
+            update(Tenant)
+            .where(
+                and_(
+                    Tenant.id == tenant_id,
+                    Tenant.storage_used_bytes + size_bytes <= cast(Tenant.max_storage_gb, BigInteger) * GIB
+                )
+            )
+            # updated_at preservado: uso de armazenamento não é alteração cadastral
+            .values(storage_used_bytes=Tenant.storage_used_bytes + size_bytes, updated_at=Tenant.updated_at)
+            .returning(Tenant.storage_used_bytes)
+            .execution_options(synchronize_session=False)
+        )
+        used = (await self.db.execute(stmt)).scalar_one_or_none()
+        if used is None:
+            return None
+        
+        await self._record(tenant_id, size_bytes, object_key, reason)
+        return used
+    
+    async def release(
+        self,
+        tenant_id: int,
+        size_bytes: int,
+        object_key: Optional[str] = None,
+        reason: str = "delete"
+    ) -> Optional[int]:
+        """
+        Subtrair `size_bytes` do uso do tenant (arquivo removido ou upload abortado). Retorna o
+        novo total. Sem commit: a transação é do chamador
+        """
+        stmt = (
+            update(Tenant)
+            .where(Tenant.id == tenant_id)
+            .values(storage_used_bytes=Tenant.storage_used_bytes - size_bytes, updated_at=Tenant.updated_at)
+            .returning(Tenant.storage_used_bytes)
+            .execution_options(synchronize_session=False)
+        )
+        used = (await self.db.execute(stmt)).scalar_one_or_none()
+        if used is not None:
+            await self._record(tenant_id, -size_bytes, object_key, reason)
+        return used
+    
+    async def get_usage(self, tenant_id: int) -> Optional[Dict[str, int]]:
+        """
+        Uso e cota do tenant em bytes (total corrente, sem somar o livro-razão)
+        """
+        stmt = select(Tenant.storage_used_bytes, Tenant.max_storage_gb).where(Tenant.id == tenant_id)
+        row = (await self.db.execute(stmt)).first()
+        if row is None:
+            return None
+        return {"used_bytes": row.storage_used_bytes, "quota_bytes": row.max_storage_gb * GIB}
+    
+    async def ledger_totals(self, tenant_ids: Optional[List[int]] = None) -> Dict[int, int]:
+        """
+        Soma do livro-razão por tenant
+        """
+        stmt = select(
+            StorageLedgerEntry.tenant_id,
+            func.sum(StorageLedgerEntry.delta_bytes)
+        ).group_by(StorageLedgerEntry.tenant_id)
+        if tenant_ids is not None:
+            stmt = stmt.where(StorageLedgerEntry.tenant_id.in_(tenant_ids))
+        result = await self.db.execute(stmt)
+        return {tenant_id: int(total) for tenant_id, total in result.all()}
+    
+    async def reconcile(self) -> Optional[Dict[int, int]]:
+        """
+        Corrigir os totais correntes que divergem da soma do livro-razão (ex.: escritas feitas
+        fora do repositório). Os tenants divergentes são travados e somados de novo antes da
+        correção, para não perder reservas concorrentes. Retorna {tenant_id: total corrigido},
+        ou None se outro worker já está reconciliando. Sem commit: a transação é do chamador
+        """
+        locked = (await self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:lock_id)"), {"lock_id": RECONCILE_LOCK_ID}
+        )).scalar()
+        if not locked:
+            return None
+        
+        # 1. Candidatos, sem travas: total diferente da soma (ou sem entradas e total não zero)
+        totals = await self.ledger_totals()
+        result = await self.db.execute(select(Tenant.id, Tenant.storage_used_bytes))
+        drifted = [
+            tenant_id for tenant_id, used in result.all()
+            if used != totals.get(tenant_id, 0)
+        ]
+        if not drifted:
+            return {}
+        
+        # 2. Travar os candidatos (reservas em andamento terminam antes) e somar de novo
+        await self.db.execute(
+            select(Tenant.id).where(Tenant.id.in_(drifted)).order_by(Tenant.id).with_for_update()
+        )
+        totals = await self.ledger_totals(drifted)
+        
+        now = datetime.utcnow()
+        fixed = {}
+        for tenant_id in drifted:
+            total = totals.get(tenant_id, 0)
+            result = await self.db.execute(
+                update(Tenant)
+                .where(and_(Tenant.id == tenant_id, Tenant.storage_used_bytes != total))
+                .values(storage_used_bytes=total, storage_reconciled_at=now, updated_at=Tenant.updated_at)
+                .returning(Tenant.id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.scalar_one_or_none() is not None:
+                fixed[tenant_id] = total
+        return fixed
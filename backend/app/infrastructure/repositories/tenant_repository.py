@@ -3,14 +3,18 @@ Tenant Repository
 Repositório para operações de tenant no banco de dados
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, or_, func
+from sqlalchemy import select, insert, update, delete, and_, or_, not_, func
 from sqlalchemy.orm import selectinload
 
 from app.domain.models.tenant import Tenant, TenantStatus, TenantPlan
 from app.domain.schemas.tenant import TenantCreate, TenantUpdate
+from app.core.config import settings
+from app.core.documents import normalize_document
+from app.core.module_config import PLAN_MODULES, module_configs, platform_modules
+from app.infrastructure.existence_filters import tenant_filters
 
 
 class TenantRepository:
@@ -57,11 +61,69 @@ class TenantRepository:
         )
         
         self.db.add(tenant)
+        tenant_filters.add_tenant(tenant.slug, tenant.email, tenant.cnpj)
         await self.db.commit()
         await self.db.refresh(tenant)
         
         return tenant
     
+    @staticmethod
+    def _onboarded_values(tenant_data: TenantCreate, now: datetime) -> Dict[str, Any]:
+        return {
+            "slug": tenant_data.slug,
+            "company_name": tenant_data.company_name,
+            "fantasy_name": tenant_data.fantasy_name,
+            "cnpj": tenant_data.cnpj,
+            "cpf": tenant_data.cpf,
+            "email": tenant_data.email,
+            "phone": tenant_data.phone,
+            "segment": tenant_data.segment,
+            "cep": tenant_data.cep,
+            "street": tenant_data.street,
+            "number": tenant_data.number,
+            "complement": tenant_data.complement,
+            "neighborhood": tenant_data.neighborhood,
+            "city": tenant_data.city,
+            "state": tenant_data.state,
+            "plan": tenant_data.plan,
+            "status": TenantStatus.ACTIVE,
+            "trial_end_date": now + timedelta(days=30) if tenant_data.plan == TenantPlan.TRIAL else None,
+            "is_active": True,
+            "onboarding_completed": True,
+            "onboarding_step": 3,
+            "activated_at": now,
+            "total_users": 1,
+        }
+    
+    async def insert_onboarded(self, tenant_data: TenantCreate) -> Dict[str, Any]:
+        """
+        Inserir tenant já ativo (onboarding concluído) com INSERT ... RETURNING, sem commit:
+        a transação é do chamador
+        """
+        stmt = insert(Tenant).values(
+            **self._onboarded_values(tenant_data, datetime.utcnow())
+        ).returning(Tenant.id, Tenant.slug, Tenant.company_name, Tenant.plan)
+        
+        tenant_filters.add_tenant(tenant_data.slug, tenant_data.email, tenant_data.cnpj)
+        result = await self.db.execute(stmt)
+        return dict(result.mappings().one())
+    
+    async def insert_many_onboarded(self, tenants: List[TenantCreate]) -> List[Dict[str, Any]]:
+        """
+        Inserir vários tenants já ativos num INSERT multi-linha com RETURNING (na ordem da
+        entrada), sem commit
+        """
+        if not tenants:
+            return []
+        
+        now = datetime.utcnow()
+        stmt = insert(Tenant).returning(Tenant.id, Tenant.slug, sort_by_parameter_order=True)
+        for tenant_data in tenants:
+            tenant_filters.add_tenant(tenant_data.slug, tenant_data.email, tenant_data.cnpj)
+        
+        result = await self.db.execute(stmt, [self._onboarded_values(t, now) for t in tenants])
+        return [dict(row) for row in result.mappings().all()]
+    
     async def get_by_id(self, tenant_id: int) -> Optional[Tenant]:
         """
         Buscar tenant por ID
@@ -80,17 +142,21 @@ class TenantRepository:
     
     async def get_by_email(self, email: str) -> Optional[Tenant]:
         """
-        Buscar tenant por email
+        Buscar tenant por email (sem diferenciar maiúsculas)
         """
-        stmt = select(Tenant).where(Tenant.email == email)
+        stmt = select(Tenant).where(Tenant.email_normalized == email.lower())
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
     async def get_by_cnpj(self, cnpj: str) -> Optional[Tenant]:
         """
-        Buscar tenant por CNPJ
+        Buscar tenant por CNPJ (formatado ou não)
         """
-        stmt = select(Tenant).where(Tenant.cnpj == cnpj)
+        cnpj = normalize_document(cnpj)
+        if not cnpj:
+            return None
+        
+        stmt = select(Tenant).where(Tenant.cnpj_normalized == cnpj)
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
     
@@ -142,9 +208,13 @@ class TenantRepository:
         
         for field, value in update_data.items():
             setattr(tenant, field, value)
+        # Nova versão: visões de módulos/configurações em cache (todos os workers) são recompiladas
+        tenant.config_version = Tenant.config_version + 1
         
+        tenant_filters.add_tenant(None, update_data.get("email"), update_data.get("cnpj"))
         await self.db.commit()
         await self.db.refresh(tenant)
+        module_configs.invalidate(tenant_id)
         
         return tenant
     
@@ -234,33 +304,63 @@ class TenantRepository:
         
         return result.rowcount > 0
     
-    async def slug_exists(self, slug: str) -> bool:
+    async def slug_exists(self, slug: str, use_filter: bool = True) -> bool:
         """
-        Verificar se slug já existe
+        Verificar se slug já existe (o filtro de existência evita a consulta quando está livre)
         """
+        if use_filter and settings.EXISTENCE_FILTERS_ENABLED and not tenant_filters.might_exist("slug", slug):
+            return False
+        
         stmt = select(func.count(Tenant.id)).where(Tenant.slug == slug)
         result = await self.db.execute(stmt)
         count = result.scalar() or 0
         return count > 0
     
-    async def email_exists(self, email: str) -> bool:
+    async def email_exists(self, email: str, use_filter: bool = True) -> bool:
         """
-        Verificar se email já existe
+        Verificar se email já existe (o filtro de existência evita a consulta quando está livre)
         """
-        stmt = select(func.count(Tenant.id)).where(Tenant.email == email)
+        if use_filter and settings.EXISTENCE_FILTERS_ENABLED and not tenant_filters.might_exist("email", email):
+            return False
+        
+        stmt = select(func.count(Tenant.id)).where(Tenant.email_normalized == email.lower())
         result = await self.db.execute(stmt)
         count = result.scalar() or 0
         return count > 0
     
-    async def cnpj_exists(self, cnpj: str) -> bool:
+    async def cnpj_exists(self, cnpj: str, use_filter: bool = True) -> bool:
         """
-        Verificar se CNPJ já existe
+        Verificar se CNPJ já existe (o filtro de existência evita a consulta quando está livre)
         """
-        stmt = select(func.count(Tenant.id)).where(Tenant.cnpj == cnpj)
+        if use_filter and settings.EXISTENCE_FILTERS_ENABLED and not tenant_filters.might_exist("cnpj", cnpj):
+            return False
+        
+        stmt = select(func.count(Tenant.id)).where(Tenant.cnpj_normalized == normalize_document(cnpj))
         result = await self.db.execute(stmt)
         count = result.scalar() or 0
         return count > 0
     
+    async def find_taken(self, kind: str, values: List[str], use_filter: bool = True) -> Set[str]:
+        """
+        Valores (slug, email ou cnpj) já usados por algum tenant, numa única consulta; emails e
+        CNPJs voltam normalizados (minúsculas, só dígitos). O filtro de existência descarta antes
+        os certamente livres
+        """
+        if use_filter and settings.EXISTENCE_FILTERS_ENABLED:
+            values = [value for value in values if tenant_filters.might_exist(kind, value)]
+        if kind == "email":
+            column, values = Tenant.email_normalized, [value.lower() for value in values]
+        elif kind == "cnpj":
+            column, values = Tenant.cnpj_normalized, [normalize_document(value) for value in values]
+        else:
+            column = getattr(Tenant, kind)
+        values = {value for value in values if value}
+        if not values:
+            return set()
+        
+        result = await self.db.execute(select(column).where(column.in_(values)))
+        return set(result.scalars().all())
+    
     async def get_tenant_stats(self, tenant_id: int) -> Optional[Dict[str, Any]]:
         """
         Obter estatísticas detalhadas do tenant
@@ -308,14 +408,8 @@ class TenantRepository:
             "days_remaining": days_remaining,
             "total_patients": tenant.total_patients,
             "total_appointments": tenant.total_appointments,
-            "storage_used_gb": 0.0,  # TODO: Implementar cálculo real
-            "modules_enabled": {
-                "hubb_hof": True,
-                "hubb_vision": True,
-                "hubb_rh": True,
-                "hubb_ia": True,
-                "hubb_core": True
-            }
+            "storage_used_gb": tenant.storage_used_gb,
+            "modules_enabled": dict(module_configs.for_tenant(tenant).modules)
         }
     
     async def get_expiring_trials(self, days: int = 7) -> List[Tenant]:
@@ -334,3 +428,46 @@ class TenantRepository:
         
         result = await self.db.execute(stmt)
         return result.scalars().all()
+    
+    async def get_tenants_with_module(self, module: str, skip: int = 0, limit: int = 100) -> List[Tenant]:
+        """
+        Buscar tenants ativos com o módulo habilitado, na mesma resolução de compile_tenant_config:
+        módulo ligado na plataforma e exceção {module: true}, ou plano que inclui o módulo sem a
+        exceção {module: false} (exceções pelo índice GIN, plano pelo índice de planos ativos)
+        """
+        if module not in platform_modules():
+            return []
+        
+        plans = [TenantPlan(plan) for plan, modules in PLAN_MODULES.items() if module in modules]
+        stmt = select(Tenant).where(
+            and_(
+                or_(
+                    Tenant.modules_enabled.contains({module: True}),
+                    and_(
+                        Tenant.plan.in_(plans),
+                        or_(
+                            Tenant.modules_enabled.is_(None),
+                            not_(Tenant.modules_enabled.contains({module: False}))
+                        )
+                    )
+                ),
+                Tenant.is_active == True
+            )
+        ).order_by(Tenant.id).offset(skip).limit(limit)
+        
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
+    
+    async def get_tenants_by_specialty(self, specialty: str, skip: int = 0, limit: int = 100) -> List[Tenant]:
+        """
+        Buscar tenants ativos com a especialidade (specialties @> [specialty], índice GIN)
+        """
+        stmt = select(Tenant).where(
+            and_(
+                Tenant.specialties.contains([specialty]),
+                Tenant.is_active == True
+            )
+        ).order_by(Tenant.id).offset(skip).limit(limit)
+        
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
@@ -3,9 +3,10 @@ User Repository
 Repositório para operações de usuário no banco de dados
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, or_, func
+from sqlalchemy import select, insert, update, delete, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
 from app.domain.models.user import User, UserRole
@@ -47,6 +48,60 @@ class UserRepository:
         
         return user
     
+    async def insert_returning(self, user_data: UserCreate, hashed_password: str) -> Dict[str, Any]:
+        """
+        Inserir usuário com senha já em hash via INSERT ... RETURNING, sem commit:
+        a transação é do chamador
+        """
+        stmt = insert(User).values(
+            email=user_data.email,
+            full_name=user_data.full_name,
+            hashed_password=hashed_password,
+            phone=user_data.phone,
+            role=user_data.role,
+            tenant_id=user_data.tenant_id,
+            cpf=user_data.cpf,
+            professional_id=user_data.professional_id,
+            is_active=True
+        ).returning(User.id, User.email, User.full_name, User.role)
+        
+        result = await self.db.execute(stmt)
+        return dict(result.mappings().one())
+    
+    async def insert_if_absent(self, user_data: UserCreate, hashed_password: str) -> Optional[User]:
+        """
+        Inserir usuário com INSERT ... ON CONFLICT DO NOTHING sobre (tenant_id, email_normalized),
+        sem commit; None se o email já existe no tenant
+        """
+        stmt = pg_insert(User).values(
+            email=user_data.email,
+            full_name=user_data.full_name,
+            hashed_password=hashed_password,
+            phone=user_data.phone,
+            role=user_data.role,
+            tenant_id=user_data.tenant_id,
+            cpf=user_data.cpf,
+            professional_id=user_data.professional_id,
+            is_active=True
+        ).on_conflict_do_nothing(
+            index_elements=[User.tenant_id, User.email_normalized]
+        ).returning(User)
+        
+        result = await self.db.execute(stmt)
+        return result.scalar_one_or_none()
+    
+    async def insert_many_returning(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Inserir vários usuários (valores de coluna, senha já em hash) num INSERT multi-linha
+        com RETURNING (na ordem da entrada), sem commit
+        """
+        if not rows:
+            return []
+        
+        stmt = insert(User).returning(User.id, User.email, sort_by_parameter_order=True)
+        result = await self.db.execute(stmt, rows)
+        return [dict(row) for row in result.mappings().all()]
+    
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """
         Buscar usuário por ID
@@ -69,8 +124,8 @@ class UserRepository:
         """
         stmt = select(User).where(
             and_(
-                User.email == email,
-                User.tenant_id == tenant_id
+                User.tenant_id == tenant_id,
+                User.email_normalized == email.lower()
             )
         )
         result = await self.db.execute(stmt)
@@ -248,6 +303,23 @@ class UserRepository:
         
         return result.rowcount > 0
     
+    async def find_existing_emails(self, tenant_id: int, emails: List[str]) -> Set[str]:
+        """
+        Emails (em minúsculas) já cadastrados no tenant, numa única consulta
+        """
+        if not emails:
+            return set()
+        
+        lowered = {email.lower() for email in emails}
+        stmt = select(User.email_normalized).where(
+            and_(
+                User.tenant_id == tenant_id,
+                User.email_normalized.in_(lowered)
+            )
+        )
+        result = await self.db.execute(stmt)
+        return set(result.scalars().all())
+    
     async def count_by_tenant(self, tenant_id: int) -> int:
         """
         Contar usuários por tenant
@@ -275,8 +347,8 @@ class UserRepository:
         """
         stmt = select(func.count(User.id)).where(
             and_(
-                User.email == email,
-                User.tenant_id == tenant_id
+                User.tenant_id == tenant_id,
+                User.email_normalized == email.lower()
             )
         )
         result = await self.db.execute(stmt)
@@ -290,3 +362,18 @@ class UserRepository:
         stmt = select(User).where(User.role == UserRole.SUPER_ADMIN)
         result = await self.db.execute(stmt)
         return result.scalars().all()
+    
+    async def get_users_by_specialty(self, tenant_id: int, specialty: str) -> List[User]:
+        """
+        Buscar usuários ativos do tenant com a especialidade (specialties @> [specialty], índice GIN)
+        """
+        stmt = select(User).where(
+            and_(
+                User.tenant_id == tenant_id,
+                User.specialties.contains([specialty]),
+                User.is_active == True
+            )
+        ).order_by(User.full_name)
+        
+        result = await self.db.execute(stmt)
+        return result.scalars().all()
@@ -3,14 +3,31 @@ HUBB Assist SaaS - FastAPI Main Application
 Sistema multi-tenant para clínicas de saúde
 """
 
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
-from app.core.database import engine, get_db
-from app.domain.models import user, tenant
-from app.api.routes import auth, tenants, users
+from app.core.database import engine, get_db, warm_pool
+from app.core.migrations import check_schema
+from app.core.query_stats import QueryStatsMiddleware, install_query_listeners
+from app.core.health import cache_client_error, health_monitor
+from app.core.warmup import StartupTimer, run_warmup
+from app.core.module_config import module_configs
+from app.infrastructure.external.viacep_client import viacep_client
+from app.infrastructure.existence_filters import tenant_filters
+from app.infrastructure.onboarding_sessions import onboarding_sessions
+from app.application.services.storage_service import storage_reconciler
+from app.server import mark_worker_ready
+from app.domain.models import user, tenant, cep_cache, storage
+from app.api.routes import auth, tenants, users, files
+
+_import_finished = time.perf_counter()
 
 
 @asynccontextmanager
@@ -18,22 +35,46 @@ async def lifespan(app: FastAPI):
     """Gerencia o ciclo de vida da aplicação"""
     # Startup
     print("🚀 Iniciando HUBB Assist SaaS...")
+    timer = StartupTimer(started=_import_started)
+    timer.mark("imports", _import_started, _import_finished)
+    
+    # O schema é responsabilidade das migrações (alembic upgrade head no deploy):
+    # o worker só confere a revisão e não sobe com o banco fora de sincronia
+    with timer.phase("schema_check"):
+        revision = await check_schema()
+    
+    print(f"✅ Database na revisão {revision}")
     
-    # Criar todas as tabelas
-    from app.domain.models.user import Base
-    from app.domain.models.tenant import Base as TenantBase
+    # Pagar os custos de primeira requisição antes de aceitar tráfego
+    await run_warmup(app, timer, warm_pool=warm_pool if settings.DB_POOL_PREWARM else None)
     
-    async with engine.begin() as conn:
-        await conn.run_sync(user.Base.metadata.create_all)
-        await conn.run_sync(tenant.Base.metadata.create_all)
+    cache_error = cache_client_error()
+    if cache_error:
+        print(f"⚠️  Cache mal configurado: {cache_error}")
     
-    print("✅ Database inicializada com sucesso!")
+    # Verificações de dependências em background para os probes
+    with timer.phase("health_checks"):
+        await health_monitor.start()
+    storage_reconciler.start()
+    
+    app.state.startup_report = timer.report()
+    print(
+        f"⏱️  Boot em {app.state.startup_report['total_ms']:.0f}ms: "
+        + ", ".join(f"{p['phase']}={p['ms']:.0f}ms" for p in app.state.startup_report["phases"])
+    )
+    
+    # Avisar o launcher multi-worker (app.server) que este worker está pronto
+    mark_worker_ready()
     print(f"📡 Servidor rodando em: http://0.0.0.0:{settings.PORT}")
     
     yield
     
     # Shutdown
     print("🛑 Encerrando HUBB Assist SaaS...")
+    await health_monitor.stop()
+    await storage_reconciler.stop()
+    await viacep_client.aclose()
+    await onboarding_sessions.close()
 
 
 # Criar aplicação FastAPI
@@ -55,10 +96,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Instrumentação de queries por requisição (Server-Timing, N+1, queries lentas)
+if settings.QUERY_STATS_ENABLED:
+    install_query_listeners(engine.sync_engine)
+    app.add_middleware(QueryStatsMiddleware)
+
+# Profiling sob demanda (sem custo quando desligado)
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+    
+    app.add_middleware(ProfilingMiddleware)
+
 # Incluir rotas
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Autenticação"])
 app.include_router(tenants.router, prefix="/api/v1/tenants", tags=["Tenants"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Usuários"])
+app.include_router(files.router, prefix="/api/v1/files", tags=["Arquivos"])
+
+if settings.PROFILING_ENABLED:
+    from app.api.routes import profiling
+    
+    app.include_router(profiling.router, prefix="/api/v1/profiling", tags=["Profiling"])
 
 
 @app.get("/")
@@ -74,14 +132,34 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (estado real, a partir do cache de verificações)"""
+    database = health_monitor.results.get("database", {})
     return {
-        "status": "healthy",
+        "status": "healthy" if health_monitor.is_ready else "degraded",
         "environment": settings.ENVIRONMENT,
-        "database": "connected"
+        "database": "connected" if database.get("status") == "ok" else "disconnected"
     }
 
 
+@app.get("/health/live")
+async def liveness_probe():
+    """Liveness probe: processo e event loop respondendo (sem tocar dependências)"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness_probe():
+    """Readiness probe: banco, cache e migrações, a partir do último refresh"""
+    report = health_monitor.report()
+    report["startup"] = getattr(app.state, "startup_report", None)
+    report["existence_filters"] = tenant_filters.report()
+    report["module_configs"] = module_configs.report()
+    return JSONResponse(
+        status_code=200 if health_monitor.is_ready else 503,
+        content=report
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,157 @@
+"""
+Production Server
+Launcher multi-worker (uvicorn) com uvloop/httptools, workers pré-aquecidos e restart gracioso
+
+Uso (a partir de backend/):
+    python -m app.server                    # workers = WEB_CONCURRENCY ou nº de CPUs
+    python -m app.server --workers 4 --port 8000
+    kill -HUP <pid do processo pai>         # restart rolante sem derrubar conexões
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import List, Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger("uvicorn.error")
+
+# Diretório onde cada worker sinaliza que terminou o aquecimento (definido pelo launcher)
+READY_DIR_ENV = "HUBB_WORKER_READY_DIR"
+
+
+def default_workers() -> int:
+    """
+    Número de workers: WEB_CONCURRENCY ou CPUs disponíveis para o processo
+    """
+    if settings.WEB_CONCURRENCY > 0:
+        return settings.WEB_CONCURRENCY
+    
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except AttributeError:
+        return max(1, os.cpu_count() or 1)
+
+
+def mark_worker_ready() -> None:
+    """
+    Sinalizar ao launcher que este worker está aquecido (chamado no fim do lifespan)
+    """
+    ready_dir = os.getenv(READY_DIR_ENV)
+    if not ready_dir:
+        return
+    
+    with open(os.path.join(ready_dir, str(os.getpid())), "w"):
+        pass
+
+
+def _consume_ready_file(pid: Optional[int]) -> bool:
+    """
+    Remover o arquivo de prontidão do worker, indicando se ele existia
+    """
+    try:
+        os.unlink(os.path.join(os.environ[READY_DIR_ENV], str(pid)))
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _fastest(module: str, fallback: str = "auto") -> str:
+    """
+    Usar a implementação nativa (uvloop/httptools) quando instalada
+    """
+    try:
+        __import__(module)
+        return module
+    except ImportError:
+        return fallback
+
+
+def build_supervisor_class():
+    """
+    Supervisor que, no SIGHUP, sobe o novo worker e espera ele ficar pronto
+    antes de encerrar o antigo (que drena as conexões em andamento)
+    """
+    from uvicorn.supervisors.multiprocess import Multiprocess, Process
+    
+    class WarmRestartMultiprocess(Multiprocess):
+        
+        def wait_ready(self, process: Process, timeout: float) -> bool:
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                if _consume_ready_file(process.pid):
+                    return True
+                if not process.process.is_alive():
+                    return False
+                time.sleep(0.1)
+            return False
+        
+        def restart_all(self) -> None:
+            for idx, old_process in enumerate(self.processes):
+                new_process = Process(self.config, self.target, self.sockets)
+                new_process.start()
+                if not self.wait_ready(new_process, timeout=settings.WORKER_STARTUP_TIMEOUT):
+                    logger.warning("Worker [%s] não sinalizou prontidão a tempo", new_process.pid)
+                
+                self.processes[idx] = new_process
+                old_process.terminate()
+                old_process.join()
+                _consume_ready_file(old_process.pid)
+    
+    return WarmRestartMultiprocess
+
+
+def run(host: str, port: int, workers: int, app: str = "app.main:app") -> None:
+    """
+    Subir o servidor com N workers
+    """
+    import uvicorn
+    
+    from app.infrastructure.onboarding_sessions import check_worker_count
+    
+    # Falhar aqui, antes de subir os workers, e repassar a eles o número real de workers
+    check_worker_count(workers)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    os.environ.setdefault(READY_DIR_ENV, tempfile.mkdtemp(prefix="hubb-workers-"))
+    
+    config = uvicorn.Config(
+        app,
+        host=host,
+        port=port,
+        workers=workers,
+        loop=_fastest("uvloop"),
+        http=_fastest("httptools"),
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        timeout_keep_alive=settings.KEEPALIVE_TIMEOUT,
+        timeout_graceful_shutdown=settings.GRACEFUL_TIMEOUT,
+        access_log=settings.DEBUG,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+    server = uvicorn.Server(config)
+    
+    if workers == 1:
+        server.run()
+        return
+    
+    sock = config.bind_socket()
+    supervisor_class = build_supervisor_class()
+    supervisor_class(config, target=server.run, sockets=[sock]).run()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor de produção HUBB Assist")
+    parser.add_argument("--host", default=settings.HOST)
+    parser.add_argument("--port", type=int, default=settings.PORT)
+    parser.add_argument("--workers", type=int, default=default_workers())
+    args = parser.parse_args(argv)
+    
+    run(args.host, args.port, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Benchmarks - Load tests and microbenchmarks for HUBB Assist
+"""
@@ -0,0 +1,90 @@
+"""
+CEP Index Benchmark
+Tamanho, tempo de construção e custo por consulta do índice offline de CEPs
+com uma base sintética do tamanho da base nacional (~1M CEPs).
+
+Uso (a partir de backend/):
+    python -m benchmarks.cep_index_bench
+    python -m benchmarks.cep_index_bench --ceps 200000 --output cep_index.json
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.security_bench import measure
+
+
+UFS = ["SP", "RJ", "MG", "RS", "PR", "BA", "SC", "PE", "CE", "GO", "DF"]
+
+
+def synthetic_rows(count: int, seed: int):
+    """
+    CEPs únicos com logradouros variados e bairros/cidades repetidos, como na base real
+    """
+    rng = random.Random(seed)
+    ceps = rng.sample(range(1_000_000, 99_999_999), count)
+    for cep in ceps:
+        yield (
+            f"{cep:08d}",
+            f"Rua {rng.randrange(50_000)}",
+            f"Bairro {rng.randrange(20_000)}",
+            f"Cidade {rng.randrange(5_500)}",
+            rng.choice(UFS),
+        )
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from app.infrastructure.external.cep_index import CepIndex, build_index
+    
+    rows = list(synthetic_rows(args.ceps, args.seed))
+    hits = [row[0] for row in random.Random(args.seed + 1).sample(rows, 1000)]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cep.idx")
+        start = time.perf_counter()
+        count = build_index(rows, path)
+        build_s = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        
+        start = time.perf_counter()
+        index = CepIndex(path)
+        open_ms = (time.perf_counter() - start) * 1000
+        
+        hit_iter = iter(hits * 10_000)
+        results = {
+            "lookup[hit]": measure(lambda: index.lookup(next(hit_iter)), args.min_time),
+            "lookup[miss]": measure(lambda: index.lookup("00000001"), args.min_time),
+            "contains[hit]": measure(lambda: hits[0] in index, args.min_time),
+        }
+        index.close()
+    
+    return {
+        "meta": run_metadata(benchmark="cep_index", ceps=count),
+        "index": {
+            "build_s": round(build_s, 2),
+            "size_mb": round(size_mb, 2),
+            "bytes_per_cep": round(size_mb * 1024 * 1024 / count, 1),
+            "open_ms": round(open_ms, 3),
+        },
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark do índice offline de CEPs")
+    parser.add_argument("--ceps", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--min-time", type=float, default=0.2)
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+    
+    write_report(run(args), args.output)
+
+
+if __name__ == "__main__":
+    main()
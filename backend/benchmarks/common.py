@@ -0,0 +1,108 @@
+"""
+Benchmark Utilities
+Estatísticas de latência, metadados de execução e relatórios JSON comparáveis entre commits
+"""
+
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SERVER_TIMING_RE = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """
+    Percentil por interpolação linear (valores já ordenados)
+    """
+    if not sorted_values:
+        return 0.0
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    weight = rank - lower
+    return sorted_values[lower] * (1 - weight) + sorted_values[upper] * weight
+
+
+def summarize(values: Iterable[float], scale: float = 1.0) -> Dict[str, float]:
+    """
+    Resumo estatístico (p50/p95/p99/média/máximo) com fator de escala
+    """
+    ordered = sorted(value * scale for value in values)
+    if not ordered:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    
+    return {
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "mean": round(sum(ordered) / len(ordered), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def parse_server_timing(header: Optional[str]) -> Optional[Dict[str, float]]:
+    """
+    Extrair contagem de queries e tempo de banco do header Server-Timing
+    """
+    if not header:
+        return None
+    
+    match = _SERVER_TIMING_RE.search(header)
+    if not match:
+        return None
+    
+    return {"db_ms": float(match.group(1)), "queries": int(match.group(2))}
+
+
+def git_commit() -> Optional[str]:
+    """
+    Commit atual do repositório (None fora de um checkout git)
+    """
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_metadata(**extra: Any) -> Dict[str, Any]:
+    """
+    Metadados da execução para comparar relatórios entre commits
+    """
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        **extra,
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    """
+    Gravar relatório JSON em arquivo ou stdout
+    """
+    data = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(data + "\n")
+    else:
+        print(data)
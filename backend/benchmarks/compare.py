@@ -0,0 +1,96 @@
+"""
+Benchmark Comparison
+Compara dois relatórios JSON de benchmark (ex.: baseline vs commit atual) e aponta regressões
+
+Uso (a partir de backend/):
+    python -m benchmarks.compare baseline.json atual.json --threshold 0.10
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+# Métricas em que valores maiores são piores
+LOWER_IS_BETTER = {"p50", "p95", "p99", "mean", "max", "ns_per_op", "us_per_op", "ms_per_op", "import_ms"}
+# Métricas em que valores menores são piores
+HIGHER_IS_BETTER = {"throughput_ops", "ops_per_sec"}
+
+
+def flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """
+    Achatar métricas numéricas em caminhos "a.b.c"
+    """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float,
+    section: str = "scenarios"
+) -> List[Dict[str, Any]]:
+    """
+    Comparar métricas de uma seção; retorna linhas com variação e flag de regressão
+    """
+    base_metrics = dict(flatten(baseline.get(section, {})))
+    rows = []
+    for path, value in flatten(current.get(section, {})):
+        if path not in base_metrics:
+            continue
+        metric = path.rsplit(".", 1)[-1]
+        if metric not in LOWER_IS_BETTER and metric not in HIGHER_IS_BETTER:
+            continue
+        
+        base = base_metrics[path]
+        change = (value - base) / base if base else 0.0
+        if metric in LOWER_IS_BETTER:
+            regression = change > threshold
+        else:
+            regression = change < -threshold
+        
+        rows.append({
+            "metric": path,
+            "baseline": base,
+            "current": value,
+            "change_pct": round(change * 100, 1),
+            "regression": regression,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Comparar relatórios de benchmark")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Variação tolerada (0.10 = 10%%)")
+    parser.add_argument("--section", default="scenarios")
+    args = parser.parse_args(argv)
+    
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    
+    rows = compare_reports(baseline, current, args.threshold, args.section)
+    for row in rows:
+        flag = "REGRESSÃO" if row["regression"] else ""
+        print(
+            f"{row['metric']:<55} {row['baseline']:>12.3f} -> {row['current']:>12.3f} "
+            f"({row['change_pct']:+.1f}%) {flag}"
+        )
+    
+    regressions = [row for row in rows if row["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} regressão(ões) acima de {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
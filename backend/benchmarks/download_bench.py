@@ -0,0 +1,212 @@
+"""
+Download Benchmark
+Uma clínica inteira abrindo o mesmo exame: `concurrency` clientes baixam o mesmo arquivo e medem
+MB/s, latência, CPU do servidor por MB enviado e o pico de memória (VmHWM); depois as mesmas
+requisições com If-None-Match (304). Confere também o protocolo: ETag forte igual ao SHA-256,
+Cache-Control imutável, HEAD, Range simples e por sufixo, If-Range e 416.
+
+Uso (a partir de backend/):
+    python -m benchmarks.download_bench --embedded
+    python -m benchmarks.download_bench --database-url postgresql://... --concurrency 64 --downloads 1000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import run_metadata, summarize, write_report
+from benchmarks.load_test import login_as, start_server, stop_server, wait_for_server
+from benchmarks.postgres import EmbeddedPostgres, free_port
+from benchmarks.upload_bench import peak_rss_kb
+
+
+def cpu_seconds(pid: int) -> float:
+    """
+    CPU (usuário + sistema) consumida pelo processo (/proc, Linux)
+    """
+    with open(f"/proc/{pid}/stat") as stat_file:
+        fields = stat_file.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+async def check_protocol(client: httpx.AsyncClient, url: str, payload: bytes, sha256: str) -> Dict[str, Any]:
+    """
+    Cabeçalhos e respostas condicionais/parciais do endpoint de download
+    """
+    etag = f'"{sha256}"'
+    full = await client.get(url)
+    head = await client.head(url)
+    first_kb = await client.get(url, headers={"Range": "bytes=0-1023"})
+    suffix = await client.get(url, headers={"Range": "bytes=-500"})
+    if_range = await client.get(url, headers={"Range": "bytes=100-199", "If-Range": etag})
+    stale_if_range = await client.get(url, headers={"Range": "bytes=100-199", "If-Range": '"outro"'})
+    unsatisfiable = await client.get(url, headers={"Range": f"bytes={len(payload) + 10}-"})
+    not_modified = await client.get(url, headers={"If-None-Match": etag})
+    
+    return {
+        "full": full.status_code == 200 and hashlib.sha256(full.content).hexdigest() == sha256,
+        "etag_is_sha256": full.headers.get("etag") == etag,
+        "cache_control": full.headers.get("cache-control"),
+        "head": head.status_code == 200 and head.headers.get("content-length") == str(len(payload)) and not head.content,
+        "range": first_kb.status_code == 206
+        and first_kb.content == payload[:1024]
+        and first_kb.headers.get("content-range") == f"bytes 0-1023/{len(payload)}",
+        "suffix_range": suffix.status_code == 206 and suffix.content == payload[-500:],
+        "if_range_match": if_range.status_code == 206 and if_range.content == payload[100:200],
+        "if_range_stale": stale_if_range.status_code == 200 and len(stale_if_range.content) == len(payload),
+        "unsatisfiable": unsatisfiable.status_code,
+        "not_modified": not_modified.status_code == 304 and not not_modified.content,
+    }
+
+
+async def download_concurrently(
+    base_url: str,
+    token: str,
+    url: str,
+    pid: int,
+    args: argparse.Namespace,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    `concurrency` clientes baixando o mesmo arquivo `downloads` vezes no total
+    """
+    queue = iter(range(args.downloads))
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    received = 0
+    
+    async def worker():
+        nonlocal received
+        async with httpx.AsyncClient(
+            base_url=base_url,
+            timeout=120,
+            headers={"Authorization": f"Bearer {token}", **(headers or {})}
+        ) as client:
+            for _ in queue:
+                started = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                received += len(response.content)
+    
+    cpu_before = cpu_seconds(pid)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    cpu = cpu_seconds(pid) - cpu_before
+    mb = received / (1024 * 1024)
+    
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_sec": round(len(latencies) / elapsed, 1),
+        "mb_per_sec": round(mb / elapsed, 1),
+        "latency_ms": summarize(latencies, scale=1000),
+        "statuses": statuses,
+        "server_cpu_s": round(cpu, 2),
+        "server_cpu_ms_per_mb": round(cpu * 1000 / mb, 2) if mb else None,
+        "server_cpu_ms_per_request": round(cpu * 1000 / len(latencies), 2),
+    }
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Seed (tenant + dono) + servidor + upload do exame + protocolo + downloads concorrentes
+    """
+    from benchmarks.seed import seed_database
+    from app.core.database import engine
+    
+    seed_data = await seed_database(1, 1, seed=args.seed)
+    tenant = seed_data["tenants"][0]
+    rng = random.Random(args.seed)
+    payload = b"%PDF-1.7\n" + rng.randbytes(args.size_kb * 1024 - 9)
+    sha256 = hashlib.sha256(payload).hexdigest()
+    
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(database_url, port)
+    try:
+        await wait_for_server(base_url, process)
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            response = await login_as(client, tenant["owner_email"], tenant["slug"], seed_data["password"])
+            response.raise_for_status()
+            token = response.json()["access_token"]
+            client.headers["Authorization"] = f"Bearer {token}"
+            
+            response = await client.post("/api/v1/files/", params={"filename": "radiografia.pdf"}, content=payload)
+            response.raise_for_status()
+            url = f"/api/v1/files/{response.json()['id']}/content"
+            protocol = await check_protocol(client, url, payload, sha256)
+        
+        memory_before = peak_rss_kb(process.pid)
+        downloads = await download_concurrently(base_url, token, url, process.pid, args)
+        memory_after = peak_rss_kb(process.pid)
+        revalidations = await download_concurrently(
+            base_url, token, url, process.pid, args, headers={"If-None-Match": f'"{sha256}"'}
+        )
+    finally:
+        stop_server(process)
+    await engine.dispose()
+    
+    return {
+        "meta": run_metadata(
+            benchmark="download",
+            concurrency=args.concurrency,
+            downloads=args.downloads,
+            size_kb=args.size_kb,
+            database="embedded" if args.embedded else "external",
+        ),
+        "protocol": protocol,
+        "downloads": downloads,
+        "server_memory_kb": {
+            "peak_before": memory_before["VmHWM"],
+            "peak_after": memory_after["VmHWM"],
+            "peak_growth": memory_after["VmHWM"] - memory_before["VmHWM"],
+        },
+        "revalidations": revalidations,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de downloads do mesmo arquivo")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--downloads", type=int, default=300)
+    parser.add_argument("--size-kb", type=int, default=8192, help="Tamanho do exame baixado")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    with tempfile.TemporaryDirectory(prefix="hubb-uploads-") as upload_dir:
+        try:
+            database_url = embedded.url if embedded else args.database_url
+            # As configurações da app são lidas no import: definir antes de importar app.*
+            os.environ["DATABASE_URL"] = database_url
+            os.environ["DEBUG"] = "false"
+            os.environ["UPLOAD_DIR"] = upload_dir
+            report = asyncio.run(run(args, database_url))
+        finally:
+            if embedded:
+                embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Startup Import Benchmark
+Tempo de import de app.main (ou outro módulo) por módulo e por pacote, medido com
+`python -X importtime` em processos novos, com orçamento e baseline.
+
+Uso (a partir de backend/):
+    python -m benchmarks.import_bench                         # relatório no stdout
+    python -m benchmarks.import_bench --budget-ms 900         # exit 1 se o import passar do orçamento
+    python -m benchmarks.import_bench --check                 # compara com o baseline (exit 1 se regredir)
+    python -m benchmarks.import_bench --save-baseline --runs 9  # atualiza o baseline
+    python -m benchmarks.import_bench --target app.api.routes.auth --top 30
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import BACKEND_DIR, run_metadata, write_report
+from benchmarks.compare import compare_reports
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "startup.json")
+# Orçamento padrão do import de app.main (mediana de ~700-1050ms aqui, com folga para ruído de CI)
+DEFAULT_BUDGET_MS = 1500.0
+
+# "import time:      1234 |       5678 |     package.module"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """
+    Converter a saída de -X importtime em registros (self/cumulativo em µs, profundidade)
+    """
+    records = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            records.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    return records
+
+
+def import_once(target: str) -> Dict[str, Any]:
+    """
+    Importar `target` num interpretador novo e coletar os tempos
+    """
+    env = {**os.environ, "DEBUG": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    wall = time.perf_counter() - start
+    
+    if result.returncode != 0:
+        tail = "\n".join(line for line in result.stderr.splitlines() if not line.startswith("import time:"))
+        raise RuntimeError(f"Falha ao importar {target}:\n{tail[-2000:]}")
+    
+    return {"wall_ms": wall * 1000, "records": parse_importtime(result.stderr)}
+
+
+def _median_ms(values: List[float]) -> float:
+    return round(statistics.median(values) / 1000, 2)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Executar `runs` imports e agregar por mediana
+    """
+    runs = [import_once(args.target) for _ in range(args.runs)]
+    
+    target_cumulative = []
+    module_self: Dict[str, List[int]] = defaultdict(list)
+    module_cumulative: Dict[str, List[int]] = defaultdict(list)
+    package_self: Dict[str, List[int]] = defaultdict(list)
+    
+    for run_data in runs:
+        packages: Dict[str, int] = defaultdict(int)
+        for record in run_data["records"]:
+            module_self[record["module"]].append(record["self_us"])
+            module_cumulative[record["module"]].append(record["cumulative_us"])
+            packages[record["module"].split(".")[0]] += record["self_us"]
+            if record["module"] == args.target and record["depth"] == 0:
+                target_cumulative.append(record["cumulative_us"])
+        for package, self_us in packages.items():
+            package_self[package].append(self_us)
+    
+    # Pacotes: tempo próprio somado (o que cada dependência custa de fato)
+    packages = sorted(
+        ({"package": name, "import_ms": _median_ms(values)} for name, values in package_self.items()),
+        key=lambda row: row["import_ms"],
+        reverse=True
+    )[:args.top]
+    
+    modules = sorted(
+        (
+            {
+                "module": name,
+                "self_ms": _median_ms(module_self[name]),
+                "cumulative_ms": _median_ms(values),
+            }
+            for name, values in module_cumulative.items()
+        ),
+        key=lambda row: row["cumulative_ms"],
+        reverse=True
+    )
+    
+    return {
+        "meta": run_metadata(benchmark="startup_imports", target=args.target, runs=args.runs),
+        "results": {
+            "import": {"import_ms": _median_ms(target_cumulative)},
+            "process": {"import_ms": round(statistics.median(r["wall_ms"] for r in runs), 2)},
+        },
+        "packages": packages,
+        "app_modules": [row for row in modules if row["module"].split(".")[0] == "app"][:args.top],
+        "modules": modules[:args.top],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de import da aplicação por módulo")
+    parser.add_argument("--target", default="app.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+        help="Orçamento para o import do alvo (0 desativa)"
+    )
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Falhar se regredir além do limite")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Regressão tolerada (0.20 = 20%%)")
+    args = parser.parse_args(argv)
+    
+    if args.check and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline não encontrado: {args.baseline} (gere com --save-baseline)")
+    
+    report = run(args)
+    write_report(report, args.output)
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        write_report(report, args.baseline)
+    
+    failed = False
+    import_ms = report["results"]["import"]["import_ms"]
+    if args.budget_ms and import_ms > args.budget_ms:
+        print(f"ORÇAMENTO EXCEDIDO: import de {args.target} em {import_ms:.1f}ms > {args.budget_ms:.1f}ms", file=sys.stderr)
+        failed = True
+    
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, args.threshold, section="results")
+        for row in rows:
+            if row["regression"]:
+                print(
+                    f"REGRESSÃO {row['metric']}: {row['baseline']:.1f} -> {row['current']:.1f} "
+                    f"({row['change_pct']:+.1f}%)",
+                    file=sys.stderr
+                )
+                failed = True
+    
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+"""
+HTTP Load Test
+Sobe app.main:app contra um PostgreSQL local (ou embutido), popula dados sintéticos
+e executa cenários com concorrência configurável, gerando relatório JSON.
+
+Uso (a partir de backend/):
+    python -m benchmarks.load_test --embedded --concurrency 16 --duration 15 --output bench.json
+    python -m benchmarks.load_test --database-url postgresql://... --scenarios login,me
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, parse_server_timing, run_metadata, summarize, write_report
+from benchmarks.postgres import EmbeddedPostgres, free_port
+from benchmarks.seed import generate_cnpj
+
+
+Scenario = Callable[[httpx.AsyncClient, Dict[str, Any], random.Random], Awaitable[List[httpx.Response]]]
+
+_onboarding_counter = itertools.count()
+
+
+async def login_as(client: httpx.AsyncClient, email: str, slug: str, password: str) -> httpx.Response:
+    """
+    Login no formato email@tenant_slug
+    """
+    return await client.post(
+        "/api/v1/auth/login",
+        data={"username": f"{email}@{slug}", "password": password}
+    )
+
+
+async def scenario_login(client, ctx, rng) -> List[httpx.Response]:
+    tenant = rng.choice(ctx["seed"]["tenants"])
+    return [await login_as(client, tenant["owner_email"], tenant["slug"], ctx["seed"]["password"])]
+
+
+async def scenario_me(client, ctx, rng) -> List[httpx.Response]:
+    token = rng.choice(ctx["owner_tokens"])
+    return [await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})]
+
+
+async def scenario_list_users(client, ctx, rng) -> List[httpx.Response]:
+    token = rng.choice(ctx["owner_tokens"])
+    params = {"limit": 50}
+    if rng.random() < 0.5:
+        params["search"] = rng.choice(["Silva", "Souza", "user1", "Oliveira"])
+    return [await client.get(
+        "/api/v1/users/",
+        params=params,
+        headers={"Authorization": f"Bearer {token}"}
+    )]
+
+
+async def scenario_tenant_stats(client, ctx, rng) -> List[httpx.Response]:
+    tenant = rng.choice(ctx["seed"]["tenants"])
+    return [await client.get(
+        f"/api/v1/tenants/{tenant['id']}/stats",
+        headers={"Authorization": f"Bearer {ctx['admin_token']}"}
+    )]
+
+
+async def scenario_onboarding(client, ctx, rng) -> List[httpx.Response]:
+    n = next(_onboarding_counter)
+    step1 = await client.post("/api/v1/tenants/onboarding/step1", json={
+        "company_name": f"Clínica Onboarding {n}",
+        "cnpj": generate_cnpj(rng),
+        "email": f"contato{n}-{rng.randint(0, 10**9)}@onboarding.bench",
+        "phone": "11999990000",
+        "segment": "ODONTOLOGIA",
+    })
+    if step1.status_code >= 400:
+        return [step1]
+    
+    session_id = step1.json()["session_id"]
+    step2 = await client.post("/api/v1/tenants/onboarding/step2", json={
+        "session_id": session_id,
+        "cep": "01310-100",
+        "street": "Avenida Paulista",
+        "number": str(n),
+        "neighborhood": "Bela Vista",
+        "city": "São Paulo",
+        "state": "SP",
+    })
+    if step2.status_code >= 400:
+        return [step1, step2]
+    
+    step3 = await client.post("/api/v1/tenants/onboarding/step3", json={
+        "session_id": session_id,
+        "owner_name": f"Dono Onboarding {n}",
+        "owner_email": f"owner{n}@onboarding.bench",
+        "owner_password": "Bench123",
+    })
+    return [step1, step2, step3]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": scenario_login,
+    "me": scenario_me,
+    "list_users": scenario_list_users,
+    "tenant_stats": scenario_tenant_stats,
+    "onboarding": scenario_onboarding,
+}
+
+
+async def run_scenario(
+    name: str,
+    base_url: str,
+    ctx: Dict[str, Any],
+    concurrency: int,
+    duration: float,
+    seed: int
+) -> Dict[str, Any]:
+    """
+    Executar um cenário com N clientes concorrentes durante `duration` segundos
+    """
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    queries: List[int] = []
+    db_times: List[float] = []
+    status_counts: Counter = Counter()
+    failures = 0
+    transport_errors = 0
+    
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        
+        async def worker(worker_id: int):
+            nonlocal failures, transport_errors
+            rng = random.Random(seed * 1000 + worker_id)
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    responses = await scenario(client, ctx, rng)
+                except httpx.HTTPError:
+                    transport_errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+                
+                op_queries = 0
+                op_db_ms = 0.0
+                for response in responses:
+                    status_counts[response.status_code] += 1
+                    timing = parse_server_timing(response.headers.get("server-timing"))
+                    if timing:
+                        op_queries += timing["queries"]
+                        op_db_ms += timing["db_ms"]
+                queries.append(op_queries)
+                db_times.append(op_db_ms)
+                
+                if any(response.status_code >= 400 for response in responses):
+                    failures += 1
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "operations": len(latencies),
+        "failures": failures,
+        "transport_errors": transport_errors,
+        "status_counts": {str(code): count for code, count in sorted(status_counts.items())},
+        "throughput_ops": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": summarize(latencies, scale=1000),
+        "queries_per_op": summarize(queries),
+        "db_time_ms": summarize(db_times),
+    }
+
+
+async def prepare_context(base_url: str, seed_data: Dict[str, Any], token_pool: int) -> Dict[str, Any]:
+    """
+    Obter tokens de donos de clínica e do SUPER_ADMIN antes das medições
+    """
+    ctx: Dict[str, Any] = {"seed": seed_data, "owner_tokens": [], "admin_token": None}
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        for tenant in seed_data["tenants"][:token_pool]:
+            response = await login_as(client, tenant["owner_email"], tenant["slug"], seed_data["password"])
+            if response.status_code == 200:
+                ctx["owner_tokens"].append(response.json()["access_token"])
+        
+        admin = seed_data["super_admin"]
+        response = await login_as(client, admin["email"], admin["slug"], seed_data["password"])
+        if response.status_code == 200:
+            ctx["admin_token"] = response.json()["access_token"]
+    
+    return ctx
+
+
+def start_server(
+    database_url: str,
+    port: int,
+    extra_args: Optional[List[str]] = None,
+    command: Optional[List[str]] = None
+) -> subprocess.Popen:
+    """
+    Subir app.main:app com uvicorn (ou `command`, ex.: o launcher app.server) em subprocesso
+    """
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "DEBUG": "false",
+        "QUERY_STATS_ENABLED": "true",
+        "LOG_LEVEL": "WARNING",
+    }
+    if command is None:
+        command = [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning", "--no-access-log",
+        ]
+    return subprocess.Popen(
+        [*command, *(extra_args or [])],
+        cwd=BACKEND_DIR,
+        env=env
+    )
+
+
+async def wait_for_server(base_url: str, process: subprocess.Popen, timeout: float = 60.0) -> None:
+    """
+    Aguardar o servidor responder em /health
+    """
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=2) as client:
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"Servidor encerrou com código {process.returncode}")
+            try:
+                response = await client.get("/health")
+                if response.status_code < 500:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("Servidor não respondeu a tempo")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """
+    Encerrar o servidor graciosamente
+    """
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Seed + servidor + cenários
+    """
+    from benchmarks.seed import seed_database
+    
+    seed_data = await seed_database(args.tenants, args.users_per_tenant, seed=args.seed)
+    
+    port = args.port or free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(database_url, port)
+    try:
+        await wait_for_server(base_url, process)
+        ctx = await prepare_context(base_url, seed_data, token_pool=min(args.tenants, 50))
+        
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(
+                name, base_url, ctx, args.concurrency, args.duration, args.seed
+            )
+    finally:
+        stop_server(process)
+    
+    return {
+        "meta": run_metadata(
+            benchmark="http_load",
+            concurrency=args.concurrency,
+            duration_s=args.duration,
+            tenants=args.tenants,
+            users_per_tenant=args.users_per_tenant,
+            database="embedded" if args.embedded else "external",
+        ),
+        "scenarios": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test HTTP da API HUBB Assist")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--users-per-tenant", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por cenário")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=list(SCENARIOS))
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Cenários desconhecidos: {', '.join(sorted(unknown))}")
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args, database_url))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Onboarding Benchmark
+Fluxo completo de onboarding (passos 1, 2 e 3) com cadastros concorrentes, contra o
+launcher de produção e um ViaCEP substituto com latência configurável. Ao final confere
+no banco que nenhum cadastro ficou pela metade (tenant sem dono ou onboarding incompleto).
+
+Uso (a partir de backend/):
+    python -m benchmarks.onboarding_bench --embedded
+    python -m benchmarks.onboarding_bench --database-url postgresql://... --signups 500 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import BACKEND_DIR, run_metadata, summarize, write_report
+from benchmarks.load_test import start_server, stop_server, wait_for_server
+from benchmarks.postgres import EmbeddedPostgres, free_port
+from benchmarks.seed import generate_cnpj
+
+
+EMAIL_DOMAIN = "onboarding.bench"
+STEPS = ["step1", "step2", "step3"]
+
+
+async def signup(
+    client: httpx.AsyncClient,
+    n: int,
+    rng: random.Random,
+    ceps: List[str]
+) -> Dict[str, Any]:
+    """
+    Um cadastro completo; retorna a duração de cada passo e os status HTTP
+    """
+    payloads = {
+        "step1": {
+            "company_name": f"Clínica Bench {n}",
+            "cnpj": generate_cnpj(rng),
+            "email": f"contato{n}-{rng.randrange(10**9)}@{EMAIL_DOMAIN}",
+            "phone": "11999990000",
+            "segment": "ODONTOLOGIA",
+        },
+        "step2": {
+            "cep": rng.choice(ceps),
+            "street": "Rua Benchmark",
+            "number": str(n),
+            "neighborhood": "Centro",
+            "city": "São Paulo",
+            "state": "SP",
+        },
+        "step3": {
+            "owner_name": f"Dono Bench {n}",
+            "owner_email": f"owner{n}@{EMAIL_DOMAIN}",
+            "owner_password": "Bench123",
+        },
+    }
+    
+    timings: Dict[str, float] = {}
+    statuses: List[int] = []
+    session_id = None
+    for step in STEPS:
+        payload = payloads[step]
+        if session_id:
+            payload["session_id"] = session_id
+        
+        start = time.perf_counter()
+        response = await client.post(f"/api/v1/tenants/onboarding/{step}", json=payload)
+        timings[step] = time.perf_counter() - start
+        statuses.append(response.status_code)
+        if response.status_code >= 400:
+            break
+        if step == "step1":
+            session_id = response.json()["session_id"]
+    
+    return {"timings": timings, "statuses": statuses}
+
+
+async def run_signups(base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Executar `signups` cadastros com `concurrency` clientes simultâneos
+    """
+    rng = random.Random(args.seed)
+    # Sufixos até 998: o substituto trata CEPs terminados em 999 como inexistentes
+    ceps = [
+        f"{rng.randrange(1_000, 99_999):05d}{rng.randrange(999):03d}"
+        for _ in range(args.distinct_ceps)
+    ]
+    step_latencies: Dict[str, List[float]] = {step: [] for step in STEPS}
+    totals: List[float] = []
+    status_counts: Counter = Counter()
+    failures = 0
+    transport_errors = 0
+    
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for n in range(args.signups):
+        queue.put_nowait(n)
+    
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker(worker_id: int):
+            nonlocal failures, transport_errors
+            worker_rng = random.Random(args.seed * 1000 + worker_id)
+            while not queue.empty():
+                n = queue.get_nowait()
+                try:
+                    result = await signup(client, n, worker_rng, ceps)
+                except httpx.HTTPError:
+                    transport_errors += 1
+                    continue
+                
+                for step, duration in result["timings"].items():
+                    step_latencies[step].append(duration)
+                for code in result["statuses"]:
+                    status_counts[code] += 1
+                if len(result["statuses"]) < len(STEPS) or result["statuses"][-1] >= 400:
+                    failures += 1
+                else:
+                    totals.append(sum(result["timings"].values()))
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "signups": args.signups,
+        "completed": len(totals),
+        "failures": failures,
+        "transport_errors": transport_errors,
+        "status_counts": {str(code): count for code, count in sorted(status_counts.items())},
+        "throughput_signups": round(len(totals) / elapsed, 2) if elapsed else 0.0,
+        "latency_ms": {
+            **{step: summarize(values, scale=1000) for step, values in step_latencies.items()},
+            "total": summarize(totals, scale=1000),
+        },
+    }
+
+
+async def clean_previous_runs(email_domain: str = EMAIL_DOMAIN) -> None:
+    """
+    Remover tenants (e seus usuários) com email em `email_domain`, criados por execuções anteriores
+    """
+    from sqlalchemy import delete, select
+    
+    from app.core.database import AsyncSessionLocal, engine
+    from app.core.migrations import upgrade_database
+    from app.domain.models.tenant import Tenant
+    from app.domain.models.user import User
+    
+    await upgrade_database()
+    
+    async with AsyncSessionLocal() as session:
+        bench_tenants = select(Tenant.id).where(Tenant.email.like(f"%@{email_domain}"))
+        await session.execute(delete(User).where(User.tenant_id.in_(bench_tenants)))
+        await session.execute(delete(Tenant).where(Tenant.email.like(f"%@{email_domain}")))
+        await session.commit()
+    
+    await engine.dispose()
+
+
+async def check_integrity(email_domain: str = EMAIL_DOMAIN) -> Dict[str, int]:
+    """
+    Contar tenants do benchmark sem dono ou com onboarding incompleto (devem ser zero)
+    """
+    from sqlalchemy import and_, func, select
+    
+    from app.core.database import AsyncSessionLocal, engine
+    from app.domain.models.tenant import Tenant
+    from app.domain.models.user import User
+    
+    async with AsyncSessionLocal() as session:
+        owners = (
+            select(User.tenant_id, func.count(User.id).label("owners"))
+            .group_by(User.tenant_id)
+            .subquery()
+        )
+        rows = (await session.execute(
+            select(Tenant.onboarding_completed, Tenant.total_users, owners.c.owners)
+            .outerjoin(owners, owners.c.tenant_id == Tenant.id)
+            .where(Tenant.email.like(f"%@{email_domain}"))
+        )).all()
+        orphan_users = (await session.execute(
+            select(func.count(User.id)).outerjoin(Tenant, Tenant.id == User.tenant_id).where(
+                and_(User.email.like(f"%@{email_domain}"), Tenant.id.is_(None))
+            )
+        )).scalar() or 0
+    
+    await engine.dispose()
+    
+    return {
+        "tenants": len(rows),
+        "tenants_without_owner": sum(1 for row in rows if not row.owners),
+        "incomplete_onboarding": sum(1 for row in rows if not row.onboarding_completed),
+        "wrong_user_count": sum(1 for row in rows if row.total_users != (row.owners or 0)),
+        "orphan_users": orphan_users,
+    }
+
+
+def start_viacep_stub(port: int, latency_ms: float) -> subprocess.Popen:
+    """
+    Subir o ViaCEP substituto em subprocesso
+    """
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.viacep_stub",
+            "--port", str(port), "--latency-ms", str(latency_ms),
+        ],
+        cwd=BACKEND_DIR
+    )
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Limpeza + ViaCEP substituto + servidor + cadastros + conferência no banco
+    """
+    await clean_previous_runs()
+    
+    stub_port = free_port()
+    stub = start_viacep_stub(stub_port, args.viacep_latency_ms)
+    # O servidor herda o ambiente: CEPs vêm do substituto, sem índice offline
+    os.environ["VIACEP_API_URL"] = f"http://127.0.0.1:{stub_port}/ws"
+    os.environ["CEP_INDEX_PATH"] = ""
+    
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "app.server",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(args.workers),
+    ]
+    process = start_server(database_url, port, command=command)
+    try:
+        await wait_for_server(base_url, process)
+        results = await run_signups(base_url, args)
+    finally:
+        stop_server(process)
+        stop_server(stub)
+    
+    return {
+        "meta": run_metadata(
+            benchmark="onboarding",
+            signups=args.signups,
+            concurrency=args.concurrency,
+            workers=args.workers,
+            viacep_latency_ms=args.viacep_latency_ms,
+            distinct_ceps=args.distinct_ceps,
+            database="embedded" if args.embedded else "external",
+        ),
+        "results": results,
+        "integrity": await check_integrity(),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark do fluxo de onboarding com cadastros concorrentes")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Workers do launcher (sessões em memória exigem 1 sem REDIS_URL)"
+    )
+    parser.add_argument("--viacep-latency-ms", type=float, default=80.0)
+    parser.add_argument("--distinct-ceps", type=int, default=50, help="CEPs distintos sorteados no passo 2")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    if args.workers > 1 and not os.getenv("REDIS_URL"):
+        parser.error("--workers > 1 requer REDIS_URL (sessões de onboarding compartilhadas)")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args, database_url))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""
+Query Plan Check
+Executa cada consulta dos repositórios contra um banco populado (numa transação desfeita no final),
+captura o SQL emitido e roda EXPLAIN com os mesmos parâmetros. Falha (exit 1) se alguma consulta
+quente cair em Seq Scan: por padrão com enable_seqscan=off, que só escolhe Seq Scan quando nenhum
+índice serve, independentemente do tamanho das tabelas.
+
+Uso (a partir de backend/):
+    python -m benchmarks.plan_check --embedded
+    python -m benchmarks.plan_check --database-url postgresql://... --tenants 500 --users-per-tenant 20
+    python -m benchmarks.plan_check --embedded --planner-defaults   # custos reais do planner
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.postgres import EmbeddedPostgres
+
+
+def StorageLedgerRepository(db):
+    # Import tardio: app.* só depois de DATABASE_URL definido em main()
+    from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+    
+    return StorageLedgerRepository(db)
+
+
+def StoredFileRepository(db):
+    from app.infrastructure.repositories.file_repository import StoredFileRepository
+    
+    return StoredFileRepository(db)
+
+
+# (nome, quente, chamada): consultas frias (buscas textuais, rotinas administrativas raras) entram
+# no relatório mas não reprovam
+Case = Tuple[str, bool, Callable[[Any, Any, Any, Dict[str, Any]], Awaitable[Any]]]
+
+CASES: List[Case] = [
+    # UserRepository
+    ("users.get_by_id", True, lambda u, t, c, s: u.get_by_id(s["user_id"])),
+    ("users.get_by_email_and_tenant", True, lambda u, t, c, s: u.get_by_email_and_tenant(s["user_email"].upper(), s["tenant_id"])),
+    ("users.get_by_id_and_tenant", True, lambda u, t, c, s: u.get_by_id_and_tenant(s["user_id"], s["tenant_id"])),
+    ("users.get_users_by_tenant", True, lambda u, t, c, s: u.get_users_by_tenant(s["tenant_id"], limit=20)),
+    ("users.get_users_by_tenant[search]", False, lambda u, t, c, s: u.get_users_by_tenant(s["tenant_id"], search="silva")),
+    ("users.email_exists_in_tenant", True, lambda u, t, c, s: u.email_exists_in_tenant(s["user_email"], s["tenant_id"])),
+    ("users.find_existing_emails", True, lambda u, t, c, s: u.find_existing_emails(s["tenant_id"], [s["user_email"], "x@y.com"])),
+    ("users.count_by_tenant", True, lambda u, t, c, s: u.count_by_tenant(s["tenant_id"])),
+    ("users.count_active_by_tenant", True, lambda u, t, c, s: u.count_active_by_tenant(s["tenant_id"])),
+    ("users.update_refresh_token", True, lambda u, t, c, s: u.update_refresh_token(s["user_id"], "token")),
+    ("users.set_password_reset_token", True, lambda u, t, c, s: u.set_password_reset_token(s["user_id"], "reset")),
+    ("users.get_by_password_reset_token", True, lambda u, t, c, s: u.get_by_password_reset_token("reset")),
+    ("users.deactivate_user", True, lambda u, t, c, s: u.deactivate_user(s["user_id"])),
+    ("users.activate_user", True, lambda u, t, c, s: u.activate_user(s["user_id"])),
+    ("users.get_by_email", False, lambda u, t, c, s: u.get_by_email(s["user_email"])),
+    ("users.get_users_by_specialty", True, lambda u, t, c, s: u.get_users_by_specialty(s["tenant_id"], "ortodontia")),
+    ("users.get_super_admins", False, lambda u, t, c, s: u.get_super_admins()),
+    # TenantRepository
+    ("tenants.get_by_id", True, lambda u, t, c, s: t.get_by_id(s["tenant_id"])),
+    ("tenants.get_by_slug", True, lambda u, t, c, s: t.get_by_slug(s["slug"])),
+    ("tenants.get_by_email", True, lambda u, t, c, s: t.get_by_email(s["tenant_email"].upper())),
+    ("tenants.get_by_cnpj", True, lambda u, t, c, s: t.get_by_cnpj(s["cnpj"])),
+    ("tenants.slug_exists", True, lambda u, t, c, s: t.slug_exists(s["slug"], use_filter=False)),
+    ("tenants.email_exists", True, lambda u, t, c, s: t.email_exists(s["tenant_email"], use_filter=False)),
+    ("tenants.cnpj_exists", True, lambda u, t, c, s: t.cnpj_exists(s["cnpj"], use_filter=False)),
+    ("tenants.find_taken[slug]", True, lambda u, t, c, s: t.find_taken("slug", [s["slug"], "livre"], use_filter=False)),
+    ("tenants.find_taken[email]", True, lambda u, t, c, s: t.find_taken("email", [s["tenant_email"]], use_filter=False)),
+    ("tenants.find_taken[cnpj]", True, lambda u, t, c, s: t.find_taken("cnpj", [s["cnpj"]], use_filter=False)),
+    ("tenants.list_tenants", True, lambda u, t, c, s: t.list_tenants(limit=20)),
+    ("tenants.list_tenants[status]", True, lambda u, t, c, s: t.list_tenants(limit=20, status=s["status"])),
+    ("tenants.list_tenants[search]", False, lambda u, t, c, s: t.list_tenants(search="clínica")),
+    ("tenants.update_user_count", True, lambda u, t, c, s: t.update_user_count(s["tenant_id"])),
+    ("tenants.update_last_activity", True, lambda u, t, c, s: t.update_last_activity(s["tenant_id"])),
+    ("tenants.get_tenant_stats", True, lambda u, t, c, s: t.get_tenant_stats(s["tenant_id"])),
+    ("tenants.get_expiring_trials", True, lambda u, t, c, s: t.get_expiring_trials(days=7)),
+    ("tenants.get_tenants_with_module", True, lambda u, t, c, s: t.get_tenants_with_module("hubb_vision")),
+    ("tenants.get_tenants_by_specialty", True, lambda u, t, c, s: t.get_tenants_by_specialty("ortodontia")),
+    ("tenants.deactivate_tenant", True, lambda u, t, c, s: t.deactivate_tenant(s["tenant_id"])),
+    ("tenants.activate_tenant", True, lambda u, t, c, s: t.activate_tenant(s["tenant_id"])),
+    ("tenants.complete_onboarding", True, lambda u, t, c, s: t.complete_onboarding(s["tenant_id"])),
+    # CepCacheRepository
+    ("cep_cache.get", True, lambda u, t, c, s: c.get("01310100")),
+    ("cep_cache.get_many", True, lambda u, t, c, s: c.get_many(["01310100", "20040002"])),
+    # StorageLedgerRepository (mesma sessão dos demais)
+    ("storage.reserve", True, lambda u, t, c, s: StorageLedgerRepository(t.db).reserve(s["tenant_id"], 1024, "plan")),
+    ("storage.release", True, lambda u, t, c, s: StorageLedgerRepository(t.db).release(s["tenant_id"], 1024, "plan")),
+    ("storage.get_usage", True, lambda u, t, c, s: StorageLedgerRepository(t.db).get_usage(s["tenant_id"])),
+    ("storage.ledger_totals[tenant]", True, lambda u, t, c, s: StorageLedgerRepository(t.db).ledger_totals([s["tenant_id"]])),
+    # StoredFileRepository
+    ("files.get_by_id_and_tenant", True, lambda u, t, c, s: StoredFileRepository(t.db).get_by_id_and_tenant(1, s["tenant_id"])),
+    ("files.list_by_tenant", True, lambda u, t, c, s: StoredFileRepository(t.db).list_by_tenant(s["tenant_id"], limit=20)),
+    ("files.acquire_blob", True, lambda u, t, c, s: StoredFileRepository(t.db).acquire_blob("0" * 64, 1024, "application/pdf")),
+    ("files.release_blob", True, lambda u, t, c, s: StoredFileRepository(t.db).release_blob("0" * 64)),
+    ("files.lock_unreferenced_blobs", True, lambda u, t, c, s: StoredFileRepository(t.db).lock_unreferenced_blobs(100)),
+]
+
+
+def plan_nodes(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Nós do plano (EXPLAIN FORMAT JSON) em pré-ordem
+    """
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes.extend(plan_nodes(child))
+    return nodes
+
+
+def summarize(plan: Dict[str, Any]) -> Dict[str, Any]:
+    nodes = plan_nodes(plan)
+    return {
+        "nodes": [node["Node Type"] for node in nodes],
+        "indexes": sorted({node["Index Name"] for node in nodes if "Index Name" in node}),
+        "seq_scans": sorted({node["Relation Name"] for node in nodes if node["Node Type"] == "Seq Scan"}),
+        "total_cost": plan.get("Total Cost"),
+    }
+
+
+async def explain_cases(planner_defaults: bool) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Rodar cada caso numa sessão presa a uma transação externa (commits viram savepoints) e
+    explicar os statements capturados
+    """
+    from sqlalchemy import event, func, select, text
+    from sqlalchemy.ext.asyncio import AsyncSession
+    
+    from app.core.database import engine
+    from app.domain.models.tenant import Tenant
+    from app.domain.models.user import User
+    from app.infrastructure.repositories.cep_repository import CepCacheRepository
+    from app.infrastructure.repositories.tenant_repository import TenantRepository
+    from app.infrastructure.repositories.user_repository import UserRepository
+    
+    captured: List[Tuple[str, Any]] = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "INSERT")):
+            captured.append((statement, parameters))
+    
+    results = []
+    async with engine.connect() as conn:
+        await conn.execute(text("ANALYZE"))
+        await conn.commit()
+        
+        transaction = await conn.begin()
+        try:
+            session = AsyncSession(bind=conn, join_transaction_mode="create_savepoint", expire_on_commit=False)
+            user = (await session.execute(
+                select(User).where(User.role != "SUPER_ADMIN", User.cpf.isnot(None)).order_by(User.id).limit(1)
+            )).scalar_one()
+            tenant = await session.get(Tenant, user.tenant_id)
+            sample = {
+                "user_id": user.id,
+                "user_email": user.email,
+                "tenant_id": tenant.id,
+                "slug": tenant.slug,
+                "tenant_email": tenant.email,
+                "cnpj": tenant.cnpj,
+                "status": tenant.status,
+                "users": (await session.execute(select(func.count(User.id)))).scalar(),
+                "tenants": (await session.execute(select(func.count(Tenant.id)))).scalar(),
+            }
+            repos = (UserRepository(session), TenantRepository(session), CepCacheRepository(session))
+            
+            sync_engine = conn.sync_engine
+            for name, hot, call in CASES:
+                captured.clear()
+                event.listen(sync_engine, "before_cursor_execute", capture)
+                try:
+                    await call(*repos, sample)
+                finally:
+                    event.remove(sync_engine, "before_cursor_execute", capture)
+                statements = list(captured)
+                
+                plans = []
+                for statement, parameters in statements:
+                    if not planner_defaults:
+                        await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+                    explained = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+                    raw = explained.scalar()
+                    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+                    plans.append({"sql": " ".join(statement.split())[:200], **summarize(plan)})
+                    if not planner_defaults:
+                        await conn.exec_driver_sql("SET LOCAL enable_seqscan = on")
+                
+                seq_scans = sorted({table for plan in plans for table in plan["seq_scans"]})
+                results.append({
+                    "query": name,
+                    "hot": hot,
+                    "ok": not (hot and seq_scans),
+                    "seq_scans": seq_scans,
+                    "indexes": sorted({index for plan in plans for index in plan["indexes"]}),
+                    "statements": plans,
+                })
+            await session.close()
+        finally:
+            await transaction.rollback()
+    
+    return results, sample
+
+
+async def extra_indexes() -> List[str]:
+    """
+    Índices presentes no banco e ausentes dos modelos (ex.: criados à mão ou que uma migração
+    ainda não removeu)
+    """
+    from sqlalchemy import inspect
+    
+    from app.core.database import Base, engine
+    
+    def collect(sync_conn) -> List[str]:
+        inspector = inspect(sync_conn)
+        extra = []
+        for table in Base.metadata.sorted_tables:
+            declared = {index.name for index in table.indexes}
+            for index in inspector.get_indexes(table.name):
+                if index["name"] not in declared:
+                    extra.append(f"{table.name}.{index['name']}")
+        return extra
+    
+    async with engine.connect() as conn:
+        return await conn.run_sync(collect)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from benchmarks.seed import seed_database
+    from app.core.database import engine
+    from app.core.migrations import upgrade_database
+    
+    if args.skip_seed:
+        await upgrade_database()
+    else:
+        await seed_database(args.tenants, args.users_per_tenant, seed=args.seed)
+    
+    results, sample = await explain_cases(args.planner_defaults)
+    extra = await extra_indexes()
+    await engine.dispose()
+    
+    failures = [result["query"] for result in results if not result["ok"]]
+    return {
+        "meta": run_metadata(
+            benchmark="plan_check",
+            enable_seqscan=args.planner_defaults,
+            users=sample["users"],
+            tenants=sample["tenants"],
+        ),
+        "failures": failures,
+        "cold_seq_scans": [r["query"] for r in results if not r["hot"] and r["seq_scans"]],
+        "unused_db_indexes": extra,
+        "results": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="EXPLAIN das consultas dos repositórios")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--tenants", type=int, default=200)
+    parser.add_argument("--users-per-tenant", type=int, default=20)
+    parser.add_argument("--skip-seed", action="store_true", help="Usar os dados já existentes no banco")
+    parser.add_argument(
+        "--planner-defaults",
+        action="store_true",
+        help="Não desligar enable_seqscan (tabelas pequenas podem preferir Seq Scan)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+    for query in report["failures"]:
+        print(f"SEQ SCAN em consulta quente: {query}", file=sys.stderr)
+    return 1 if report["failures"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
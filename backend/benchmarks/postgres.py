@@ -0,0 +1,85 @@
+"""
+Embedded PostgreSQL
+Cluster PostgreSQL descartável (initdb/pg_ctl) para benchmarks sem banco externo
+"""
+
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+from typing import Optional
+
+
+def free_port() -> int:
+    """
+    Reservar uma porta TCP livre no loopback
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class EmbeddedPostgres:
+    """
+    Cluster temporário criado com os binários do PostgreSQL instalados no PATH
+    """
+    
+    def __init__(self, database: str = "hubb_assist_bench", port: Optional[int] = None):
+        self.database = database
+        self.port = port or free_port()
+        self.data_dir: Optional[str] = None
+    
+    @property
+    def url(self) -> str:
+        """URL de conexão asyncpg"""
+        return f"postgresql+asyncpg://postgres@127.0.0.1:{self.port}/{self.database}"
+    
+    def start(self) -> "EmbeddedPostgres":
+        """
+        Inicializar e subir o cluster
+        """
+        for binary in ("initdb", "pg_ctl", "createdb"):
+            if shutil.which(binary) is None:
+                raise RuntimeError(f"Binário '{binary}' do PostgreSQL não encontrado no PATH")
+        
+        self.data_dir = tempfile.mkdtemp(prefix="hubb-bench-pg-")
+        subprocess.run(
+            ["initdb", "-D", self.data_dir, "-U", "postgres", "--auth=trust", "--no-sync"],
+            check=True,
+            capture_output=True
+        )
+        subprocess.run(
+            [
+                "pg_ctl", "-D", self.data_dir, "-w", "-l", os.path.join(self.data_dir, "server.log"),
+                "-o", f"-p {self.port} -k {self.data_dir} -c listen_addresses=127.0.0.1 -c fsync=off",
+                "start",
+            ],
+            check=True,
+            capture_output=True
+        )
+        subprocess.run(
+            ["createdb", "-h", "127.0.0.1", "-p", str(self.port), "-U", "postgres", self.database],
+            check=True,
+            capture_output=True
+        )
+        return self
+    
+    def stop(self) -> None:
+        """
+        Derrubar o cluster e remover os dados
+        """
+        if not self.data_dir:
+            return
+        subprocess.run(
+            ["pg_ctl", "-D", self.data_dir, "-m", "fast", "-w", "stop"],
+            capture_output=True
+        )
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+        self.data_dir = None
+    
+    def __enter__(self) -> "EmbeddedPostgres":
+        return self.start()
+    
+    def __exit__(self, *exc) -> None:
+        self.stop()
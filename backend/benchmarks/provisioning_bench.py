@@ -0,0 +1,206 @@
+"""
+Provisioning Benchmark
+Envia um NDJSON de N clínicas ao endpoint de provisionamento em lote e mede throughput,
+tempo até o primeiro resultado e a distribuição de resultados por linha. O ViaCEP é substituído
+por benchmarks.viacep_stub; ao final confere no banco que não há cadastros pela metade.
+
+Uso (a partir de backend/):
+    python -m benchmarks.provisioning_bench --embedded
+    python -m benchmarks.provisioning_bench --database-url postgresql://... --tenants 2000 --password-ratio 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.load_test import login_as, start_server, stop_server, wait_for_server
+from benchmarks.onboarding_bench import check_integrity, clean_previous_runs, start_viacep_stub
+from benchmarks.postgres import EmbeddedPostgres, free_port
+from benchmarks.seed import generate_cnpj
+
+
+EMAIL_DOMAIN = "provisioning.bench"
+
+
+def build_payload(args: argparse.Namespace) -> bytes:
+    """
+    NDJSON sintético: parte das linhas com senha do dono e parte inválida (CNPJ incorreto)
+    """
+    rng = random.Random(args.seed)
+    ceps = [
+        f"{rng.randrange(1_000, 99_999):05d}{rng.randrange(999):03d}"
+        for _ in range(args.distinct_ceps)
+    ]
+    lines = []
+    for n in range(args.tenants):
+        row = {
+            "ref": f"reseller-{n}",
+            "company_name": f"Clínica Lote {n}",
+            "cnpj": generate_cnpj(rng),
+            "email": f"contato{n}-{rng.randrange(10**9)}@{EMAIL_DOMAIN}",
+            "phone": "11999990000",
+            "cep": rng.choice(ceps),
+            "street": "Rua Lote",
+            "number": str(n),
+            "neighborhood": "Centro",
+            "city": "São Paulo",
+            "state": "SP",
+            "owner_name": f"Dono Lote {n}",
+            "owner_email": f"owner{n}@{EMAIL_DOMAIN}",
+        }
+        if rng.random() < args.password_ratio:
+            row["owner_password"] = "Bench123"
+        if rng.random() < args.invalid_ratio:
+            row["cnpj"] = "11.111.111/1111-11"
+        lines.append(json.dumps(row, ensure_ascii=False))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def provision(base_url: str, token: str, payload: bytes) -> Dict[str, Any]:
+    """
+    Enviar o lote e consumir o stream de resultados
+    """
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    summary = None
+    first_result_s = None
+    
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        started = time.perf_counter()
+        async with client.stream(
+            "POST",
+            "/api/v1/tenants/provisioning",
+            content=payload,
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "application/x-ndjson"},
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise RuntimeError(f"Provisionamento falhou: {response.status_code} {response.text}")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                if first_result_s is None:
+                    first_result_s = time.perf_counter() - started
+                result = json.loads(line)
+                if result["status"] == "summary":
+                    summary = result
+                    continue
+                statuses[result["status"]] += 1
+                if result["status"] == "error":
+                    errors[result["error"]] += 1
+        elapsed = time.perf_counter() - started
+    
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "first_result_ms": round((first_result_s or 0) * 1000, 1),
+        "throughput_tenants": round(statuses["created"] / elapsed, 1) if elapsed else 0.0,
+        "statuses": dict(statuses),
+        "errors": dict(errors.most_common(10)),
+        "server_summary": summary,
+    }
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Seed (SUPER_ADMIN) + ViaCEP substituto + servidor + envio do lote + conferência no banco
+    """
+    from benchmarks.seed import seed_database
+    
+    seed_data = await seed_database(1, 1, seed=args.seed)
+    await clean_previous_runs(EMAIL_DOMAIN)
+    payload = build_payload(args)
+    
+    stub_port = free_port()
+    stub = start_viacep_stub(stub_port, args.viacep_latency_ms)
+    os.environ["VIACEP_API_URL"] = f"http://127.0.0.1:{stub_port}/ws"
+    os.environ["CEP_INDEX_PATH"] = ""
+    os.environ["PROVISIONING_BATCH_SIZE"] = str(args.batch_size)
+    
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "app.server",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", "1",
+    ]
+    process = start_server(database_url, port, command=command)
+    try:
+        await wait_for_server(base_url, process)
+        admin = seed_data["super_admin"]
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            response = await login_as(client, admin["email"], admin["slug"], seed_data["password"])
+            response.raise_for_status()
+            token = response.json()["access_token"]
+        results = await provision(base_url, token, payload)
+    finally:
+        stop_server(process)
+        stop_server(stub)
+    
+    return {
+        "meta": run_metadata(
+            benchmark="provisioning",
+            tenants=args.tenants,
+            batch_size=args.batch_size,
+            password_ratio=args.password_ratio,
+            invalid_ratio=args.invalid_ratio,
+            viacep_latency_ms=args.viacep_latency_ms,
+            distinct_ceps=args.distinct_ceps,
+            payload_kb=round(len(payload) / 1024, 1),
+            database="embedded" if args.embedded else "external",
+        ),
+        "results": results,
+        "integrity": await check_integrity(EMAIL_DOMAIN),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark do provisionamento de tenants em lote")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument(
+        "--password-ratio",
+        type=float,
+        default=0.0,
+        help="Fração de donos com senha (bcrypt); os demais recebem convite"
+    )
+    parser.add_argument("--invalid-ratio", type=float, default=0.02, help="Fração de linhas com CNPJ inválido")
+    parser.add_argument("--viacep-latency-ms", type=float, default=80.0)
+    parser.add_argument("--distinct-ceps", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args, database_url))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
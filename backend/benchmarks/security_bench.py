@@ -0,0 +1,286 @@
+"""
+Security Microbenchmarks
+Custo das primitivas de app.core.security (JWT por algoritmo, bcrypt por rounds, slug, CPF/CNPJ)
+com baseline armazenado e limites de regressão.
+
+Uso (a partir de backend/):
+    python -m benchmarks.security_bench                      # relatório no stdout
+    python -m benchmarks.security_bench --check              # compara com o baseline (exit 1 se regredir)
+    python -m benchmarks.security_bench --save-baseline      # atualiza o baseline
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.compare import compare_reports
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "security.json")
+
+HMAC_ALGORITHMS = ["HS256", "HS384", "HS512"]
+ASYMMETRIC_ALGORITHMS = ["RS256", "ES256"]
+BCRYPT_ROUNDS = [4, 8, 10, 12]
+
+SAMPLE_CPF = "529.982.247-25"
+SAMPLE_CNPJ = "11.222.333/0001-81"
+SAMPLE_PAYLOAD = {"sub": "42", "tenant_id": 7, "role": "DENTISTA"}
+
+
+def measure(fn: Callable[[], Any], min_time: float = 0.2, repeat: int = 5) -> Dict[str, float]:
+    """
+    Medir custo por operação: calibra o número de iterações para durar
+    `min_time` e usa a mediana de `repeat` rodadas
+    """
+    fn()  # aquecimento
+    
+    iterations = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        iterations = max(iterations * 2, int(iterations * min_time / max(elapsed, 1e-9)))
+    
+    rounds = [elapsed / iterations]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        rounds.append((time.perf_counter() - start) / iterations)
+    
+    per_op = statistics.median(rounds)
+    return {
+        "us_per_op": round(per_op * 1e6, 3),
+        "ops_per_sec": round(1 / per_op, 1),
+        "iterations": iterations,
+    }
+
+
+def _asymmetric_keys(algorithm: str):
+    """
+    Gerar par de chaves PEM para RS256/ES256
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, rsa
+    
+    if algorithm.startswith("RS"):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private_key = ec.generate_private_key(ec.SECP256R1())
+    
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    return private_pem, public_pem
+
+
+def bench_jwt(min_time: float) -> Dict[str, Dict[str, float]]:
+    """
+    create_access_token / verify_token para cada algoritmo HMAC suportado pelas
+    configurações, e encode/decode direto do jose para algoritmos assimétricos
+    """
+    from jose import jwt
+    
+    from app.core.config import settings
+    from app.core.security import create_access_token, verify_token
+    
+    results = {}
+    original_algorithm = settings.ALGORITHM
+    try:
+        for algorithm in HMAC_ALGORITHMS:
+            settings.ALGORITHM = algorithm
+            token = create_access_token(SAMPLE_PAYLOAD)
+            results[f"create_access_token[{algorithm}]"] = measure(
+                lambda: create_access_token(SAMPLE_PAYLOAD), min_time
+            )
+            results[f"verify_token[{algorithm}]"] = measure(
+                lambda: verify_token(token, "access"), min_time
+            )
+    finally:
+        settings.ALGORITHM = original_algorithm
+    
+    for algorithm in ASYMMETRIC_ALGORITHMS:
+        try:
+            private_pem, public_pem = _asymmetric_keys(algorithm)
+        except ImportError:
+            continue
+        token = jwt.encode(SAMPLE_PAYLOAD, private_pem, algorithm=algorithm)
+        results[f"jwt.encode[{algorithm}]"] = measure(
+            lambda: jwt.encode(SAMPLE_PAYLOAD, private_pem, algorithm=algorithm), min_time
+        )
+        results[f"jwt.decode[{algorithm}]"] = measure(
+            lambda: jwt.decode(token, public_pem, algorithms=[algorithm]), min_time
+        )
+    
+    return results
+
+
+def bench_bcrypt(rounds_list: List[int]) -> Dict[str, Dict[str, float]]:
+    """
+    Custo de hash e verificação bcrypt por configuração de rounds
+    """
+    from passlib.context import CryptContext
+    
+    from app.core.security import get_password_hash, verify_password
+    
+    results = {}
+    for rounds in rounds_list:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        hashed = context.hash("Senha123")
+        # Rounds altos levam centenas de ms: poucas repetições bastam
+        results[f"bcrypt.hash[rounds={rounds}]"] = measure(
+            lambda: context.hash("Senha123"), min_time=0.05, repeat=3
+        )
+        results[f"bcrypt.verify[rounds={rounds}]"] = measure(
+            lambda: context.verify("Senha123", hashed), min_time=0.05, repeat=3
+        )
+    
+    hashed = get_password_hash("Senha123")
+    results["get_password_hash"] = measure(lambda: get_password_hash("Senha123"), min_time=0.05, repeat=3)
+    results["verify_password"] = measure(lambda: verify_password("Senha123", hashed), min_time=0.05, repeat=3)
+    return results
+
+
+def bench_helpers(min_time: float) -> Dict[str, Dict[str, float]]:
+    """
+    Slug de tenant e validação de documentos
+    """
+    from app.core.security import generate_tenant_slug, validate_cnpj, validate_cpf
+    
+    return {
+        "generate_tenant_slug": measure(lambda: generate_tenant_slug("Clínica Odontológica São José"), min_time),
+        "validate_cpf": measure(lambda: validate_cpf(SAMPLE_CPF), min_time),
+        "validate_cnpj": measure(lambda: validate_cnpj(SAMPLE_CNPJ), min_time),
+    }
+
+
+def bench_documents(min_time: float, batch_size: int) -> Dict[str, Dict[str, float]]:
+    """
+    Validação de CPF/CNPJ em lote (app.core.documents) vs escalar, custo por documento; confere
+    que os dois caminhos concordam em todos os documentos do lote
+    """
+    import random
+    
+    from app.core.documents import VECTORIZED, validate_cnpjs, validate_cpfs
+    from app.core.security import validate_cnpj, validate_cpf
+    from benchmarks.seed import generate_cnpj, generate_cpf
+    
+    rng = random.Random(42)
+    results = {}
+    for name, generate, validate_many, validate in (
+        ("cpf", generate_cpf, validate_cpfs, validate_cpf),
+        ("cnpj", generate_cnpj, validate_cnpjs, validate_cnpj),
+    ):
+        # Metade válida, metade com o último dígito trocado
+        documents = [generate(rng) for _ in range(batch_size)]
+        documents = [d if i % 2 else d[:-1] + str((int(d[-1]) + 1) % 10) for i, d in enumerate(documents)]
+        if validate_many(documents) != [validate(d) for d in documents]:
+            raise AssertionError(f"validate_{name}s diverge de validate_{name}")
+        
+        for label, fn in (
+            (f"validate_{name}s[batch={batch_size}]", lambda: validate_many(documents)),
+            (f"validate_{name}[loop={batch_size}]", lambda: [validate(d) for d in documents]),
+        ):
+            timing = measure(fn, min_time, repeat=3)
+            # Por documento, para comparar lote e laço na mesma unidade
+            results[label] = {
+                "ns_per_op": round(timing["us_per_op"] * 1000 / batch_size, 1),
+                "ops_per_sec": round(batch_size / timing["us_per_op"] * 1e6, 1),
+                "vectorized": VECTORIZED,
+            }
+    return results
+
+
+def bench_permissions(min_time: float) -> Dict[str, Dict[str, float]]:
+    """
+    Autorização: pertinência em lista de roles (require_role) vs máscara compilada
+    (require_permissions), com e sem exceções por usuário
+    """
+    from app.core.permissions import Permission, compile_permissions, has_permissions
+    from app.domain.models.user import UserRole
+    
+    admin_roles = [UserRole.SUPER_ADMIN, UserRole.ADMIN_MASTER, UserRole.DONO_CLINICA]
+    role = UserRole.FINANCEIRO
+    overrides = {"users_read": True, "financial_read": False}
+    mask = compile_permissions(role, overrides)
+    
+    return {
+        "role_in_list": measure(lambda: role in admin_roles, min_time),
+        "has_permissions[compiled]": measure(lambda: has_permissions(mask, Permission.USERS_MANAGE), min_time),
+        "compile_permissions[role]": measure(lambda: compile_permissions(role), min_time),
+        "compile_permissions[overrides]": measure(lambda: compile_permissions(role, overrides), min_time),
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, Dict[str, float]] = {}
+    if "jwt" in args.groups:
+        results.update(bench_jwt(args.min_time))
+    if "bcrypt" in args.groups:
+        results.update(bench_bcrypt(args.bcrypt_rounds))
+    if "helpers" in args.groups:
+        results.update(bench_helpers(args.min_time))
+    if "documents" in args.groups:
+        results.update(bench_documents(args.min_time, args.document_batch))
+    if "permissions" in args.groups:
+        results.update(bench_permissions(args.min_time))
+    
+    return {
+        "meta": run_metadata(benchmark="security", min_time_s=args.min_time),
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks de app.core.security")
+    parser.add_argument("--groups", type=lambda v: v.split(","), default=["jwt", "bcrypt", "helpers", "documents", "permissions"])
+    parser.add_argument("--bcrypt-rounds", type=lambda v: [int(r) for r in v.split(",")], default=BCRYPT_ROUNDS)
+    parser.add_argument("--document-batch", type=int, default=100000, help="Documentos por lote (grupo documents)")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Segundos mínimos por rodada")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="Falhar se regredir além do limite")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Regressão tolerada (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+    
+    report = run(args)
+    write_report(report, args.output)
+    
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        write_report(report, args.baseline)
+    
+    if args.check:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare_reports(baseline, report, args.threshold, section="results")
+        regressions = [row for row in rows if row["regression"]]
+        for row in regressions:
+            print(
+                f"REGRESSÃO {row['metric']}: {row['baseline']:.3f} -> {row['current']:.3f} "
+                f"({row['change_pct']:+.1f}%)",
+                file=sys.stderr
+            )
+        if regressions:
+            return 1
+    
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
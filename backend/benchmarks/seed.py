@@ -0,0 +1,169 @@
+"""
+Synthetic Seed Data
+Geração de tenants e usuários sintéticos para benchmarks
+"""
+
+import random
+from typing import Any, Dict, List
+
+
+BENCH_PASSWORD = "Bench123"
+BENCH_SLUG_PREFIX = "bench-"
+BENCH_MODULES = ["hubb_hof", "hubb_vision", "hubb_rh", "hubb_ia"]
+BENCH_SPECIALTIES = ["ortodontia", "implantodontia", "endodontia", "periodontia", "harmonizacao"]
+
+
+def generate_cnpj(rng: random.Random) -> str:
+    """
+    Gerar CNPJ válido (apenas dígitos)
+    """
+    digits = [rng.randint(0, 9) for _ in range(8)] + [0, 0, 0, 1]
+    for weights in ([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]):
+        remainder = sum(d * w for d, w in zip(digits, weights)) % 11
+        digits.append(0 if remainder < 2 else 11 - remainder)
+    return "".join(str(d) for d in digits)
+
+
+def generate_cpf(rng: random.Random) -> str:
+    """
+    Gerar CPF válido (apenas dígitos)
+    """
+    digits = [rng.randint(0, 9) for _ in range(9)]
+    for start in (10, 11):
+        remainder = sum(d * w for d, w in zip(digits, range(start, 1, -1))) % 11
+        digits.append(0 if remainder < 2 else 11 - remainder)
+    return "".join(str(d) for d in digits)
+
+
+def _tenant_row(index: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "slug": f"{BENCH_SLUG_PREFIX}{index}",
+        "company_name": f"Clínica Benchmark {index}",
+        "cnpj": generate_cnpj(rng),
+        "cep": "01310-100",
+        "street": "Avenida Paulista",
+        "number": str(index),
+        "neighborhood": "Bela Vista",
+        "city": "São Paulo",
+        "state": "SP",
+        "email": f"contato@{BENCH_SLUG_PREFIX}{index}.com",
+        "phone": "11999990000",
+        "max_users": 100000,
+        "is_active": True,
+        "modules_enabled": {module: rng.random() < 0.5 for module in BENCH_MODULES},
+        "specialties": rng.sample(BENCH_SPECIALTIES, 2),
+    }
+
+
+async def seed_database(tenants: int, users_per_tenant: int, seed: int = 42) -> Dict[str, Any]:
+    """
+    Aplicar as migrações e popular tenants/usuários sintéticos (remove seeds anteriores)
+
+    Cada tenant recebe um DONO_CLINICA (owner@...) e usuários ASSISTENTE;
+    um tenant de plataforma recebe o SUPER_ADMIN usado nas rotas administrativas.
+    """
+    from sqlalchemy import delete, func, insert, select, update
+    
+    from app.core.database import AsyncSessionLocal, engine
+    from app.core.migrations import upgrade_database
+    from app.core.security import get_password_hash
+    from app.domain.models.storage import StorageLedgerEntry, StoredBlob, StoredFile
+    from app.domain.models.tenant import Tenant, TenantStatus
+    from app.domain.models.user import User, UserRole
+    
+    rng = random.Random(seed)
+    
+    await upgrade_database()
+    
+    hashed_password = get_password_hash(BENCH_PASSWORD)
+    
+    async with AsyncSessionLocal() as session:
+        bench_tenants = select(Tenant.id).where(Tenant.slug.like(f"{BENCH_SLUG_PREFIX}%"))
+        # Arquivos dos tenants de benchmark: descontar as referências aos conteúdos antes de remover
+        bench_refs = (
+            select(StoredFile.sha256, func.count().label("refs"))
+            .where(StoredFile.tenant_id.in_(bench_tenants))
+            .group_by(StoredFile.sha256)
+            .subquery()
+        )
+        await session.execute(
+            update(StoredBlob)
+            .where(StoredBlob.sha256 == bench_refs.c.sha256)
+            .values(ref_count=StoredBlob.ref_count - bench_refs.c.refs)
+        )
+        await session.execute(delete(StoredFile).where(StoredFile.tenant_id.in_(bench_tenants)))
+        await session.execute(delete(User).where(User.tenant_id.in_(bench_tenants)))
+        await session.execute(delete(StorageLedgerEntry).where(StorageLedgerEntry.tenant_id.in_(bench_tenants)))
+        await session.execute(delete(Tenant).where(Tenant.slug.like(f"{BENCH_SLUG_PREFIX}%")))
+        
+        tenant_rows = [_tenant_row(i, rng) for i in range(tenants)]
+        platform_row = _tenant_row(tenants, rng)
+        platform_row["slug"] = f"{BENCH_SLUG_PREFIX}platform"
+        for row in tenant_rows + [platform_row]:
+            row["status"] = TenantStatus.ACTIVE
+        
+        # CNPJ é único: não repetir os de tenants que não são deste seed (outros benchmarks usam
+        # o mesmo gerador e a mesma semente)
+        while True:
+            cnpjs = [row["cnpj"] for row in tenant_rows + [platform_row]]
+            taken = set((await session.execute(
+                select(Tenant.cnpj_normalized).where(Tenant.cnpj_normalized.in_(cnpjs))
+            )).scalars().all())
+            if not taken:
+                break
+            for row in tenant_rows + [platform_row]:
+                if row["cnpj"] in taken:
+                    row["cnpj"] = generate_cnpj(rng)
+        
+        result = await session.execute(
+            insert(Tenant).returning(Tenant.id, Tenant.slug),
+            tenant_rows + [platform_row]
+        )
+        created = result.all()
+        
+        user_rows: List[Dict[str, Any]] = []
+        seeded_tenants = []
+        for tenant_id, slug in created[:-1]:
+            owner_email = f"owner@{slug}.com"
+            user_rows.append({
+                "email": owner_email,
+                "full_name": f"Dono {slug}",
+                "hashed_password": hashed_password,
+                "tenant_id": tenant_id,
+                "role": UserRole.DONO_CLINICA,
+                "cpf": generate_cpf(rng),
+            })
+            for j in range(users_per_tenant - 1):
+                user_rows.append({
+                    "email": f"user{j}@{slug}.com",
+                    "full_name": f"Usuário {j} {rng.choice(['Silva', 'Souza', 'Oliveira', 'Santos'])}",
+                    "hashed_password": hashed_password,
+                    "tenant_id": tenant_id,
+                    "role": UserRole.ASSISTENTE,
+                    "phone": f"1198888{j:04d}",
+                    "specialties": rng.sample(BENCH_SPECIALTIES, 1),
+                })
+            seeded_tenants.append({"id": tenant_id, "slug": slug, "owner_email": owner_email})
+        
+        platform_id, platform_slug = created[-1]
+        super_admin_email = f"admin@{platform_slug}.com"
+        user_rows.append({
+            "email": super_admin_email,
+            "full_name": "Super Admin Benchmark",
+            "hashed_password": hashed_password,
+            "tenant_id": platform_id,
+            "role": UserRole.SUPER_ADMIN,
+        })
+        
+        await session.execute(insert(User), user_rows)
+        await session.commit()
+    
+    # Conexões do pool ficam presas ao event loop atual
+    await engine.dispose()
+    
+    return {
+        "password": BENCH_PASSWORD,
+        "tenants": seeded_tenants,
+        "super_admin": {"email": super_admin_email, "slug": platform_slug},
+        "total_users": len(user_rows),
+    }
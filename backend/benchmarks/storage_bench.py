@@ -0,0 +1,196 @@
+"""
+Storage Quota Benchmark
+Reservas de armazenamento concorrentes contra um tenant com cota pequena: mede reservas/s e
+latência, confere que o total nunca passa da cota e que bate com a soma do livro-razão; depois
+força divergências e confere que a reconciliação as corrige.
+
+Uso (a partir de backend/):
+    python -m benchmarks.storage_bench --embedded
+    python -m benchmarks.storage_bench --database-url postgresql://... --concurrency 32 --reservations 5000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.postgres import EmbeddedPostgres
+
+
+async def reserve_concurrently(tenant_id: int, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    `concurrency` tarefas, cada uma com sua sessão, reservando arquivos de tamanho aleatório
+    até completar `reservations` tentativas
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.application.services.storage_service import StorageQuotaExceeded, StorageService
+    from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+    
+    rng = random.Random(args.seed)
+    sizes = [rng.randint(args.min_size_kb, args.max_size_kb) * 1024 for _ in range(args.reservations)]
+    queue = iter(enumerate(sizes))
+    latencies: List[float] = []
+    accepted = {"count": 0, "bytes": 0}
+    rejected = 0
+    
+    async def worker():
+        nonlocal rejected
+        async with AsyncSessionLocal() as session:
+            service = StorageService(StorageLedgerRepository(session))
+            for n, size in queue:
+                started = time.perf_counter()
+                try:
+                    await service.reserve(tenant_id, size, f"bench/{n}")
+                    await session.commit()
+                    accepted["count"] += 1
+                    accepted["bytes"] += size
+                except StorageQuotaExceeded:
+                    await session.rollback()
+                    rejected += 1
+                latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "reservations_per_sec": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(statistics.median(latencies) * 1000, 2),
+            "p95": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+        },
+        "accepted": accepted["count"],
+        "accepted_bytes": accepted["bytes"],
+        "rejected": rejected,
+    }
+
+
+async def check_consistency(tenant_id: int, accepted_bytes: int) -> Dict[str, Any]:
+    """
+    Total corrente dentro da cota, igual à soma do livro-razão e às reservas aceitas
+    """
+    from app.core.database import AsyncSessionLocal
+    from app.infrastructure.repositories.storage_repository import StorageLedgerRepository
+    
+    async with AsyncSessionLocal() as session:
+        repo = StorageLedgerRepository(session)
+        usage = await repo.get_usage(tenant_id)
+        ledger = (await repo.ledger_totals([tenant_id])).get(tenant_id, 0)
+    return {
+        "used_bytes": usage["used_bytes"],
+        "quota_bytes": usage["quota_bytes"],
+        "within_quota": usage["used_bytes"] <= usage["quota_bytes"],
+        "matches_ledger": usage["used_bytes"] == ledger,
+        "matches_accepted": usage["used_bytes"] == accepted_bytes,
+    }
+
+
+async def check_reconciliation(tenant_ids: List[int]) -> Dict[str, Any]:
+    """
+    Desalinhar totais por fora do repositório e reconciliar
+    """
+    from sqlalchemy import update
+    
+    from app.core.database import AsyncSessionLocal
+    from app.domain.models.tenant import Tenant
+    from app.application.services.storage_service import reconcile_storage
+    
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Tenant)
+            .where(Tenant.id.in_(tenant_ids))
+            .values(storage_used_bytes=Tenant.storage_used_bytes + 12345)
+        )
+        await session.commit()
+    
+    started = time.perf_counter()
+    fixed = await reconcile_storage() or {}
+    elapsed = time.perf_counter() - started
+    return {
+        "drifted": len(tenant_ids),
+        "fixed": len(set(fixed) & set(tenant_ids)),
+        "elapsed_ms": round(elapsed * 1000, 1),
+    }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from sqlalchemy import update
+    
+    from benchmarks.seed import seed_database
+    from app.core.database import AsyncSessionLocal, engine
+    from app.domain.models.tenant import Tenant
+    
+    seed_data = await seed_database(args.tenants, 1, seed=args.seed)
+    tenant_ids = [tenant["id"] for tenant in seed_data["tenants"]]
+    tenant_id = tenant_ids[0]
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Tenant).where(Tenant.id == tenant_id).values(max_storage_gb=args.quota_gb)
+        )
+        await session.commit()
+    
+    results = await reserve_concurrently(tenant_id, args)
+    consistency = await check_consistency(tenant_id, results["accepted_bytes"])
+    reconciliation = await check_reconciliation(tenant_ids)
+    await engine.dispose()
+    
+    return {
+        "meta": run_metadata(
+            benchmark="storage",
+            concurrency=args.concurrency,
+            reservations=args.reservations,
+            quota_gb=args.quota_gb,
+            size_kb=[args.min_size_kb, args.max_size_kb],
+            database="embedded" if args.embedded else "external",
+        ),
+        "results": results,
+        "consistency": consistency,
+        "reconciliation": reconciliation,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark das reservas de cota de armazenamento")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--tenants", type=int, default=50, help="Tenants desalinhados na reconciliação")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--reservations", type=int, default=2000)
+    parser.add_argument("--quota-gb", type=int, default=1)
+    parser.add_argument("--min-size-kb", type=int, default=100)
+    parser.add_argument("--max-size-kb", type=int, default=2048)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Upload Benchmark
+Uploads concorrentes de arquivos grandes, de vários tenants, para o endpoint de arquivos: mede MB/s,
+latência e o pico de memória do servidor (VmHWM), confere o SHA-256 devolvido, os conteúdos gravados,
+a contagem de referências e o uso de cota, e mede a economia de disco da deduplicação (conteúdos
+repetidos entre arquivos e tenants). Depois confere as recusas (413 pelo Content-Length sem ler o
+corpo, 413 no meio do stream e 415 pelo tipo real do arquivo) e a remoção dos arquivos de um tenant.
+
+Uso (a partir de backend/):
+    python -m benchmarks.upload_bench --embedded
+    python -m benchmarks.upload_bench --database-url postgresql://... --concurrency 16 --uploads 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import tempfile
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import run_metadata, summarize, write_report
+from benchmarks.load_test import login_as, start_server, stop_server, wait_for_server
+from benchmarks.postgres import EmbeddedPostgres, free_port
+
+
+def build_payloads(args: argparse.Namespace) -> List[bytes]:
+    """
+    PDFs sintéticos (assinatura + bytes aleatórios) de tamanhos variados
+    """
+    rng = random.Random(args.seed)
+    payloads = []
+    for _ in range(args.distinct):
+        size = rng.randint(args.min_size_kb, args.max_size_kb) * 1024
+        payloads.append(b"%PDF-1.7\n" + rng.randbytes(size - 9))
+    return payloads
+
+
+def peak_rss_kb(pid: int) -> Dict[str, int]:
+    """
+    Memória residente atual e de pico do processo (/proc, Linux)
+    """
+    values = {}
+    with open(f"/proc/{pid}/status") as status_file:
+        for line in status_file:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(value.split()[0])
+    return values
+
+
+async def chunked(payload: bytes, chunk_size: int) -> AsyncIterator[bytes]:
+    for start in range(0, len(payload), chunk_size):
+        yield payload[start:start + chunk_size]
+
+
+async def upload_concurrently(base_url: str, tokens: List[str], payloads: List[bytes], args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    `concurrency` clientes enviando `uploads` arquivos no total, alternando entre os tenants
+    """
+    hashes = [hashlib.sha256(payload).hexdigest() for payload in payloads]
+    queue = iter(range(args.uploads))
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    uploaded = 0
+    sent_bytes = 0
+    mismatched = 0
+    
+    async def worker():
+        nonlocal sent_bytes, mismatched, uploaded
+        async with httpx.AsyncClient(base_url=base_url, timeout=120) as client:
+            for n in queue:
+                payload = payloads[n % len(payloads)]
+                token = tokens[n % len(tokens)]
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/files/",
+                    params={"filename": f"exame {n}.pdf"},
+                    content=payload,
+                    headers={"Authorization": f"Bearer {token}", "Content-Type": "application/octet-stream"},
+                )
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 201:
+                    body = response.json()
+                    sent_bytes += len(payload)
+                    mismatched += body["sha256"] != hashes[n % len(payloads)]
+                    uploaded += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "uploads_per_sec": round(uploaded / elapsed, 1),
+        "mb_per_sec": round(sent_bytes / elapsed / (1024 * 1024), 1),
+        "latency_ms": summarize(latencies, scale=1000),
+        "statuses": statuses,
+        "sha256_mismatches": mismatched,
+        "uploaded_bytes": sent_bytes,
+    }
+
+
+async def check_rejections(base_url: str, token: str, args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Recusas: Content-Length acima do limite (sem ler o corpo), corpo chunked que passa do limite
+    e arquivo com tipo real não permitido
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    oversized = b"%PDF-1.7\n" + bytes(args.oversize_mb * 1024 * 1024)
+    results: Dict[str, Any] = {}
+    
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        # Content-Length declarado: resposta antes de o corpo ser enviado
+        started = time.perf_counter()
+        try:
+            response = await client.post(
+                "/api/v1/files/",
+                params={"filename": "grande.pdf"},
+                content=chunked(oversized, 64 * 1024),
+                headers={**headers, "Content-Length": str(len(oversized))},
+            )
+            results["declared_oversize"] = response.status_code
+        except httpx.HTTPError as exc:
+            # O servidor pode fechar a conexão antes de o cliente terminar de enviar
+            results["declared_oversize"] = type(exc).__name__
+        results["declared_oversize_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        # Sem Content-Length (chunked): abortado ao passar do limite
+        try:
+            response = await client.post(
+                "/api/v1/files/",
+                params={"filename": "grande.pdf"},
+                content=chunked(oversized, 64 * 1024),
+                headers=headers,
+            )
+            results["streamed_oversize"] = response.status_code
+        except httpx.HTTPError as exc:
+            results["streamed_oversize"] = type(exc).__name__
+        
+        # Executável com nome de PDF: o tipo vem dos bytes, não do nome
+        response = await client.post(
+            "/api/v1/files/",
+            params={"filename": "laudo.pdf"},
+            content=b"MZ\x90\x00" + bytes(64 * 1024),
+            headers={**headers, "Content-Type": "application/pdf"},
+        )
+        results["unsupported_type"] = response.status_code
+    
+    return results
+
+
+async def delete_tenant_files(base_url: str, token: str) -> Dict[str, Any]:
+    """
+    Remover pela API todos os arquivos de um tenant
+    """
+    headers = {"Authorization": f"Bearer {token}"}
+    statuses: Dict[int, int] = {}
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        response = await client.get("/api/v1/files/", params={"limit": 1000}, headers=headers)
+        response.raise_for_status()
+        for stored in response.json():
+            response = await client.delete(f"/api/v1/files/{stored['id']}", headers=headers)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    return {"statuses": statuses}
+
+
+async def check_integrity(tenant_ids: List[int], upload_dir: str) -> Dict[str, Any]:
+    """
+    Conteúdos no disco íntegros, contagem de referências igual aos arquivos, uso de cota igual à
+    soma dos arquivos de cada tenant, e bytes lógicos vs. físicos
+    """
+    from sqlalchemy import func, select
+    
+    from app.core.database import AsyncSessionLocal
+    from app.domain.models.storage import StoredBlob, StoredFile
+    from app.domain.models.tenant import Tenant
+    from app.infrastructure.file_storage import blob_key
+    
+    async with AsyncSessionLocal() as session:
+        files = (await session.execute(
+            select(StoredFile.sha256, StoredFile.size_bytes).where(StoredFile.tenant_id.in_(tenant_ids))
+        )).all()
+        references: Dict[str, int] = {}
+        for sha256, _ in files:
+            references[sha256] = references.get(sha256, 0) + 1
+        blobs = (await session.execute(
+            select(StoredBlob.sha256, StoredBlob.size_bytes, StoredBlob.ref_count)
+            .where(StoredBlob.sha256.in_(list(references)))
+        )).all()
+        quota_rows = (await session.execute(
+            select(Tenant.id, Tenant.storage_used_bytes).where(Tenant.id.in_(tenant_ids))
+        )).all()
+        file_totals = dict((await session.execute(
+            select(StoredFile.tenant_id, func.sum(StoredFile.size_bytes))
+            .where(StoredFile.tenant_id.in_(tenant_ids))
+            .group_by(StoredFile.tenant_id)
+        )).all())
+    
+    corrupted = 0
+    for sha256, size_bytes, _ in blobs:
+        path = os.path.join(upload_dir, blob_key(sha256))
+        if not os.path.exists(path):
+            corrupted += 1
+            continue
+        with open(path, "rb") as stored:
+            corrupted += os.path.getsize(path) != size_bytes or hashlib.sha256(stored.read()).hexdigest() != sha256
+    blob_files = sum(len(names) for _, _, names in os.walk(os.path.join(upload_dir, "blobs")))
+    temp_dir = os.path.join(upload_dir, "tmp")
+    leftovers = os.listdir(temp_dir) if os.path.isdir(temp_dir) else []
+    logical = sum(size_bytes for _, size_bytes in files)
+    physical = sum(size_bytes for _, size_bytes, _ in blobs)
+    
+    return {
+        "files": len(files),
+        "blobs": len(blobs),
+        "logical_mb": round(logical / (1024 * 1024), 1),
+        "physical_mb": round(physical / (1024 * 1024), 1),
+        "disk_saved_pct": round(100 * (1 - physical / logical), 1) if logical else 0.0,
+        "blob_files_on_disk": blob_files,
+        "corrupted_on_disk": corrupted,
+        "ref_counts_match": len(blobs) == len(references) and all(
+            ref_count == references[sha256] for sha256, _, ref_count in blobs
+        ),
+        "temp_files_left": len(leftovers),
+        "quota_matches_files": all(used == (file_totals.get(tenant_id) or 0) for tenant_id, used in quota_rows),
+    }
+
+
+async def run(args: argparse.Namespace, database_url: str, upload_dir: str) -> Dict[str, Any]:
+    """
+    Seed (tenants + donos) + servidor + uploads + recusas + remoção + conferência no banco e no disco
+    """
+    from benchmarks.seed import seed_database
+    from app.core.database import engine
+    
+    seed_data = await seed_database(args.tenants, 1, seed=args.seed)
+    tenants = seed_data["tenants"]
+    tenant_ids = [tenant["id"] for tenant in tenants]
+    payloads = build_payloads(args)
+    
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    process = start_server(database_url, port)
+    try:
+        await wait_for_server(base_url, process)
+        tokens = []
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            for tenant in tenants:
+                response = await login_as(client, tenant["owner_email"], tenant["slug"], seed_data["password"])
+                response.raise_for_status()
+                tokens.append(response.json()["access_token"])
+        memory_before = peak_rss_kb(process.pid)
+        results = await upload_concurrently(base_url, tokens, payloads, args)
+        memory_after = peak_rss_kb(process.pid)
+        rejections = await check_rejections(base_url, tokens[0], args)
+        integrity = await check_integrity(tenant_ids, upload_dir)
+        # Remoção: primeiro um tenant (conteúdos ainda referenciados pelos outros), depois todos
+        deletion = {"first_tenant": await delete_tenant_files(base_url, tokens[0])}
+        deletion["first_tenant"]["integrity"] = await check_integrity(tenant_ids, upload_dir)
+        deletion["all_tenants"] = {"statuses": {}}
+        for token in tokens[1:]:
+            for code, count in (await delete_tenant_files(base_url, token))["statuses"].items():
+                deletion["all_tenants"]["statuses"][code] = deletion["all_tenants"]["statuses"].get(code, 0) + count
+        deletion["all_tenants"]["integrity"] = await check_integrity(tenant_ids, upload_dir)
+    finally:
+        stop_server(process)
+    await engine.dispose()
+    
+    return {
+        "meta": run_metadata(
+            benchmark="upload",
+            tenants=args.tenants,
+            concurrency=args.concurrency,
+            uploads=args.uploads,
+            distinct=args.distinct,
+            size_kb=[args.min_size_kb, args.max_size_kb],
+            database="embedded" if args.embedded else "external",
+        ),
+        "results": results,
+        "server_memory_kb": {
+            "rss_before": memory_before["VmRSS"],
+            "peak_before": memory_before["VmHWM"],
+            "peak_after": memory_after["VmHWM"],
+            "peak_growth": memory_after["VmHWM"] - memory_before["VmHWM"],
+        },
+        "rejections": rejections,
+        "integrity": integrity,
+        "deletion": deletion,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de uploads em streaming")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--tenants", type=int, default=2, help="Tenants enviando os mesmos conteúdos")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--distinct", type=int, default=25, help="Conteúdos distintos gerados")
+    parser.add_argument("--min-size-kb", type=int, default=1024)
+    parser.add_argument("--max-size-kb", type=int, default=8192)
+    parser.add_argument("--oversize-mb", type=int, default=50, help="Tamanho do envio acima do limite")
+    parser.add_argument("--upload-dir", default=None, help="UPLOAD_DIR do servidor (padrão: temporário)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    with tempfile.TemporaryDirectory(prefix="hubb-uploads-") as temp_dir:
+        upload_dir = args.upload_dir or temp_dir
+        try:
+            database_url = embedded.url if embedded else args.database_url
+            # As configurações da app são lidas no import: definir antes de importar app.*
+            os.environ["DATABASE_URL"] = database_url
+            os.environ["DEBUG"] = "false"
+            os.environ["UPLOAD_DIR"] = upload_dir
+            report = asyncio.run(run(args, database_url, upload_dir))
+        finally:
+            if embedded:
+                embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+User Import Benchmark
+Envia um CSV de N usuários ao endpoint de importação do tenant e mede throughput, intervalo entre
+mensagens de progresso e a distribuição de resultados por linha; ao final confere no banco que
+todos os usuários criados existem e que total_users do tenant foi atualizado.
+
+Uso (a partir de backend/):
+    python -m benchmarks.user_import_bench --embedded
+    python -m benchmarks.user_import_bench --database-url postgresql://... --users 20000 --password-ratio 0.01
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.load_test import login_as, start_server, stop_server, wait_for_server
+from benchmarks.postgres import EmbeddedPostgres, free_port
+from benchmarks.seed import generate_cpf
+
+
+def build_csv(args: argparse.Namespace, tenant_slug: str) -> bytes:
+    """
+    CSV sintético (separador ";", como exportado por planilhas em pt-BR): parte das linhas com
+    senha, parte com CPF inválido e parte com email repetido
+    """
+    rng = random.Random(args.seed)
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=";")
+    writer.writerow(["email", "full_name", "phone", "role", "cpf", "password"])
+    for n in range(args.users):
+        email = f"import{n}@{tenant_slug}.com"
+        if n and rng.random() < args.duplicate_ratio:
+            email = f"import{rng.randrange(n)}@{tenant_slug}.com"
+        cpf = generate_cpf(rng)
+        if rng.random() < args.invalid_ratio:
+            cpf = "111.111.111-11"
+        writer.writerow([
+            email,
+            f"Usuário Importado {n}",
+            f"1197777{n % 10000:04d}",
+            rng.choice(["assistente", "dentista", "recepcionista"]),
+            cpf,
+            "Bench123" if rng.random() < args.password_ratio else "",
+        ])
+    return output.getvalue().encode()
+
+
+async def import_users(base_url: str, token: str, payload: bytes) -> Dict[str, Any]:
+    """
+    Enviar o CSV e consumir o stream de resultados
+    """
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    progress_at: List[float] = []
+    summary = None
+    
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        started = time.perf_counter()
+        async with client.stream(
+            "POST",
+            "/api/v1/users/import",
+            content=payload,
+            headers={"Authorization": f"Bearer {token}", "Content-Type": "text/csv"},
+        ) as response:
+            if response.status_code != 200:
+                await response.aread()
+                raise RuntimeError(f"Importação falhou: {response.status_code} {response.text}")
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                if result["status"] == "summary":
+                    summary = result
+                elif result["status"] == "progress":
+                    progress_at.append(time.perf_counter() - started)
+                else:
+                    statuses[result["status"]] += 1
+                    if result["status"] == "error":
+                        errors[result["error"]] += 1
+        elapsed = time.perf_counter() - started
+    
+    gaps = [b - a for a, b in zip([0.0] + progress_at, progress_at)]
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "throughput_users": round(statuses["created"] / elapsed, 1) if elapsed else 0.0,
+        "progress_messages": len(progress_at),
+        "max_progress_gap_ms": round(max(gaps, default=0.0) * 1000, 1),
+        "statuses": dict(statuses),
+        "errors": dict(errors.most_common(10)),
+        "server_summary": summary,
+    }
+
+
+async def check_integrity(tenant_id: int, created: int) -> Dict[str, Any]:
+    """
+    Usuários importados gravados e contador do tenant coerente com a tabela
+    """
+    from sqlalchemy import func, select
+    
+    from app.core.database import AsyncSessionLocal, engine
+    from app.domain.models.tenant import Tenant
+    from app.domain.models.user import User
+    
+    async with AsyncSessionLocal() as session:
+        imported = (await session.execute(
+            select(func.count(User.id)).where(User.tenant_id == tenant_id, User.email.like("import%"))
+        )).scalar() or 0
+        active = (await session.execute(
+            select(func.count(User.id)).where(User.tenant_id == tenant_id, User.is_active == True)
+        )).scalar() or 0
+        total_users = (await session.execute(
+            select(Tenant.total_users).where(Tenant.id == tenant_id)
+        )).scalar()
+    await engine.dispose()
+    
+    return {
+        "imported_in_db": imported,
+        "matches_results": imported == created,
+        "total_users_consistent": total_users == active,
+    }
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Seed (tenant + dono) + servidor + envio do CSV + conferência no banco
+    """
+    from benchmarks.seed import seed_database
+    
+    seed_data = await seed_database(1, 1, seed=args.seed)
+    tenant = seed_data["tenants"][0]
+    payload = build_csv(args, tenant["slug"])
+    os.environ["USER_IMPORT_BATCH_SIZE"] = str(args.batch_size)
+    
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "app.server",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", "1",
+    ]
+    process = start_server(database_url, port, command=command)
+    try:
+        await wait_for_server(base_url, process)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+            response = await login_as(client, tenant["owner_email"], tenant["slug"], seed_data["password"])
+            response.raise_for_status()
+            token = response.json()["access_token"]
+        results = await import_users(base_url, token, payload)
+    finally:
+        stop_server(process)
+    
+    return {
+        "meta": run_metadata(
+            benchmark="user_import",
+            users=args.users,
+            batch_size=args.batch_size,
+            password_ratio=args.password_ratio,
+            invalid_ratio=args.invalid_ratio,
+            duplicate_ratio=args.duplicate_ratio,
+            payload_kb=round(len(payload) / 1024, 1),
+            database="embedded" if args.embedded else "external",
+        ),
+        "results": results,
+        "integrity": await check_integrity(tenant["id"], results["statuses"].get("created", 0)),
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark da importação de usuários por CSV")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument(
+        "--password-ratio",
+        type=float,
+        default=0.0,
+        help="Fração de usuários com senha (bcrypt); os demais recebem convite"
+    )
+    parser.add_argument("--invalid-ratio", type=float, default=0.02, help="Fração de linhas com CPF inválido")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.01, help="Fração de emails repetidos")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args, database_url))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
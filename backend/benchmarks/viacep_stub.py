@@ -0,0 +1,84 @@
+"""
+ViaCEP Stub
+Servidor substituto do ViaCEP para testes e benchmarks, com latência e falhas configuráveis.
+Aponte a aplicação para ele com VIACEP_API_URL=http://127.0.0.1:<porta>/ws
+
+Uso (a partir de backend/):
+    python -m benchmarks.viacep_stub --port 8099 --latency-ms 80 --error-rate 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from typing import Optional, List
+
+
+def build_app(latency_ms: float = 0.0, error_rate: float = 0.0, seed: int = 42):
+    """
+    App ASGI que responde /ws/{cep}/json/ como o ViaCEP; CEPs terminados em 999 não existem
+    """
+    rng = random.Random(seed)
+    stats = {"requests": 0}
+    
+    async def app(scope, receive, send):
+        if scope["type"] != "http":
+            return
+        
+        stats["requests"] += 1
+        parts = [part for part in scope["path"].split("/") if part]
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        
+        if len(parts) == 1 and parts[0] == "stats":
+            status, body = 200, stats
+        elif len(parts) != 3 or parts[0] != "ws" or parts[2] != "json":
+            status, body = 404, {"detail": "not found"}
+        elif rng.random() < error_rate:
+            status, body = 503, {"detail": "unavailable"}
+        elif not (parts[1].isdigit() and len(parts[1]) == 8):
+            status, body = 400, {"detail": "bad request"}
+        elif parts[1].endswith("999"):
+            status, body = 200, {"erro": "true"}
+        else:
+            cep = parts[1]
+            status, body = 200, {
+                "cep": f"{cep[:5]}-{cep[5:]}",
+                "logradouro": f"Rua {cep[:5]}",
+                "complemento": "",
+                "bairro": "Centro",
+                "localidade": "São Paulo",
+                "uf": "SP",
+            }
+        
+        payload = json.dumps(body, ensure_ascii=False).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json; charset=utf-8")],
+        })
+        await send({"type": "http.response.body", "body": payload})
+    
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    import uvicorn
+    
+    parser = argparse.ArgumentParser(description="Servidor substituto do ViaCEP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    
+    uvicorn.run(
+        build_app(args.latency_ms, args.error_rate),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
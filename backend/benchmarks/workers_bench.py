@@ -0,0 +1,137 @@
+"""
+Workers Benchmark
+Compara throughput e latência do launcher de produção (app.server) com 1 e N workers
+nos caminhos de login e /me.
+
+Uso (a partir de backend/):
+    python -m benchmarks.workers_bench --embedded
+    python -m benchmarks.workers_bench --database-url postgresql://... --workers 1,2,4 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from benchmarks.common import run_metadata, write_report
+from benchmarks.load_test import prepare_context, run_scenario, start_server, stop_server, wait_for_server
+from benchmarks.postgres import EmbeddedPostgres, free_port
+
+
+DEFAULT_SCENARIOS = ["login", "me"]
+
+
+async def bench_workers(
+    workers: int,
+    database_url: str,
+    seed_data: Dict[str, Any],
+    args: argparse.Namespace
+) -> Dict[str, Any]:
+    """
+    Subir o launcher com `workers` processos e executar os cenários
+    """
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    command = [
+        sys.executable, "-m", "app.server",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+    ]
+    process = start_server(database_url, port, command=command)
+    try:
+        await wait_for_server(base_url, process)
+        ctx = await prepare_context(base_url, seed_data, token_pool=min(args.tenants, 50))
+        
+        results = {}
+        for name in args.scenarios:
+            results[name] = await run_scenario(
+                name, base_url, ctx, args.concurrency, args.duration, args.seed
+            )
+    finally:
+        stop_server(process)
+    
+    return results
+
+
+async def run(args: argparse.Namespace, database_url: str) -> Dict[str, Any]:
+    """
+    Seed único e uma rodada por configuração de workers
+    """
+    from benchmarks.seed import seed_database
+    
+    seed_data = await seed_database(args.tenants, args.users_per_tenant, seed=args.seed)
+    
+    runs = {}
+    for workers in args.workers:
+        runs[str(workers)] = await bench_workers(workers, database_url, seed_data, args)
+    
+    # Ganho de throughput em relação à menor configuração
+    base = runs[str(args.workers[0])]
+    speedup = {
+        key: {
+            name: round(result["throughput_ops"] / base[name]["throughput_ops"], 2)
+            if base[name]["throughput_ops"] else None
+            for name, result in scenarios.items()
+        }
+        for key, scenarios in runs.items()
+    }
+    
+    return {
+        "meta": run_metadata(
+            benchmark="workers",
+            concurrency=args.concurrency,
+            duration_s=args.duration,
+            tenants=args.tenants,
+            users_per_tenant=args.users_per_tenant,
+            database="embedded" if args.embedded else "external",
+        ),
+        "workers": runs,
+        "speedup": speedup,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark de 1 vs N workers do launcher de produção")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"))
+    parser.add_argument("--embedded", action="store_true", help="Usar cluster PostgreSQL temporário")
+    parser.add_argument(
+        "--workers",
+        type=lambda v: [int(w) for w in v.split(",")],
+        default=sorted({1, os.cpu_count() or 1}),
+        help="Configurações de workers, ex.: 1,4 (padrão: 1 e nº de CPUs)"
+    )
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--users-per-tenant", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="Segundos por cenário")
+    parser.add_argument("--scenarios", type=lambda v: v.split(","), default=DEFAULT_SCENARIOS)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Arquivo JSON de saída (padrão: stdout)")
+    args = parser.parse_args(argv)
+    
+    if not args.embedded and not args.database_url:
+        parser.error("Informe --database-url (ou DATABASE_URL) ou use --embedded")
+    if max(args.workers) > 1 and not os.getenv("REDIS_URL"):
+        parser.error("--workers > 1 requer REDIS_URL (sessões de onboarding compartilhadas)")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    
+    embedded = EmbeddedPostgres().start() if args.embedded else None
+    try:
+        database_url = embedded.url if embedded else args.database_url
+        # As configurações da app são lidas no import: definir antes de importar app.*
+        os.environ["DATABASE_URL"] = database_url
+        os.environ["DEBUG"] = "false"
+        report = asyncio.run(run(args, database_url))
+    finally:
+        if embedded:
+            embedded.stop()
+    
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Schema base (tenants, users, cep_cache)
+
+Estado do banco antes das colunas normalizadas. Idempotente: só cria as tabelas ausentes, então
+bancos criados pelo antigo create_all do startup só recebem o carimbo da revisão.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+ENUMS = {
+    "tenantsegment": ("ODONTOLOGIA", "ESTETICA", "FISIOTERAPIA", "DERMATOLOGIA", "ORTOPEDIA", "CARDIOLOGIA", "OUTROS"),
+    "tenantplan": ("TRIAL", "BASIC", "PROFESSIONAL", "ENTERPRISE"),
+    "tenantstatus": ("PENDING", "ACTIVE", "SUSPENDED", "CANCELLED"),
+    "userrole": (
+        "SUPER_ADMIN", "ADMIN_MASTER", "DONO_CLINICA", "DENTISTA", "ASSISTENTE",
+        "RECEPCIONISTA", "FINANCEIRO", "RH", "PACIENTE",
+    ),
+}
+
+
+def upgrade() -> None:
+    for name, values in ENUMS.items():
+        labels = ", ".join(f"'{value}'" for value in values)
+        op.execute(f"""
+            DO $$ BEGIN
+                CREATE TYPE {name} AS ENUM ({labels});
+            EXCEPTION WHEN duplicate_object THEN NULL;
+            END $$
+        """)
+    
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    
+    if "cep_cache" not in existing:
+        op.execute("""
+            CREATE TABLE cep_cache (
+                cep VARCHAR(8) NOT NULL,
+                found BOOLEAN NOT NULL,
+                data TEXT,
+                fetched_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                CONSTRAINT pk_cep_cache PRIMARY KEY (cep)
+            )
+        """)
+    
+    if "tenants" not in existing:
+        op.execute("""
+            CREATE TABLE tenants (
+                id SERIAL NOT NULL,
+                slug VARCHAR(100) NOT NULL,
+                company_name VARCHAR(255) NOT NULL,
+                fantasy_name VARCHAR(255),
+                cnpj VARCHAR(18),
+                cpf VARCHAR(14),
+                ie VARCHAR(20),
+                im VARCHAR(20),
+                cep VARCHAR(9) NOT NULL,
+                street VARCHAR(255) NOT NULL,
+                number VARCHAR(20) NOT NULL,
+                complement VARCHAR(255),
+                neighborhood VARCHAR(255) NOT NULL,
+                city VARCHAR(255) NOT NULL,
+                state VARCHAR(2) NOT NULL,
+                country VARCHAR(2) NOT NULL,
+                email VARCHAR(255) NOT NULL,
+                phone VARCHAR(20) NOT NULL,
+                website VARCHAR(255),
+                segment tenantsegment NOT NULL,
+                specialties TEXT,
+                plan tenantplan NOT NULL,
+                status tenantstatus NOT NULL,
+                is_active BOOLEAN NOT NULL,
+                max_users INTEGER NOT NULL,
+                max_storage_gb INTEGER NOT NULL,
+                monthly_fee NUMERIC(10, 2) NOT NULL,
+                trial_end_date TIMESTAMP WITHOUT TIME ZONE,
+                subscription_start TIMESTAMP WITHOUT TIME ZONE,
+                subscription_end TIMESTAMP WITHOUT TIME ZONE,
+                onboarding_completed BOOLEAN NOT NULL,
+                onboarding_step INTEGER NOT NULL,
+                onboarding_data TEXT,
+                modules_enabled TEXT,
+                settings TEXT,
+                theme VARCHAR(50) NOT NULL,
+                logo_url VARCHAR(500),
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                activated_at TIMESTAMP WITHOUT TIME ZONE,
+                suspended_at TIMESTAMP WITHOUT TIME ZONE,
+                last_activity TIMESTAMP WITHOUT TIME ZONE,
+                total_users INTEGER NOT NULL,
+                total_patients INTEGER NOT NULL,
+                total_appointments INTEGER NOT NULL,
+                CONSTRAINT pk_tenants PRIMARY KEY (id)
+            )
+        """)
+        op.execute("CREATE INDEX ix_tenants_cnpj ON tenants (cnpj)")
+        op.execute("CREATE INDEX ix_tenants_cpf ON tenants (cpf)")
+        op.execute("CREATE INDEX ix_tenants_email ON tenants (email)")
+        op.execute("CREATE INDEX ix_tenants_id ON tenants (id)")
+        op.execute("CREATE UNIQUE INDEX ix_tenants_slug ON tenants (slug)")
+    
+    if "users" not in existing:
+        op.execute("""
+            CREATE TABLE users (
+                id SERIAL NOT NULL,
+                email VARCHAR(255) NOT NULL,
+                full_name VARCHAR(255) NOT NULL,
+                hashed_password VARCHAR(255) NOT NULL,
+                is_active BOOLEAN NOT NULL,
+                is_verified BOOLEAN NOT NULL,
+                tenant_id INTEGER NOT NULL,
+                role userrole NOT NULL,
+                permissions TEXT,
+                phone VARCHAR(20),
+                cpf VARCHAR(14),
+                birth_date TIMESTAMP WITHOUT TIME ZONE,
+                professional_id VARCHAR(50),
+                specialties TEXT,
+                refresh_token VARCHAR(500),
+                password_reset_token VARCHAR(500),
+                verification_token VARCHAR(500),
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                updated_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                last_login TIMESTAMP WITHOUT TIME ZONE,
+                preferences TEXT,
+                avatar_url VARCHAR(500),
+                CONSTRAINT pk_users PRIMARY KEY (id),
+                CONSTRAINT fk_users_tenant_id_tenants FOREIGN KEY(tenant_id) REFERENCES tenants (id)
+            )
+        """)
+        op.execute("CREATE INDEX ix_users_cpf ON users (cpf)")
+        op.execute("CREATE INDEX ix_users_email ON users (email)")
+        op.execute("CREATE INDEX ix_users_id ON users (id)")
+        op.execute("CREATE INDEX ix_users_tenant_id ON users (tenant_id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS users")
+    op.execute("DROP TABLE IF EXISTS tenants")
+    op.execute("DROP TABLE IF EXISTS cep_cache")
+    for name in ENUMS:
+        op.execute(f"DROP TYPE IF EXISTS {name}")
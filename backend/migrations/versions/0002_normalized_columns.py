@@ -0,0 +1,130 @@
+"""
+Colunas normalizadas de e-mail e documentos
+
+Colunas geradas (só dígitos / minúsculas) com índices para as buscas por CNPJ, CPF e e-mail.
+Antes dos índices únicos, resolve as duplicatas que já existem no banco: fica o registro ativo
+(usuários: o de login mais recente; clínicas: a mais antiga) e os demais têm o valor original
+guardado em migration_duplicates e
+- usuários: e-mail renomeado para "duplicado-<id>+<email>", desativados e com a sessão encerrada;
+- clínicas: e-mail renomeado do mesmo jeito e CNPJ removido (NULL).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+DIGITS_ONLY = "NULLIF(regexp_replace({0}, '[^0-9]', '', 'g'), '')"
+
+
+def record_duplicates(table: str, column: str, key: str, order: str) -> int:
+    """
+    Guardar em migration_duplicates as linhas que perdem para outra com a mesma `key`
+    """
+    result = op.get_bind().execute(sa.text(f"""
+        INSERT INTO migration_duplicates (revision, table_name, row_id, column_name, original_value, kept_id)
+        SELECT '{revision}', '{table}', id, '{column}', {column}, kept_id
+        FROM (
+            SELECT id, {column},
+                   first_value(id) OVER w AS kept_id,
+                   row_number() OVER w AS position
+            FROM {table}
+            WHERE ({key}) IS NOT NULL
+            WINDOW w AS (PARTITION BY {key} ORDER BY {order})
+        ) ranked
+        WHERE position > 1
+    """))
+    if result.rowcount:
+        logger.warning("%s.%s: %d linha(s) duplicada(s) ajustada(s) (ver migration_duplicates)", table, column, result.rowcount)
+    return result.rowcount
+
+
+def duplicates_of(table: str, column: str) -> str:
+    """
+    Filtro SQL das linhas registradas por record_duplicates
+    """
+    return (
+        f"id IN (SELECT row_id FROM migration_duplicates "
+        f"WHERE revision = '{revision}' AND table_name = '{table}' AND column_name = '{column}')"
+    )
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS migration_duplicates (
+            id SERIAL PRIMARY KEY,
+            revision VARCHAR(32) NOT NULL,
+            table_name VARCHAR(64) NOT NULL,
+            row_id INTEGER NOT NULL,
+            column_name VARCHAR(64) NOT NULL,
+            original_value TEXT,
+            kept_id INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    
+    # Usuários: e-mail único por clínica, sem diferenciar maiúsculas
+    if record_duplicates("users", "email", "tenant_id, lower(email)", "is_active DESC, last_login DESC NULLS LAST, id"):
+        op.execute(f"""
+            UPDATE users
+            SET email = left('duplicado-' || id || '+' || email, 255),
+                is_active = false,
+                refresh_token = NULL
+            WHERE {duplicates_of("users", "email")}
+        """)
+    
+    # Clínicas: e-mail e CNPJ únicos na plataforma
+    tenant_order = "is_active DESC, created_at, id"
+    if record_duplicates("tenants", "email", "lower(email)", tenant_order):
+        op.execute(f"""
+            UPDATE tenants
+            SET email = left('duplicado-' || id || '+' || email, 255)
+            WHERE {duplicates_of("tenants", "email")}
+        """)
+    if record_duplicates("tenants", "cnpj", DIGITS_ONLY.format("cnpj"), tenant_order):
+        op.execute(f"UPDATE tenants SET cnpj = NULL WHERE {duplicates_of('tenants', 'cnpj')}")
+    
+    op.execute(f"""
+        ALTER TABLE tenants
+            ADD COLUMN IF NOT EXISTS cnpj_normalized VARCHAR(18) GENERATED ALWAYS AS ({DIGITS_ONLY.format("cnpj")}) STORED,
+            ADD COLUMN IF NOT EXISTS cpf_normalized VARCHAR(14) GENERATED ALWAYS AS ({DIGITS_ONLY.format("cpf")}) STORED,
+            ADD COLUMN IF NOT EXISTS email_normalized VARCHAR(255) GENERATED ALWAYS AS (lower(email)) STORED
+    """)
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_tenants_cnpj_normalized ON tenants (cnpj_normalized)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tenants_cpf_normalized ON tenants (cpf_normalized)")
+    op.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_tenants_email_normalized ON tenants (email_normalized)")
+    
+    op.execute(f"""
+        ALTER TABLE users
+            ADD COLUMN IF NOT EXISTS email_normalized VARCHAR(255) GENERATED ALWAYS AS (lower(email)) STORED,
+            ADD COLUMN IF NOT EXISTS cpf_normalized VARCHAR(14) GENERATED ALWAYS AS ({DIGITS_ONLY.format("cpf")}) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_tenant_cpf_normalized ON users (tenant_id, cpf_normalized)")
+    op.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS uq_users_tenant_email_normalized ON users (tenant_id, email_normalized)"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS uq_users_tenant_email_normalized")
+    op.execute("DROP INDEX IF EXISTS ix_users_tenant_cpf_normalized")
+    op.execute("ALTER TABLE users DROP COLUMN IF EXISTS cpf_normalized, DROP COLUMN IF EXISTS email_normalized")
+    op.execute("DROP INDEX IF EXISTS ix_tenants_email_normalized")
+    op.execute("DROP INDEX IF EXISTS ix_tenants_cpf_normalized")
+    op.execute("DROP INDEX IF EXISTS ix_tenants_cnpj_normalized")
+    op.execute(
+        "ALTER TABLE tenants DROP COLUMN IF EXISTS email_normalized, "
+        "DROP COLUMN IF EXISTS cpf_normalized, DROP COLUMN IF EXISTS cnpj_normalized"
+    )
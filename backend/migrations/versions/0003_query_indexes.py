@@ -0,0 +1,57 @@
+"""
+Índices das consultas de listagem e login
+
+Índices compostos/parciais das consultas quentes; remove os índices de coluna única que as
+colunas normalizadas e a chave primária já cobrem.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+OBSOLETE = {
+    "ix_tenants_cnpj": "tenants (cnpj)",
+    "ix_tenants_cpf": "tenants (cpf)",
+    "ix_tenants_email": "tenants (email)",
+    "ix_tenants_id": "tenants (id)",
+    "ix_users_cpf": "users (cpf)",
+    "ix_users_id": "users (id)",
+    "ix_users_tenant_id": "users (tenant_id)",
+}
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_tenants_active_plan_trial_end ON tenants (plan, trial_end_date) WHERE is_active"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tenants_created_at ON tenants (created_at)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_tenants_status_created_at ON tenants (status, created_at)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_users_password_reset_token ON users (password_reset_token) "
+        "WHERE password_reset_token IS NOT NULL"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_tenant_active ON users (tenant_id) WHERE is_active")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_users_tenant_created_at ON users (tenant_id, created_at)")
+    
+    for name in OBSOLETE:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    for name, target in OBSOLETE.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+    
+    for name in (
+        "ix_users_tenant_created_at", "ix_users_tenant_active", "ix_users_password_reset_token",
+        "ix_tenants_status_created_at", "ix_tenants_created_at", "ix_tenants_active_plan_trial_end",
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,25 @@
+"""
+Versão da configuração da clínica
+
+Contador incrementado a cada mudança de módulos/configuração; invalida o cache de configuração por clínica.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("ALTER TABLE tenants ADD COLUMN IF NOT EXISTS config_version INTEGER DEFAULT '0' NOT NULL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE tenants DROP COLUMN IF EXISTS config_version")
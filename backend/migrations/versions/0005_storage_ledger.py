@@ -0,0 +1,43 @@
+"""
+Ledger de armazenamento por clínica
+
+Total em uso na clínica (reservado atomicamente) e o ledger de movimentações usado na reconciliação.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        ALTER TABLE tenants
+            ADD COLUMN IF NOT EXISTS storage_used_bytes BIGINT DEFAULT '0' NOT NULL,
+            ADD COLUMN IF NOT EXISTS storage_reconciled_at TIMESTAMP WITHOUT TIME ZONE
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS storage_ledger (
+            id BIGSERIAL NOT NULL,
+            tenant_id INTEGER NOT NULL,
+            delta_bytes BIGINT NOT NULL,
+            object_key VARCHAR(255),
+            reason VARCHAR(20) NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT pk_storage_ledger PRIMARY KEY (id),
+            CONSTRAINT fk_storage_ledger_tenant_id_tenants FOREIGN KEY(tenant_id) REFERENCES tenants (id)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_storage_ledger_tenant_delta ON storage_ledger (tenant_id, delta_bytes)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS storage_ledger")
+    op.execute("ALTER TABLE tenants DROP COLUMN IF EXISTS storage_reconciled_at, DROP COLUMN IF EXISTS storage_used_bytes")
@@ -0,0 +1,110 @@
+"""
+Colunas JSON como JSONB
+
+Converte as colunas de texto com JSON para JSONB e cria os índices GIN das buscas por módulo e
+especialidade. Antes da conversão, valores que não são JSON válido são guardados em
+migration_invalid_json e anulados; texto vazio vira NULL. A conversão reescreve cada tabela uma
+vez, aqui no deploy, e não a cada startup.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+JSON_COLUMNS = {
+    "tenants": ("specialties", "onboarding_data", "modules_enabled", "settings"),
+    "users": ("permissions", "specialties", "preferences"),
+}
+
+GIN_INDEXES = {
+    "ix_tenants_modules_enabled": "tenants USING gin (modules_enabled jsonb_path_ops)",
+    "ix_tenants_specialties": "tenants USING gin (specialties jsonb_path_ops)",
+    "ix_users_specialties": "users USING gin (specialties jsonb_path_ops)",
+}
+
+
+def text_columns(table: str) -> list:
+    """
+    Colunas de `table` que ainda são texto (bancos anteriores ao JSONB)
+    """
+    rows = op.get_bind().execute(sa.text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table AND data_type = 'text'
+    """), {"table": table})
+    existing = {row.column_name for row in rows}
+    return [column for column in JSON_COLUMNS[table] if column in existing]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS migration_invalid_json (
+            id SERIAL PRIMARY KEY,
+            table_name VARCHAR(64) NOT NULL,
+            row_id INTEGER NOT NULL,
+            column_name VARCHAR(64) NOT NULL,
+            original_value TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+    # O cast num bloco com EXCEPTION testa cada valor sem abortar a transação
+    op.execute("""
+        CREATE FUNCTION pg_temp.is_valid_json(value TEXT) RETURNS BOOLEAN AS $$
+        BEGIN
+            PERFORM value::jsonb;
+            RETURN TRUE;
+        EXCEPTION WHEN others THEN
+            RETURN FALSE;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    
+    for table in JSON_COLUMNS:
+        columns = text_columns(table)
+        if not columns:
+            continue
+        
+        for column in columns:
+            invalid = f"btrim({column}) <> '' AND NOT pg_temp.is_valid_json({column})"
+            result = bind.execute(sa.text(f"""
+                INSERT INTO migration_invalid_json (table_name, row_id, column_name, original_value)
+                SELECT '{table}', id, '{column}', {column} FROM {table} WHERE {invalid}
+            """))
+            if result.rowcount:
+                logger.warning(
+                    "%s.%s: %d valor(es) com JSON inválido anulado(s) (ver migration_invalid_json)",
+                    table, column, result.rowcount,
+                )
+                op.execute(f"UPDATE {table} SET {column} = NULL WHERE {invalid}")
+        
+        # Uma reescrita por tabela, com todas as colunas no mesmo ALTER
+        op.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ALTER COLUMN {column} TYPE JSONB USING NULLIF(btrim({column}), '')::jsonb" for column in columns
+        ))
+    
+    for name, target in GIN_INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def downgrade() -> None:
+    for name in GIN_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    
+    for table, columns in JSON_COLUMNS.items():
+        op.execute(f"ALTER TABLE {table} " + ", ".join(
+            f"ALTER COLUMN {column} TYPE TEXT USING {column}::text" for column in columns
+        ))
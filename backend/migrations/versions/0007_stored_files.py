@@ -0,0 +1,139 @@
+"""
+Arquivos dos tenants com conteúdo deduplicado
+
+Cria stored_blobs (conteúdo único por SHA-256, com contagem de referências) e stored_files (nome
+lógico no tenant). Bancos com a primeira versão de stored_files (um arquivo em disco por linha,
+coluna storage_key) são convertidos: os conteúdos viram blobs, os arquivos vão de
+UPLOAD_DIR/<storage_key> para UPLOAD_DIR/blobs/aa/bb/<sha256> e a coluna storage_key sai.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+
+import logging
+import os
+import shutil
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def blob_path(upload_dir: str, sha256: str) -> str:
+    # Mesmo layout de app.infrastructure.file_storage.blob_key na data desta revisão
+    return os.path.join(upload_dir, "blobs", sha256[:2], sha256[2:4], sha256)
+
+
+def link_blobs(upload_dir: str) -> list:
+    """
+    Colocar cada conteúdo no caminho do blob (hard link, ou cópia em outro volume) sem apagar o
+    original; retorna os arquivos antigos, removidos só no fim da migração
+    """
+    rows = op.get_bind().execute(sa.text("SELECT sha256, storage_key FROM stored_files ORDER BY id")).all()
+    originals = []
+    missing = 0
+    
+    for sha256, storage_key in rows:
+        source = os.path.join(upload_dir, storage_key)
+        destination = blob_path(upload_dir, sha256)
+        if not os.path.exists(source):
+            if not os.path.exists(destination):
+                missing += 1
+                logger.warning("Arquivo ausente em disco: %s (sha256 %s)", source, sha256)
+            continue
+        originals.append(source)
+        if os.path.exists(destination):
+            continue
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+    
+    if missing:
+        logger.warning("%d arquivo(s) de stored_files sem conteúdo em %s", missing, upload_dir)
+    return originals
+
+
+def upgrade() -> None:
+    from app.core.config import settings
+    
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS stored_blobs (
+            sha256 VARCHAR(64) NOT NULL,
+            size_bytes BIGINT NOT NULL,
+            content_type VARCHAR(100) NOT NULL,
+            ref_count INTEGER NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            CONSTRAINT pk_stored_blobs PRIMARY KEY (sha256)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_stored_blobs_unreferenced ON stored_blobs (sha256) WHERE ref_count = 0")
+    
+    if not inspector.has_table("stored_files"):
+        op.execute("""
+            CREATE TABLE stored_files (
+                id SERIAL NOT NULL,
+                tenant_id INTEGER NOT NULL,
+                uploaded_by INTEGER,
+                filename VARCHAR(255) NOT NULL,
+                content_type VARCHAR(100) NOT NULL,
+                size_bytes BIGINT NOT NULL,
+                sha256 VARCHAR(64) NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                CONSTRAINT pk_stored_files PRIMARY KEY (id),
+                CONSTRAINT fk_stored_files_tenant_id_tenants FOREIGN KEY(tenant_id) REFERENCES tenants (id),
+                CONSTRAINT fk_stored_files_uploaded_by_users FOREIGN KEY(uploaded_by) REFERENCES users (id),
+                CONSTRAINT fk_stored_files_sha256_stored_blobs FOREIGN KEY(sha256) REFERENCES stored_blobs (sha256)
+            )
+        """)
+        op.execute("CREATE INDEX ix_stored_files_tenant_created_at ON stored_files (tenant_id, created_at)")
+        return
+    
+    if "storage_key" not in {column["name"] for column in inspector.get_columns("stored_files")}:
+        return
+    
+    # Primeira versão: um arquivo por linha; cada conteúdo distinto vira um blob
+    op.execute("""
+        INSERT INTO stored_blobs (sha256, size_bytes, content_type, ref_count, created_at)
+        SELECT sha256, max(size_bytes), min(content_type), count(*), min(created_at)
+        FROM stored_files
+        GROUP BY sha256
+        ON CONFLICT (sha256) DO UPDATE SET ref_count = stored_blobs.ref_count + EXCLUDED.ref_count
+    """)
+    originals = link_blobs(settings.UPLOAD_DIR)
+    
+    # O ledger passa a identificar o arquivo pelo id, como nos uploads novos
+    op.execute("""
+        UPDATE storage_ledger
+        SET object_key = 'files/' || stored_files.id
+        FROM stored_files
+        WHERE storage_ledger.object_key = stored_files.storage_key
+    """)
+    op.execute("ALTER TABLE stored_files DROP COLUMN storage_key")
+    op.execute("""
+        ALTER TABLE stored_files
+            ADD CONSTRAINT fk_stored_files_sha256_stored_blobs FOREIGN KEY(sha256) REFERENCES stored_blobs (sha256)
+    """)
+    
+    for path in originals:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS stored_files")
+    op.execute("DROP TABLE IF EXISTS stored_blobs")
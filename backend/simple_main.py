@@ -3,13 +3,18 @@ HUBB Assist SaaS - FastAPI Application with Swagger
 Backend completo com documentação automática
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel
 from typing import List, Optional
 import asyncpg
 
+from app.core.config import settings
+from app.core.health import HealthMonitor, cache_client_error, check_cache, check_database
+
 # Schemas básicos para demonstração
 class UserBase(BaseModel):
     email: str
@@ -39,6 +44,24 @@ class Token(BaseModel):
     access_token: str
     token_type: str
 
+# Endpoints de demonstração não dependem do banco: ele é reportado, mas não bloqueia readiness
+health_monitor = HealthMonitor(
+    checks={"database": check_database, "cache": check_cache},
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    optional=("database",)
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Inicia e encerra as verificações de saúde em background"""
+    cache_error = cache_client_error()
+    if cache_error:
+        print(f"⚠️  Cache mal configurado: {cache_error}")
+    await health_monitor.start()
+    yield
+    await health_monitor.stop()
+
 # Criar aplicação FastAPI com documentação completa
 app = FastAPI(
     title="🏥 HUBB Assist SaaS API",
@@ -88,7 +111,8 @@ app = FastAPI(
             "name": "👥 Usuários",
             "description": "Gestão de usuários e permissões",
         },
-    ]
+    ],
+    lifespan=lifespan
 )
 
 # Configurar CORS
@@ -137,17 +161,47 @@ async def health_check():
     ## Health Check
     Verifica o status de saúde da aplicação e conexões
     """
+    database = health_monitor.results.get("database", {})
+    cache = health_monitor.results.get("cache", {})
+    
+    # Pela configuração: um timeout da verificação não traz os detalhes do resultado
+    if not settings.REDIS_URL:
+        cache_status = "not_configured"
+    elif cache.get("misconfigured"):
+        cache_status = "misconfigured"
+    else:
+        cache_status = "online" if cache.get("status") == "ok" else "offline"
+    
     return {
-        "status": "healthy",
+        "status": "healthy" if health_monitor.is_ready else "degraded",
         "environment": "development",
-        "database": "connected",
+        "database": "connected" if database.get("status") == "ok" else "disconnected",
         "services": {
             "api": "online",
-            "database": "online",
-            "cache": "not_configured"
+            "database": "online" if database.get("status") == "ok" else "offline",
+            "cache": cache_status
         }
     }
 
+@app.get("/health/live", tags=["🏠 Sistema"])
+async def liveness_probe():
+    """
+    ## Liveness Probe
+    Processo e event loop respondendo (não toca dependências)
+    """
+    return {"status": "alive"}
+
+@app.get("/health/ready", tags=["🏠 Sistema"])
+async def readiness_probe():
+    """
+    ## Readiness Probe
+    Estado das dependências a partir da última verificação em background
+    """
+    return JSONResponse(
+        status_code=200 if health_monitor.is_ready else 503,
+        content=health_monitor.report()
+    )
+
 # Endpoints de demonstração para o Swagger
 
 @app.post("/auth/login", tags=["🔐 Autenticação"], response_model=Token)